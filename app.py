@@ -1,68 +1,68 @@
+import argparse
 import streamlit as st
 import pandas as pd
 import os
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-import requests
 import io
+import json
 from datetime import datetime
 import helper
 import re
 import numpy as np
-import seaborn as seaborn
 import csv
-from collections import Counter
-import altair as alt
+import hashlib
+from functools import partial
+# matplotlib, seaborn, altair, wordcloud and requests are imported by the functions
+# which use them, so they are only loaded once a section drawing with them is shown
 
-@st.cache_data
+CACHE_DIR = './.cache'
+INGEST_PROCESSES = None # processes to parse collection files with, None for helper.readFilesInParallel's bounded default
+CATALOG_MAX_AGE = 2 # seconds, a directory listed this recently is not listed again, so a rerun lists each one once
+DATA_DIRECTORY = '/Users/belle/Desktop/analysis/data_analysis/data'
+TRUMP_DIRECTORY = '/Users/belle/Desktop/analysis/data_analysis/trump_assassination'
+
+@st.cache_resource
+def collectionCatalog(directory):
+    # one catalog per directory, kept on disk so a restart only parses the names of new files
+    name = hashlib.sha1(os.path.abspath(directory).encode()).hexdigest()[:12]
+    catalog_file = os.path.join(CACHE_DIR, 'catalogs', f"{os.path.basename(os.path.normpath(directory))}-{name}.json")
+    return helper.CollectionCatalog(directory, catalog_file)
+
+def selectCollectionFiles(directory):
+    # collections of the approved queries only, from their filenames, so the others are never opened
+    catalog = collectionCatalog(directory)
+    catalog.refresh(max_age=CATALOG_MAX_AGE)
+    return catalog.select(queries=APPROVED_QUERIES)
+
+@helper.profiled()
 def getD():
-    fileNames = []
-    main_df = pd.DataFrame()
-    directory = '/Users/belle/Desktop/analysis/data_analysis/data'
-    fileList = helper.commonTools.getFilesToCheck(directory, platform='all')
-    for files in fileList:
-        df = helper.read_post_csv(files)
-        data = helper.getDataCollectionParameters(files)
-        df['searchTerm'] = data['query']
-        df['platform'] = data['platform']
-        df['trendingTime'] =  data['trending_time'][0]
-        df['collectedTime'] = data['collection_time']
-        if data['platform'] == 'instagram':
-            df['url'] = df['id'].apply(lambda x: f"https://instagram.com/p/{x}")
-        if data['platform'] == 'tiktok':
-            df['url'] = df['id'].apply(lambda x: f"https://www.tiktok.com/@/video/{x}")
-        if data['platform'] == 'youtube' and 'url' not in df.columns:
-            df['url'] = df['text']
-        new_df = pd.concat([main_df, df], axis=0, ignore_index=True)
-        main_df = new_df
-    return main_df
+    fileList = selectCollectionFiles(DATA_DIRECTORY)
+    # only new or changed files are parsed, the rest come from the on-disk cache
+    cache = helper.PostCache(os.path.join(CACHE_DIR, 'data'), reader=helper.read_collection_csv)
+    return cache.read_all(fileList, processes=INGEST_PROCESSES)
 
-@st.cache_data
+@helper.profiled()
 def getAllTrump():
-    fileNames = []
-    main_df = pd.DataFrame()
-    directory = '/Users/belle/Desktop/analysis/data_analysis/trump_assassination'
-    fileList = helper.getFilesToCheck(directory, platform='all')
-    for files in fileList:
-        df = helper.read_post_csv(files)
-        data = helper.getDataCollectionParameters(files)
-        df['searchTerm'] = data['query']
-        df['platform'] = data['platform']
-        df['trendingTime'] =  data['trending_time'][0]
-        df['collectedTime'] = data['collection_time']
-        if data['platform'] == 'instagram':
-            df['url'] = df['id'].apply(lambda x: f"https://instagram.com/p/{x}")
-        if data['platform'] == 'tiktok':
-            df['url'] = df['id'].apply(lambda x: f"https://www.tiktok.com/@/video/{x}")
-        if data['platform'] == 'youtube':
-             if 'url' not in df.columns or df['url'].isnull().all() or df['url'].eq('').all():
-                df['url'] = df['text']
-        new_df = pd.concat([main_df, df], axis=0, ignore_index=True)
-        main_df = new_df
-    return main_df
+    fileList = selectCollectionFiles(TRUMP_DIRECTORY)
+    reader = partial(helper.read_collection_csv, fill_empty_youtube_urls=True)
+    cache = helper.PostCache(os.path.join(CACHE_DIR, 'trump_assassination'), reader=reader)
+    return cache.read_all(fileList, processes=INGEST_PROCESSES)
+
+@helper.profiled()
+def getPosts():
+    # the unified frame, with the compact dtypes declared in helper.POST_FRAME_SCHEMA,
+    # and how much memory they save
+    raw_df = pd.concat([getAllTrump(), getD()])
+    df = helper.applyPostSchema(raw_df)
+    return df, helper.memoryReport(raw_df, df)
+
+@helper.profiled()
+def enforceSchema(df):
+    # columns added or rewritten by the cleaning steps get the schema's dtypes again
+    return helper.applyPostSchema(df)
 
 @st.cache_data
 def readData(file_url):
+    import requests
     response = requests.get(file_url, verify=False)  
     response.raise_for_status()  
 
@@ -71,18 +71,21 @@ def readData(file_url):
     df['collectedTime'] = df['collectedTime'].apply(parseTime)
     return df
 
-@st.cache_data
+@helper.profiled()
 def cleanData1(df):
-    df = df.loc[df.astype(str).drop_duplicates().index]
+    # whole-row duplicates, found by a hash of each row instead of comparing rows as strings
+    df = df[~helper.getContentFingerprints(df).duplicated()]
     df['id'] = df['id'].astype(str)
+    # urls and post ids are canonical already, from helper.read_collection_csv
+    df['post identity'] = helper.getPostIdentities(df['platform'], df['post id'], df['url'])
     df['url'] = df['url'].astype(str)
     # df['success'] = df['success'].astype(str)
     df = df[~df['id'].str.contains('https://www.tiktok', regex=False)]
-    df = df[~df['url'].str.contains('login/?', regex=False)]
+    # login pages instead of posts; urls are canonical by now, so their query string is gone
+    df = df[~df['url'].str.contains('/login/', regex=False)]
     df = df[~df['url'].str.contains('https://www.tiktok.com/@/video/could not collect', regex=False)]
     # df = df[~df['success'].str.contains('-1', regex=False)]
     df = df[~df['url'].str.contains('https://www.tiktok.com/share/video/could not collect', regex=False)]
-    df['url'] = df.apply(lambda row: clean_fb_url(row['url']) if row['platform'] == 'facebook' else row['url'], axis=1)
     return df
 
 def parseTime(timestamp_str):
@@ -134,29 +137,25 @@ def getMetaData(file_path):
 
     return [trending_time, collected_time, search_term]
 
-def getUserCategory(df):
-    file_path = './labelledUsers.csv'
-    csv_data = pd.read_csv(file_path)
-    user_data = []
-    for index, row in csv_data.iterrows():
-        if "IND" in row['cat']:
-            cat = "IND"
-        else:
-            cat = "ORG"
+USER_LABELS_FILE = './labelledUsers.csv'
+
+@st.cache_resource
+def getUserLabels(file_path, file_signature):
+    # loaded once per version of the file, file_signature changes when the file does
+    return helper.UserLabels(file_path)
 
-        entry = {
-            'user name': row['user_name'],
-            'cat': cat
-        }
-        user_data.append(entry)
+def userLabels(file_path=USER_LABELS_FILE):
+    stat = os.stat(file_path)
+    return getUserLabels(file_path, (stat.st_size, stat.st_mtime_ns))
 
-    user_df = pd.DataFrame(user_data)
-    user_df = user_df.drop_duplicates(subset='user name', keep='last')
-    df = df.merge(user_df, on='user name', how='left')
+@helper.profiled()
+def getUserCategory(df):
+    labels = userLabels()
+    df = df.assign(cat=labels.label(df['user name'])).reset_index(drop=True)
     return df
 
-def cleanQueries(df):
-    approvedQueries = [
+# queries kept in the dashboard, collections of other queries are not read
+APPROVED_QUERIES = [
     "Trump assassination",
     "Menendez Senator",
     "Trump attempted assassination",
@@ -286,35 +285,43 @@ def cleanQueries(df):
     "GOP Convention 2024",
 ]
 
-    filtered_df = df[df['searchTerm'].isin(approvedQueries)]
+@helper.profiled()
+def cleanQueries(df):
+    filtered_df = df[df['searchTerm'].isin(APPROVED_QUERIES)]
 
     return filtered_df
 
-@st.cache_data
-def pickOneDataframe(df):
-    grouped_df = df.groupby(['platform', 'searchTerm', 'collectedTime'])['url'].apply(list).reset_index()
-    grouped_df = grouped_df.drop_duplicates(subset=['platform', 'searchTerm'], keep='first')
-    result_rows = []
-    
-    for _, row in grouped_df.iterrows():
-        platform = row['platform']
-        searchTerm = row['searchTerm']
-        collectedTime = row['collectedTime']
-        urls = row['url']
-        
-        for url in urls:
-            filtered_rows = df[
-                (df['url'] == url) &
-                (df['collectedTime'] == collectedTime) &
-                (df['platform'] == platform) &
-                (df['searchTerm'] == searchTerm)
-            ]
-            result_rows.append(filtered_rows)
-            
-    # Concatenate the result rows into a single dataframe
-    result_df = pd.concat(result_rows, ignore_index=True)
-    # Drop duplicates from the resulting dataframe
-    result_df = result_df.loc[result_df.astype(str).drop_duplicates().index]
+@helper.profiled()
+def pickOneDataframe(df, policy='first'):
+    # keeps only one collection per platform and query, chosen by policy:
+    #   'first': the earliest collection
+    #   'latest': the last collection
+    #   'trending': the collection closest to when the query was first trending
+    group_keys = ['platform', 'searchTerm']
+    collection_keys = group_keys + ['collectedTime']
+    collections = df.groupby(collection_keys, observed=True)
+    if policy == 'first':
+        chosen = collections.size().reset_index().drop_duplicates(subset=group_keys, keep='first')
+    elif policy == 'latest':
+        chosen = collections.size().reset_index().drop_duplicates(subset=group_keys, keep='last')
+    elif policy == 'trending':
+        chosen = collections['firstTrending'].min().reset_index()
+        chosen['distance'] = (chosen['collectedTime'] - chosen['firstTrending']).abs()
+        chosen = chosen.loc[chosen.groupby(group_keys, observed=True)['distance'].idxmin()]
+    else:
+        raise ValueError(f"unknown policy for picking a collection: {policy}")
+
+    result_df = df.merge(chosen[collection_keys], on=collection_keys, how='inner')
+    result_df = result_df[result_df['url'].notna()]
+    # same order as picking the posts url by url: by platform and query, then by where a post first appears
+    result_df['post order'] = result_df.groupby(group_keys + ['post identity'], sort=False, observed=True).ngroup()
+    result_df = result_df.sort_values(by=group_keys + ['post order'], kind='stable')
+    result_df = result_df.drop(columns='post order').reset_index(drop=True)
+    # Drop duplicates from the resulting dataframe. Only rows of the same post in the
+    # same collection can be duplicates, so only those are compared, by their fingerprints
+    maybe_duplicate = result_df.duplicated(subset=collection_keys + ['post identity'], keep=False)
+    duplicate = helper.getContentFingerprints(result_df[maybe_duplicate]).duplicated()
+    result_df = result_df.drop(index=duplicate.index[duplicate])
 
     return result_df
 
@@ -325,69 +332,50 @@ def pickOneDataframe(df):
 
 # @st.cache_data
 
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-
 def clean_fb_url(full_url):
-    if 'watch' in full_url:
-        return full_url
-    
-    parsed_url = urlparse(full_url)
-    query_params = parse_qs(parsed_url.query)
-
-    # Retain only the 'story_fbid' parameter
-    clean_query_params = {k: v for k, v in query_params.items() if k == 'story_fbid'}
-
-    # Rebuild the query string
-    clean_query_string = urlencode(clean_query_params, doseq=True)
-
-    # Rebuild the URL
-    clean_url = urlunparse(parsed_url._replace(query=clean_query_string))
-    
-    return clean_url
+    return helper.getCanonicalUrl(full_url, 'facebook')[0]
 
 def getUniqueVideos(df):
-    df = df.drop_duplicates(subset='url', keep='last')
+    df = df.drop_duplicates(subset='post identity', keep='last')
     return df
 
-@st.cache_data
+TRENDING_QUERIES_FILE = './static/political_queries.csv'
+
+@helper.profiled()
 def addMoreData(df):
     df['likes'] = pd.to_numeric(df['likes'], errors='coerce')
     df['text'] = df['text'].astype(str)
-    trending_time_grouped = df.groupby('url')['trendingTime'].apply(list).reset_index()
-    df = df.drop(columns='trendingTime').drop_duplicates().merge(trending_time_grouped, on='url')
-    df['firstTrending'] = df['trendingTime'].apply(getFirstTrending)
+    # event, first trending time and hours since trending of every post, from one as-of
+    # join against the trending timeline, before rows which only differ by trending time are dropped
+    events = helper.TrendingEvents.from_sources(TRENDING_QUERIES_FILE, df)
+    trending = events.annotate(df, first_by='url')
+    df = df.drop(columns='trendingTime')
+    duplicate = helper.getContentFingerprints(df).duplicated()
+    df = df.join(trending)
+    df = df[~duplicate & df['url'].notna()].reset_index(drop=True)
     return df
 
-def getFirstTrending(trendingTime):
-    try:
-        firstTrending = min(trendingTime)
-    except:
-        timefmt = "%m-%d-%H"
-        firstTrending = datetime.strptime("01-01-00", timefmt).replace(year=2024)
-    
-    return firstTrending
-
 def tiktokAddData(df):
     df['diversificationLabels'] = df['diversificationLabels'].astype(str).str.replace("'", "")
     df['suggestedWords'] = df['suggestedWords'].astype(str).str.replace("'", "")
     return df
 
 def facebookCleanUpData(df):
-    df = df[~df['url'].str.contains('login/?', regex=False)]
+    df = df[~df['url'].str.contains('/login/', regex=False)]
     df = df[~df['type'].str.contains('unknown', regex=False)]
     df = df[df['upload time'].notna()]
     df = df[df['collectedTime'].notna()]
     return df
 
 def countNumResults(df):
-    result_df = df.groupby(['searchTerm', 'url'])['collectedTime'].apply(lambda x: list(set(x))).reset_index()
+    result_df = df.groupby(['searchTerm', 'post identity'], observed=True).agg(url=('url', 'first'), collectedTime=('collectedTime', lambda x: list(set(x)))).reset_index()
     result_df['count'] = result_df['collectedTime'].apply(len)
     result_df = result_df[['url', 'count', 'searchTerm', 'collectedTime']].sort_values(by='count', ascending=False)
 
     return result_df
 
 def sameVideoDifQuery(df):
-    result_df = df.groupby('url')['searchTerm'].apply(lambda x: list(set(x))).reset_index()
+    result_df = df.groupby('post identity').agg(url=('url', 'first'), searchTerm=('searchTerm', lambda x: list(set(x)))).reset_index()
     result_df['queries count'] = result_df['searchTerm'].apply(len)
     result_df = result_df[['url', 'queries count', 'searchTerm']].sort_values(by='queries count', ascending=False)
 
@@ -401,9 +389,8 @@ def countNumOfSameVideoOccurences(df):
     return result_df
 
 def videosPerQuery(df):
-    result_df = df.groupby('searchTerm')['url'].apply(list).reset_index()
-    result_df['videos'] = result_df['url'].apply(len)
-    result_df = result_df[['searchTerm', 'videos']].sort_values(by='videos', ascending=False)
+    result_df = asCube(df).totals('searchTerm')['posts'].rename('videos').reset_index()
+    result_df = result_df.sort_values(by='videos', ascending=False)
 
     return result_df
 
@@ -421,18 +408,14 @@ def countNumOfVideoOccurences(df):
     return result_df
 
 def countViewsPerAccount(df):
-    df = df[df['user name'].notna()]
-    df = df[df['likes'].notna()]
-    df = df[df['user name'] != 'None']
-    df = df[df['likes'] != 'None']
-    result_df = df.groupby('user name')['likes'].sum().reset_index()
-    result_df = result_df.sort_values(by='likes', ascending=False)
+    result_df = asCube(df).accountTotals()
+    result_df = result_df[(result_df['liked posts'] > 0) & (result_df['user name'] != 'None')]
+    result_df = result_df[['user name', 'likes']].sort_values(by='likes', ascending=False)
     return result_df.head(10)
 
 def createAccountsDistribution(df):
-    df = df[df['user name'] != 'None']
-    result_df = df.groupby('user name')['url'].apply(list).reset_index()
-    result_df['frequency'] = result_df['url'].apply(len)
+    result_df = asCube(df).accountTotals()
+    result_df = result_df[result_df['user name'] != 'None'].rename(columns={'posts': 'frequency'})
     result_df = result_df[['user name', 'frequency']].sort_values(by='frequency', ascending=False)
     return result_df.head(10)
 
@@ -462,17 +445,8 @@ def countFreshContent(df, platform):
     # # }
 
 
-    df['upload time'] = df.apply(convert_upload, axis=1)
-
-    if platform == "tiktok":
-        freshness_df = checkFreshnessOfDataTikTok(df)
-    else:
-        freshness_df = checkFreshnessOfData(df)
-
-    freshness_by_hours_df = postedLessThanXHoursAgo(freshness_df, 24)
-    mean_hours = round(freshness_by_hours_df['rank'].mean(), 2)
-    median_hours = freshness_by_hours_df['rank'].median()
-    percentage_hours = round(len(freshness_by_hours_df) / len(df) * 100, 2)
+    totals = asCube(df).totals()
+    percentage_hours = round(totals['fresh posts'] / totals['posts'] * 100, 2)
 
     return {
         "platform": platform,
@@ -480,12 +454,12 @@ def countFreshContent(df, platform):
     }
 
 def createPlatformStats(df, function):
-    platforms = df['platform'].unique()
+    platforms = platformsOf(df)
     platform_stats = []
     
     for platform in platforms:
         #if not (platform == 'youtube'):
-        platform_df = df[df['platform'] == platform]
+        platform_df = forPlatform(df, platform)
         stats = function(platform_df, platform)
         platform_stats.append(stats)
     
@@ -498,11 +472,11 @@ def createPlatformStats(df, function):
     
 
 def forEachPlatform(df, function, metric1, metric2, top10=""):
-    platforms = df['platform'].unique()
+    platforms = platformsOf(df)
     platform_distributions = {}
 
     for platform in platforms:
-        platform_df = df[df['platform'] == platform]
+        platform_df = forPlatform(df, platform)
         platform_distributions[platform] = function(platform_df)
     
     # Create a DataFrame to store the ranked accounts
@@ -520,11 +494,11 @@ def forEachPlatform(df, function, metric1, metric2, top10=""):
     return all_ranks
 
 def forEachPlatform3(df):
-    platforms = df['platform'].unique()
+    platforms = platformsOf(df)
     all_ranks = pd.DataFrame()
 
     for platform in platforms:
-        platform_df = df[df['platform'] == platform]
+        platform_df = forPlatform(df, platform)
         d = countAccountCategory2(platform_df)
         
         rank = pd.DataFrame({
@@ -539,11 +513,11 @@ def forEachPlatform3(df):
     return all_ranks.reset_index(drop=True)
 
 def forEachPlatform2(df, function, metric1, metric2, top10=""):
-    platforms = df['platform'].unique()
+    platforms = platformsOf(df)
     platform_distributions = {}
 
     for platform in platforms:
-        platform_df = df[df['platform'] == platform]
+        platform_df = forPlatform(df, platform)
         platform_distributions[platform] = function(platform_df)
     
     # Create a DataFrame to store the ranked accounts
@@ -565,28 +539,57 @@ def forEachPlatform2(df, function, metric1, metric2, top10=""):
     return all_ranks
 
 def top10Posts(df):
+    if isinstance(df, helper.PostCube):
+        return df.upToRank(10)
     df = df[df['rank'] <= 10]
     return df
 
-def createWordCloud(df, column, width=400, height=200, filter = None):
-    # Concatenate all queries into a single string
-    text = ' '.join(df[column])
-    #if we give filter words, will make new set of words without the one in the filter
-    if filter:
-        filtered = ' '.join([word for word in text.split() if not any(f.lower() in word.lower() for f in filter)])
-    else:
-        filtered = text
-    # Create word cloud
-    wc = WordCloud(width=width, height=height, background_color='white', colormap="winter").generate(filtered)
-
-    # Display the word cloud using matplotlib
-    fig = plt.figure(figsize=(10, 6))
-    plt.imshow(wc, interpolation='bilinear')
-    plt.axis('off')
-
-    return fig
-
+@helper.profiled()
+def buildCube(df):
+    # aggregates of the posts computed once, which the summary tables are slices of
+    return helper.PostCube.from_frame(df)
+
+def asCube(df):
+    return df if isinstance(df, helper.PostCube) else helper.PostCube.from_frame(df)
+
+def platformsOf(df):
+    return df.platforms if isinstance(df, helper.PostCube) else df['platform'].unique()
+
+def forPlatform(df, platform):
+    # the posts of one platform, from a cube or a frame
+    if isinstance(df, helper.PostCube):
+        return df.slice({'platform': platform})
+    return df[df['platform'] == platform]
+
+WORDCLOUD_CACHE_SIZE = 16 # word cloud images kept, the least recently used is dropped first
+# whether word clouds draw two-word phrases like WordCloud.generate does. They need the text,
+# so False draws single words from the term index instead, without reading the text again
+WORDCLOUD_COLLOCATIONS = True
+
+def createWordCloud(terms, df, width=400, height=200, filter=None, collocations=None):
+    # terms is a selection of the term index of df's posts, with the same filter,
+    # so the image is cached by slice, filter, size and whether it has phrases
+    collocations = WORDCLOUD_COLLOCATIONS if collocations is None else collocations
+    return renderWordCloud(terms, df, filter, terms.key, width, height, collocations)
+
+@st.cache_data(max_entries=WORDCLOUD_CACHE_SIZE)
+@helper.profiled(rows=False)
+def renderWordCloud(_terms, _df, _filter, terms_key, width, height, collocations):
+    from wordcloud import WordCloud, STOPWORDS
+    wc = WordCloud(width=width, height=height, background_color='white', colormap="winter", collocations=collocations)
+    if collocations:
+        # the text without filtered words, as phrases are pairs of words next to each other
+        matcher = helper.compileFilter(_filter or ())
+        words = ' '.join(_df['text'].astype(str)).split()
+        return wc.generate(' '.join(word for word in words if matcher is None or not matcher.search(word.lower()))).to_array()
+    # drawn from the word counts, without reading the text again
+    frequencies = helper.cloudFrequencies(_terms, stopwords=STOPWORDS)
+    return wc.generate_from_frequencies(frequencies).to_array()
+
+@helper.profiled()
 def boxPlot(df):
+    import matplotlib.pyplot as plt
+    import seaborn
     f2 = plt.figure(figsize=(15, 10))
     seaborn.boxplot(x='platform', y='likes', data=df, hue='platform', palette="Blues_d")
 
@@ -597,118 +600,162 @@ def boxPlot(df):
     
     return f2
 
-def parse_collected_time(time_str):
-    if isinstance(time_str, pd.Timestamp):
-        return time_str
-    try:
-        # Assume the format is 'MM-DD-HH'
-        month, day, hour = time_str.split('-')
-        return pd.Timestamp(year=2024, month=int(month), day=int(day), hour=int(hour))
-    except Exception as e:
-        print(f"Error parsing time_str '{time_str}': {e}")
-        return None
+@helper.profiled()
+def addFreshness(df):
+    # hours from upload to collection of every post, computed once here so the
+    # freshness functions and panels only read the time_difference_hours column
+    collected_times = convert_collected(df['collectedTime'])
+    upload_times = convert_upload(df['upload time'])
+    hours = (collected_times - upload_times) / pd.Timedelta(hours=1)
+    return df.assign(**{
+        'collectedTime': collected_times,
+        'upload time': upload_times,
+        'time_difference_hours': hours.astype('float32'),
+    })
+
+def withFreshness(df):
+    if 'time_difference_hours' not in df.columns:
+        df = addFreshness(df)
+    return df
 
 def checkFreshnessOfData(df):
-    # Convert 'collectedTime' to datetime, assuming the year is 2024 for consistency
-
-    # Apply the function to the 'collectedTime' column
-    df['collectedTime'] = df['collectedTime'].apply(parse_collected_time)
-
-    # Convert 'upload time' to datetime
-    df['upload time'] = df.apply(convert_upload, axis=1)
-    # Calculate the difference in hours
-    df['time_difference_hours'] = df.apply(calculate_time_difference, axis=1)
+    df = withFreshness(df)
     df = df[df['time_difference_hours'].notna()]
-    df = df[df['time_difference_hours'] != 'None']
 
     df = df[['url', 'time_difference_hours', 'collectedTime', 'upload time', 'likes', 'rank', 'user name', 'platform']]
     return df
 
 
 def checkFreshnessOfDataTikTok(df):
-    # Convert 'collectedTime' to datetime, assuming the year is 2024 for consistency
-
-    # Apply the function to the 'collectedTime' column
-    df['collectedTime'] = df['collectedTime'].apply(parse_collected_time)
-
-    # Convert 'upload time' to datetime
-    df['upload time'] = df.apply(convert_upload, axis=1)
-    df['upload time'] = df['upload time'] - pd.Timedelta(hours=4) #check if i should add hours for this
-    # Calculate the difference in hours
-    df['time_difference_hours'] = df.apply(calculate_time_difference, axis=1)
-    df = df[df['time_difference_hours'].notna()]
-    df = df[df['time_difference_hours'] != 'None']
+    # TikTok times are converted to the collection time zone when read, so this is the same as other platforms
+    df = checkFreshnessOfData(df)
 
     df = df[['url', 'time_difference_hours', 'collectedTime', 'upload time', 'likes', 'rank', 'user name']]
     return df
 
 def checkFreshnessOfDataInstagram(df):
-    # Convert 'collectedTime' to datetime, assuming the year is 2024 for consistency
-    df['collectedTime'] = df['collectedTime'].apply(parse_collected_time)
-
-    # Convert 'upload time' to datetime
-    df['upload time'] = df.apply(convert_upload, axis=1)
-    df['upload time'] = df['upload time']
+    # withFreshness may give back the caller's frame, so columns are added with assign, never in place
+    df = withFreshness(df)
 
     # Extract month and day
-    df['collected_month_day'] = df['collectedTime'].dt.strftime('%m-%d')
-    df['upload_month_day'] = df['upload time'].dt.strftime('%m-%d')
+    df = df.assign(collected_month_day=df['collectedTime'].dt.strftime('%m-%d'),
+                   upload_month_day=df['upload time'].dt.strftime('%m-%d'))
 
     # Calculate 'fresh' column
-    df['fresh'] = ((df['collected_month_day'] == df['upload_month_day']) | 
-                   (df['collected_month_day'] == (df['upload time'] + pd.Timedelta(days=1)).dt.strftime('%m-%d'))).astype(int)
+    df = df.assign(fresh=((df['collected_month_day'] == df['upload_month_day']) |
+                          (df['collected_month_day'] == (df['upload time'] + pd.Timedelta(days=1)).dt.strftime('%m-%d'))).astype(int))
 
     df = df[['url', 'collectedTime', 'upload time', 'collected_month_day', 'upload_month_day', 'likes', 'rank', 'user name', 'fresh', 'platform']]
 
     return df
 
 def checkRecentnessOfContent(df):
-    df['collectedTime'] = df['collectedTime'].apply(parse_collected_time)
-    # df['firstTrending'] = df['firstTrending'].apply(parse_trending_time)
-    df['trendingCollectedDifference'] = df.apply(calculate_time_difference_trending, axis=1)
-    df['firstTrending'] = df['firstTrending'].apply(parse_collected_time)
+    df = df.assign(collectedTime=convert_collected(df['collectedTime']), firstTrending=convert_collected(df['firstTrending']))
+    if 'trendingCollectedDifference' not in df.columns:
+        df['trendingCollectedDifference'] = (df['collectedTime'] - df['firstTrending']) / pd.Timedelta(hours=1)
     df = df[df['trendingCollectedDifference'].notna()]
-    df = df[df['trendingCollectedDifference'] != 'None']
-    timefmt = "%m-%d-%H"
-    time = datetime.strptime("01-01-00", timefmt).replace(year=2024)
-    df = df[df['firstTrending'] != time]
+    df = df[df['firstTrending'] != helper.NO_TRENDING_TIME]
     return df
 
-def convert_upload(row):
-    try:
-        return pd.to_datetime(row['upload time'])
-    except:
-        return None
-
-def calculate_time_difference(row):
-    try:
-        time_difference = row['collectedTime'] - row['upload time']
-        hours_difference = time_difference.total_seconds() / 3600
-        return hours_difference
-    except:
-        return None
+def convert_collected(collected_times):
+    if pd.api.types.is_datetime64_any_dtype(collected_times):
+        return collected_times
+    # 'MM-DD-HH' strings, from collections made in 2024
+    return pd.to_datetime('2024-' + collected_times.astype(str), format='%Y-%m-%d-%H', errors='coerce')
 
-def calculate_time_difference_trending(row):
-    try:
-        return (row['collectedTime'] - row['firstTrending']).total_seconds() / 3600
-    except:
-        return None
+def convert_upload(upload_times):
+    # upload times are parsed and converted to one time zone when files are read,
+    # so this only has to deal with columns which did not come from the readers
+    if pd.api.types.is_datetime64_any_dtype(upload_times):
+        return upload_times
+    return pd.to_datetime(upload_times, errors='coerce')
 
 def postedLessThanXHoursAgo(df, hours):
     filtered_df = df[df['time_difference_hours'] <= hours]
     return filtered_df
 
-def countLikesOverTime(df):
-    results = []
-    for i in range(1, 480):
-        freshness_by_hours_df = postedLessThanXHoursAgo(df, i)
-        likes_hours = round(freshness_by_hours_df['likes'].mean(), 2)
-        results.append({'hours': i, 'average likes': likes_hours})
-    
-    return pd.DataFrame(results)
+# ages of posts the likes over time are computed for, in hours before collection
+LIKES_OVER_TIME_HOURS = range(1, 480)
+
+@helper.profiled()
+def countLikesOverTime(df, hours=LIKES_OVER_TIME_HOURS, by=None, median=False, count=False):
+    # likes of posts posted less than X hours ago, for every X in hours at once.
+    # sorted by group and age, the posts of a group less than X hours old are a run of
+    # its posts, so the average for every X comes from one cumulative sum instead of a filter per X
+    df = withFreshness(df)
+    if by is None:
+        codes, keys = np.zeros(len(df), dtype='int64'), [None]
+    else:
+        codes, keys = pd.factorize(df[by], sort=True)
+    ages = df['time_difference_hours'].to_numpy(dtype='float64', na_value=np.nan)
+    likes = df['likes'].to_numpy(dtype='float64', na_value=np.nan)
+    kept = ~np.isnan(ages) & ~np.isnan(likes) & (codes >= 0)
+    order = np.lexsort((ages[kept], codes[kept]))
+    ages, likes, codes = ages[kept][order], likes[kept][order], codes[kept][order]
+
+    hours = np.sort(np.asarray(hours))
+    groups = np.arange(len(keys))
+    # ages of each group are moved past the ages of the groups before it, so that one
+    # search finds the end of every group's run for every X
+    lowest = min(ages.min(initial=0), hours.min(initial=0))
+    span = max(ages.max(initial=0), hours.max(initial=0)) - lowest + 1
+    starts = np.repeat(np.searchsorted(codes, groups), len(hours))
+    ends = np.searchsorted(codes * span + (ages - lowest), (groups[:, None] * span + (hours - lowest)).ravel(), side='right')
+
+    sums = np.concatenate(([0.0], np.cumsum(likes)))
+    posts = ends - starts
+    with np.errstate(invalid='ignore', divide='ignore'):
+        averages = (sums[ends] - sums[starts]) / posts
+
+    results = pd.DataFrame({'hours': np.tile(hours, len(keys)), 'average likes': np.round(averages, 2)})
+    if by is not None:
+        results.insert(0, by, np.repeat(np.asarray(keys), len(hours)))
+    if median:
+        results['median likes'] = sliceMedians(likes, starts, ends)
+    if count:
+        results['posts'] = posts
+    return results
+
+def sliceMedians(values, starts, ends):
+    # median of values[start:end] for every start and end, without sorting any slice.
+    # values are split by size into blocks of about sqrt(n), and counting how many of each
+    # block's values are in a slice finds the block of its middle values, searched alone
+    starts, ends = np.asarray(starts), np.asarray(ends)
+    medians = np.full(len(ends), np.nan)
+    sizes = ends - starts
+    slices = (sizes > 0).nonzero()[0]
+    if not len(slices):
+        return medians
+    starts, ends, sizes = starts[slices], ends[slices], sizes[slices]
+
+    length = len(values)
+    block = max(int(np.sqrt(length)), 1)
+    blocks = np.arange(-(-length // block))
+    by_size = np.argsort(values, kind='stable') # positions of the values, smallest first
+    # positions of the values of each block, made distinct across blocks so that one search
+    # counts those below a position in every block
+    keys = np.sort(np.arange(length) // block * length + by_size)
+    def below(positions):
+        return np.searchsorted(keys, blocks * length + positions[:, None]) - blocks * block
+    inside = below(ends) - below(starts)
+    cumulative = np.cumsum(inside, axis=1)
+    rows = np.arange(len(slices))
+
+    def nth(ranks):
+        # the value of each slice with ranks smaller values in the slice
+        found = (cumulative <= ranks[:, None]).sum(axis=1)
+        ranks = ranks - (cumulative[rows, found] - inside[rows, found])
+        columns = np.minimum(found[:, None] * block + np.arange(block), length - 1)
+        positions = by_size[columns]
+        in_slice = (positions >= starts[:, None]) & (positions < ends[:, None])
+        in_slice[:, 1:] &= columns[:, 1:] != columns[:, :-1] # the last block may be short
+        return values[positions[rows, np.argmax(np.cumsum(in_slice, axis=1) > ranks[:, None], axis=1)]]
+
+    medians[slices] = (nth((sizes - 1) // 2) + nth(sizes // 2)) / 2
+    return medians
 
 def getQueries(df):
-    result_df = df.groupby('searchTerm')
+    result_df = df.groupby('searchTerm', observed=True)
     return result_df
 
 def getAccounts(df):
@@ -733,11 +780,10 @@ def exportToCSV(df):
     df.to_csv('../trumpData.csv')
 
 def statsPerPlatform(df, platform):
-    numOfVid = len(df)
-    unique_df = getUniqueVideos(df)
-    numOfUniqueVid = len(unique_df)
-    accounts_df = getAccounts(df)
-    numOfAccounts = len(accounts_df)
+    cube = asCube(df)
+    numOfVid = len(cube)
+    numOfUniqueVid = cube.distinct('post identity')
+    numOfAccounts = cube.distinct('user name')
 
     return {
         "platform": platform,
@@ -746,42 +792,31 @@ def statsPerPlatform(df, platform):
         "number of accounts": numOfAccounts
     }
 
+@helper.profiled()
 def hoursSincePostedPerRank(df):
     freshness_df = checkFreshnessOfData(df)
-    freshness_df = freshness_df[freshness_df['time_difference_hours'].notna()]
-    freshness_df = freshness_df[freshness_df['time_difference_hours'] != 'None']
-    rank_grouped = freshness_df.groupby(['rank', 'platform']).agg({
-        'url': list,
-    'time_difference_hours': list
-    }).reset_index()
-    rank_grouped['avg_hours'] = rank_grouped['time_difference_hours'].apply(lambda x: sum(x) / len(x))
-    rank_grouped['median_hours'] = rank_grouped['time_difference_hours'].apply(lambda x: np.median(x))
-    rank_grouped = rank_grouped[['rank', 'platform', 'avg_hours', 'median_hours']]
+    rank_grouped = freshness_df.groupby(['rank', 'platform'], observed=True)['time_difference_hours'].agg(
+        avg_hours='mean',
+        median_hours='median',
+    ).reset_index()
 
     return rank_grouped
 
 def hoursSincePostedPerRank2(df):
     # Check freshness of data
     freshness_df = checkFreshnessOfData(df)
-    
-    # Filter out rows where 'time_difference_hours' is not available or 'None'
-    freshness_df = freshness_df[freshness_df['time_difference_hours'].notna()]
-    freshness_df = freshness_df[freshness_df['time_difference_hours'] != 'None']
     freshness_df = freshness_df[(freshness_df['rank'] >= 0) & (freshness_df['rank'] <= 9)]
 
-    # Group by 'rank' and 'platform' and aggregate 'time_difference_hours'
-    rank_grouped = freshness_df.groupby(['platform']).agg({
-        'url': list,
-        'time_difference_hours': list
-    }).reset_index()
-    
-    rank_grouped['median_hours'] = rank_grouped['time_difference_hours'].apply(lambda x: np.median(x))
-    
-    rank_grouped = rank_grouped[['platform', 'median_hours']]
+    # Median of 'time_difference_hours' per platform
+    rank_grouped = freshness_df.groupby(['platform'], observed=True)['time_difference_hours'].agg(
+        median_hours='median',
+    ).reset_index()
     
     return rank_grouped
 
 def createHoursPlot(df):
+    import matplotlib.pyplot as plt
+    import seaborn
     df = df.head(40)
     fig = plt.figure(figsize=(12, 8))
     seaborn.barplot(data=df, y='median_hours', x='rank', hue='platform', palette="Blues_d") 
@@ -793,6 +828,8 @@ def createHoursPlot(df):
     return fig
 
 def createOverallHoursPlot(df):
+    import matplotlib.pyplot as plt
+    import seaborn
     df = df.head(300)
     fig2 = plt.figure(figsize=(12, 8))
     seaborn.barplot(data=df, y='median_hours', x='rank', palette="Blues_d") 
@@ -812,6 +849,8 @@ def getTopVideos(df):
 
 @st.cache_resource
 def createHorizontalBar(df):
+    import matplotlib.pyplot as plt
+    import seaborn
     seaborn.set_theme(style="whitegrid")
 
     f, ax = plt.subplots(figsize=(4, 4))
@@ -828,6 +867,8 @@ def createHorizontalBar(df):
     return f
 
 def createBar(df):
+    import matplotlib.pyplot as plt
+    import seaborn
     df = df[df['trendingCollectedDifference'] < 513]
     seaborn.set_theme(style="whitegrid")
 
@@ -855,7 +896,7 @@ def countAccountCategory(df):
     ind = df[df['cat'] == 'IND']
     org_likes = org['likes'].sum()
     ind_likes = ind['likes'].sum()
-    acc_num = df.groupby('cat')['user name'].apply(lambda x: list(set(x))).reset_index()
+    acc_num = df.groupby('cat', observed=True)['user name'].apply(lambda x: list(set(x))).reset_index()
     acc_num['count'] = acc_num['user name'].apply(len)
 
     # data = {
@@ -883,16 +924,15 @@ def countAccountCategory(df):
     return new_df
 
 def countAccountCategory2(df):
-    org = df[df['cat'] == 'ORG']
-    ind = df[df['cat'] == 'IND']
-    org_likes = org['likes'].sum()
-    ind_likes = ind['likes'].sum()
-    acc_num = df.groupby('cat')['user name'].apply(lambda x: list(set(x))).reset_index()
-    acc_num['count'] = acc_num['user name'].apply(len)
+    cube = asCube(df)
+    per_cat = cube.totals('cat')
+    org_likes = per_cat['likes'].get('ORG', 0)
+    ind_likes = per_cat['likes'].get('IND', 0)
+    acc_num = cube.distinct('user name', by='cat').rename('count').reset_index()
 
     new_data = {
-        'accounts' : getAccNum(acc_num, "ORG") / len(getAccounts(df)) *100,
-        'videos' : len(org) / len(df) * 100, 
+        'accounts' : getAccNum(acc_num, "ORG") / cube.distinct('user name') *100,
+        'videos' : per_cat['posts'].get('ORG', 0) / len(cube) * 100, 
         'likes': org_likes / (org_likes + ind_likes) *100,
     }
 
@@ -900,7 +940,7 @@ def countAccountCategory2(df):
 
 def countLikesPerAccountCat(df):
     # Group by 'cat' and calculate the mean of the 'likes' column
-    avg_likes_per_cat = df.groupby('cat')['likes'].mean().reset_index()
+    avg_likes_per_cat = df.groupby('cat', observed=True)['likes'].mean().reset_index()
     
     # Rename the column for clarity
     avg_likes_per_cat.rename(columns={'likes': 'average_likes'}, inplace=True)
@@ -908,6 +948,8 @@ def countLikesPerAccountCat(df):
     return avg_likes_per_cat
 
 def createAccountCatChart(df):
+    import matplotlib.pyplot as plt
+    import seaborn
     seaborn.set_theme(style="whitegrid")
 
     fig3, ax = plt.subplots(figsize=(8, 4))
@@ -927,7 +969,9 @@ def createAccountCatChart(df):
 
     return fig3
 
+@helper.profiled()
 def trackPostOverTime(df, metric):
+    # the metric of the Trump assassination posts seen in the most collections, at every collection
     trump_ass = df[df['searchTerm'] == "Trump assassination"]
     trump_ass_url = trump_ass.groupby('url')['collectedTime'].apply(list).reset_index()
     trump_ass_url['Count'] = trump_ass_url['collectedTime'].apply(len)
@@ -943,6 +987,12 @@ def trackPostOverTime(df, metric):
     last2 = last2.drop_duplicates(subset=["collectedTime", 'url']).sort_values(by = 'collectedTime', ascending = False)
     last2 = last2[last2['likes'].notna()]
     # last2 = last2[last2['collectedTime'] != '2024-07-16 00:00:00'] #
+    return last2[['url', 'collectedTime', metric]]
+
+@helper.profiled()
+def plotPostOverTime(last2, metric):
+    # drawn when shown, from the frame trackPostOverTime keeps
+    import matplotlib.pyplot as plt
     groups = last2.groupby('url')
     
     fig4 = plt.figure(figsize = (12, 8))
@@ -963,7 +1013,6 @@ def trackPostOverTime(df, metric):
     plt.gca().invert_yaxis()
     return fig4
 
-@st.experimental_fragment
 def getSample(df):
     query = st.selectbox("Which query do you want to see videos from?", options=df['searchTerm'].unique())
     if query:
@@ -979,207 +1028,362 @@ def calculate_org_percentage(group):
     return (org_count / total_count) * 100
 
 def orgTimePercentage(df):
-    #percentage_df = df.groupby(['trendingCollectedDifference']).apply(calculate_org_percentage).reset_index(name='orgDistribution')
-    grouped = df.groupby('trendingCollectedDifference').agg({
-    'url': list,
-    'cat': list  # Aggregate 'cat' as a list
-    }).reset_index()
-    grouped['percentageOrg'] = grouped['cat'].apply(calculate_org_percentage)
-    return grouped
-
-@st.experimental_fragment
-def findWordFrequency(df, filter):
+    # hours from first trending to collection are the same for every post of a cube cell
+    cells = asCube(df).cells
+    cells = cells.assign(
+        trendingCollectedDifference=(cells['collectedTime'] - cells['firstTrending']) / pd.Timedelta(hours=1),
+        orgPosts=cells['posts'].where(cells['cat'] == 'ORG', 0),
+    )
+    grouped = cells.groupby('trendingCollectedDifference')[['posts', 'orgPosts']].sum().reset_index()
+    grouped['percentageOrg'] = grouped['orgPosts'] / grouped['posts'] * 100
+    return grouped[['trendingCollectedDifference', 'percentageOrg']]
+
+@st.cache_resource
+@helper.profiled()
+def buildTermIndex(df):
+    # words of the posts counted once per platform and query, which word searches merge
+    return helper.TermIndex.from_frame(df, 'text', by=['platform', 'searchTerm'])
+
+def findWordFrequency(terms):
+    # terms is a selection of the term index, frequencies and ranks are looked up
     word_to_find = st.text_input("What word do you want to find?")
-    text = ' '.join(df['text'])
-    filtered = ' '.join([word for word in text.split() if not any(f.lower() in word.lower() for f in filter)])
-    words = filtered.split()
-    word_counts = Counter(words)
-    word_frequency = word_counts[word_to_find]
-    ranked_words = word_counts.most_common()
-    word_rank = next((rank for rank, (word, count) in enumerate(ranked_words, start=1) if word == word_to_find), None)
+    word_frequency = terms.frequency(word_to_find)
+    word_rank = terms.rank(word_to_find)
 
     st.write(f"Frequency: {word_frequency}; Rank: {word_rank}")
 
-# df = pd.read_csv('/Users/belle/Desktop/analysis/data.csv')
-df = pd.concat([getAllTrump(), getD()])
-# df = readData('https://raw.githubusercontent.com/bellesea/platforms_search/main/data.csv')
-# df = getAllTrump()
-df = addMoreData(df)
-df = cleanData1(df)
-df = getUserCategory(df)
-df = cleanQueries(df)
-# exportToCSV(df)
-
-unique_df = getUniqueVideos(df)
+def inputFiles():
+    # every file the dashboard is computed from
+    yield USER_LABELS_FILE
+    yield TRENDING_QUERIES_FILE
+    for directory in (TRUMP_DIRECTORY, DATA_DIRECTORY):
+        yield from selectCollectionFiles(directory)
+
+def dataVersion():
+    # changes when any input file does, from their sizes and modification times only.
+    # a digest rather than hash(), which differs between processes, so snapshots can be checked
+    signatures = []
+    for path in inputFiles():
+        stat = os.stat(path)
+        signatures.append((path, stat.st_size, stat.st_mtime_ns))
+    return hashlib.blake2b(repr(sorted(signatures)).encode(), digest_size=16).hexdigest()
+
+@helper.profiled()
+def preparePosts(ingested):
+    df, _ = ingested
+    # df = pd.read_csv('/Users/belle/Desktop/analysis/data.csv')
+    # df = readData('https://raw.githubusercontent.com/bellesea/platforms_search/main/data.csv')
+    # df = getAllTrump()
+    df = addMoreData(df)
+    df = cleanData1(df)
+    df = getUserCategory(df)
+    df = cleanQueries(df)
+    df = addFreshness(df)
+    df = enforceSchema(df)
+    # exportToCSV(df)
+    return df
 
-author_freq_df = createAccountsDistribution(df)
-queries_df = getQueries(df)
-accounts_df = getAccounts(df)
+@helper.profiled()
+def trumpPosts(df):
+    pattern = r'Trump\s*assassination|Trump\s*assasination'
+    trump_queries = df[df['searchTerm'].str.contains(pattern, case=False, regex=True)]
+    # time = datetime.strptime("07-12-00", helper.timefmt).replace(year=2024)
+    # trump_queries = trump_queries[trump_queries['upload time'] > time]
 
-author_views_freq_df = forEachPlatform(df, countViewsPerAccount, 'user name', 'likes')
-platform_ranks = forEachPlatform(df, createAccountsDistribution, 'user name', 'frequency')
+    # trump_queries = getUniqueVideos(trump_queries)
 
-one_df = pickOneDataframe(df)
-author_views_freq_df_one = forEachPlatform(one_df, countViewsPerAccount, 'user name', 'likes')
-platform_ranks_one = forEachPlatform(one_df, createAccountsDistribution, 'user name', 'frequency')
-top_10_df = top10Posts(df)
+    # exportToCSV(trump_queries)
+    return trump_queries
 
-# query_ranks_top_10 = forEachPlatform2(top_10_df, videosPerQuery, 'searchTerm','videos')
-# new_ranks = pd.concat([platform_ranks_top_10, platform_ranks], axis=1)
-# new_ranks = new_ranks[['facebook_', 'facebook_frequency_', 'facebook_top10', 'facebook_frequency_top10', 'instagram_', 'instagram_frequency_', 'instagram_top10', 'instagram_frequency_top10', 'youtube_', 'youtube_frequency_', 'youtube_top10', 'youtube_frequency_top10']]
+bad_words = ["https", 'bit ly', 'nan', 'bit', 'ly', 'youtube', 'twitter', 'facebook', 'instagram', 'https twitter', 'Facebook https', 'App https', 'app', 'Subscribe', 'bio', 'link', 'follow CBS', 'CBS New', 'NBC New', 'None None', 'None'] #'Trump', 'trump', 'assassination attempt', 'assassination', 'attempted assassination', 'donald', 'Donald', 'former President', 'attempt'
 
-ranked_df = hoursSincePostedPerRank(df)
-ranked_2_df = hoursSincePostedPerRank2(df)
-pattern = r'Trump\s*assassination|Trump\s*assasination'
-time = datetime.strptime("07-12-00", helper.timefmt).replace(year=2024)
-trump_queries = df[df['searchTerm'].str.contains(pattern, case=False, regex=True)]
-# trump_queries = trump_queries[trump_queries['upload time'] > time]
+SNAPSHOT_FILE = './snapshot.pkl'
+# datasets which are not saved in snapshots, since nothing shown needs them once the rest are computed
+UNSAVED_DATASETS = ['ingested']
 
-# trump_queries = getUniqueVideos(trump_queries)
+@st.cache_resource
+def datasetStore():
+    # datasets computed by the graph, kept across reruns until the input files change
+    return {}
 
-# exportToCSV(trump_queries)
-t_youtube = trump_queries[trump_queries['platform'] == 'youtube']
-top_10_likes = forEachPlatform(trump_queries, getTopVideos, 'url', 'likes')
-# top_10_likes = top_10_likes.sort_values(by='likes', ascending=True)
+@st.cache_resource
+def loadSnapshot(file_path, file_signature):
+    # loaded once per version of the snapshot file, file_signature changes when the file does
+    snapshot = helper.Snapshot.read(file_path)
+    store = {name: (snapshot.data_version, value) for name, value in snapshot.datasets.items()}
+    return store, snapshot.data_version
+
+def datasetSource():
+    # the datasets of the snapshot if it was built from the input files as they are now,
+    # without reading them, else the ones computed from the input files
+    if not os.path.exists(SNAPSHOT_FILE):
+        return datasetStore(), dataVersion()
+    stat = os.stat(SNAPSHOT_FILE)
+    store, snapshot_version = loadSnapshot(SNAPSHOT_FILE, (stat.st_size, stat.st_mtime_ns))
+    try:
+        version = dataVersion()
+    except OSError:
+        return store, snapshot_version # only the snapshot is deployed, without the input files
+    if version == snapshot_version:
+        return store, snapshot_version
+    st.warning(f"{SNAPSHOT_FILE} was built from other input files than the ones here, so the datasets are computed from the files. Build it again with: python app.py")
+    return datasetStore(), version
 
-# hii = checkFreshnessOfDataInstagram(trump_queries)
-# hii = hii[hii['fresh'] == 1]
-# hii = hii[hii['platform'] == 'instagram']
+# #########################
+# # Derived datasets
+# #########################
+# each dataset is computed the first time a section asks for it, from the datasets it
+# depends on, and kept for the current version of the input files
+
+def declareDatasets(store):
+    graph = helper.DatasetGraph(store)
+    graph.add('ingested', getPosts)
+    graph.add('memory report', lambda ingested: ingested[1], ['ingested'])
+    graph.add('posts', preparePosts, ['ingested'])
+    graph.add('cube', buildCube, ['posts'])
+    graph.add('one posts', pickOneDataframe, ['posts'])
+    graph.add('one cube', buildCube, ['one posts'])
+    graph.add('trump posts', trumpPosts, ['posts'])
+    graph.add('trump cube', lambda cube, trump_queries: cube.slice({'searchTerm': list(trump_queries['searchTerm'].unique())}), ['cube', 'trump posts'])
+    graph.add('term index', buildTermIndex, ['posts'])
+
+    graph.add('summary', lambda cube: createPlatformStats(cube, statsPerPlatform), ['cube'])
+    graph.add('videos per query', lambda cube: forEachPlatform2(cube, videosPerQuery, 'searchTerm','videos'), ['cube'])
+    graph.add('accounts distribution', createAccountsDistribution, ['cube'])
+    graph.add('likes per account', lambda cube: forEachPlatform(cube, countViewsPerAccount, 'user name', 'likes'), ['cube'])
+    graph.add('posts per account', lambda cube: forEachPlatform(cube, createAccountsDistribution, 'user name', 'frequency'), ['cube'])
+    graph.add('top 10 cube', top10Posts, ['cube'])
+    graph.add('org share', forEachPlatform3, ['cube'])
+    graph.add('likes per account one', lambda one_cube: forEachPlatform(one_cube, countViewsPerAccount, 'user name', 'likes'), ['one cube'])
+    graph.add('posts per account one', lambda one_cube: forEachPlatform(one_cube, createAccountsDistribution, 'user name', 'frequency'), ['one cube'])
+    # query_ranks_top_10 = forEachPlatform2(top_10_cube, videosPerQuery, 'searchTerm','videos')
+    # new_ranks = pd.concat([platform_ranks_top_10, platform_ranks], axis=1)
+    # new_ranks = new_ranks[['facebook_', 'facebook_frequency_', 'facebook_top10', 'facebook_frequency_top10', 'instagram_', 'instagram_frequency_', 'instagram_top10', 'instagram_frequency_top10', 'youtube_', 'youtube_frequency_', 'youtube_top10', 'youtube_frequency_top10']]
+
+    graph.add('hours per rank', hoursSincePostedPerRank, ['posts'])
+    graph.add('hours top 10', hoursSincePostedPerRank2, ['posts'])
+    # charts are kept as the frames they are drawn from, and drawn when shown
+    graph.add('posts over time', lambda df: trackPostOverTime(df, "rank"), ['posts'])
+    graph.add('likes over time', lambda df: countLikesOverTime(df, by='platform', median=True, count=True), ['posts'])
+
+    graph.add('trump summary', lambda trump_cube: createPlatformStats(trump_cube, statsPerPlatform), ['trump cube'])
+    graph.add('trump freshness', lambda trump_cube: createPlatformStats(trump_cube, countFreshContent), ['trump cube'])
+    graph.add('trump youtube', lambda trump_queries: trump_queries[trump_queries['platform'] == 'youtube'], ['trump posts'])
+    graph.add('trump top likes', lambda trump_queries: forEachPlatform(trump_queries, getTopVideos, 'url', 'likes'), ['trump posts'])
+    # top_10_likes = top_10_likes.sort_values(by='likes', ascending=True)
+    graph.add('trump box plot', lambda trump_queries: trump_queries[['platform', 'likes']], ['trump posts'])
+    graph.add('trump terms', lambda term_index, trump_queries: term_index.select({'searchTerm': list(trump_queries['searchTerm'].unique())}, filter=bad_words), ['term index', 'trump posts'])
+    graph.add('trump word cloud', lambda trump_terms, trump_queries: createWordCloud(trump_terms, trump_queries, filter=bad_words), ['trump terms', 'trump posts'])
+
+    # hii = checkFreshnessOfDataInstagram(trump_queries)
+    # hii = hii[hii['fresh'] == 1]
+    # hii = hii[hii['platform'] == 'instagram']
+    return graph
+
+def buildSnapshot(file_path=SNAPSHOT_FILE):
+    # computes every dataset from the input files, without the dashboard, and saves them
+    version = dataVersion()
+    graph = declareDatasets({})
+    datasets = {name: graph.get(name, version) for name in graph if name not in UNSAVED_DATASETS}
+    helper.Snapshot(datasets, version).write(file_path)
+    return datasets
 
 # ########################
 # # Streamlit stuff
 # ########################
-st.header("Learning about political content on Social Media")
-if st.checkbox('All: Show raw data'):
-    st.write(df)
-one, two, three, four = st.columns(4)
-with one:
-    st.metric(label="Collected videos", value=len(df))
-with two:
-    st.metric(label="Unique videos", value=len(unique_df))
-with three:
-    st.metric(label="Queries searched", value=len(queries_df))
-with four:
-    st.metric(label="Number of accounts", value=len(accounts_df))
-
-st.subheader("Summary of data collection")
-summary_data = createPlatformStats(df, statsPerPlatform)
-summary_data
-
-st.subheader("How many videos are there per query?")
-query_ranks = forEachPlatform2(df, videosPerQuery, 'searchTerm','videos')
-query_ranks
-
-getSample(df)
-
-st.markdown("""---""")
-
-st.header("Looking at freshness across platform")
-
-st.subheader("Analyzing post freshness by rank")
-st.caption("Looking at the first 10 posts seen in the search results for each platform")
-
-chart = alt.Chart(ranked_df.head(40)).mark_bar().encode(
-    x=alt.X('rank:O'),
-    y='median_hours:Q',
-    color=alt.Color('platform:N', scale=alt.Scale(scheme='blues'))
-).properties(
-    width=600,
-    height=400
-).configure_axis(
-    labelFontSize=12,
-    titleFontSize=14
-).configure_legend(
-    titleFontSize=14,
-    labelFontSize=12
-)
-
-st.altair_chart(chart)
-
-st.caption("Looking at the the correlation in time passed between posting and being seen on the search page and rank")
-chart2 = alt.Chart(ranked_df.head(300)).mark_bar().encode(
-    x=alt.X('rank:O'),
-    y='median_hours:Q',
-    color=alt.Color('platform:N', scale=alt.Scale(scheme='blues'))
-).properties(
-    width=600,
-    height=400
-).configure_axis(
-    labelFontSize=12,
-    titleFontSize=14
-).configure_legend(
-    titleFontSize=14,
-    labelFontSize=12
-)
-
-st.altair_chart(chart2)
-
-# # hours_chart = createHoursPlot(ranked_df)
-# hours_all_chart = createOverallHoursPlot(ranked_df)
-# # st.pyplot(hours_chart)
-# st.pyplot(hours_all_chart)
-
-st.subheader("Who is creating the videos?")
-st.caption("What percentage of X on each platform comes from organizations?")
-platform_org_cat = forEachPlatform3(df)
-st.write(platform_org_cat)
-st.caption("Top 10 accounts by total engagement received by the account")
-author_views_freq_df_one
-st.caption("Top 10 accounts by number of posts created")
-platform_ranks_one
-
-st.header("Case Study: Posts about Trump Assassination")
-st.write("Looking at data about trump")
-trump_summary = createPlatformStats(trump_queries, statsPerPlatform)
-freshness_platform_df_t = createPlatformStats(trump_queries, countFreshContent)
-unique_df_t = getUniqueVideos(trump_queries)
-queries_df_t = getQueries(trump_queries)
-accounts_df_t = getAccounts(trump_queries)
-
-if st.checkbox('Trump: Show raw data'):
-    st.write(trump_queries)
-
-one, two, three, four = st.columns(4)
-with one:
-    st.metric(label="Collected videos", value=len(trump_queries))
-with two:
-    st.metric(label="Unique videos", value=len(unique_df_t))
-with three:
-    st.metric(label="Queries searched", value=len(queries_df_t))
-with four:
-    st.metric(label="Number of accounts", value=len(accounts_df_t))
-
-st.write(trump_summary)
-# st.write(freshness_platform_df_t)
-# st.bar_chart(freshness_platform_df_t, x='platform', y='percentage',  color='#5481A6')
-chart3 = alt.Chart(freshness_platform_df_t).mark_bar().encode(
-    x=alt.X('platform:N', title='Platform'),
-    y=alt.Y('percentage:Q', title='Percentage'),
-    color=alt.Color('platform:N', scale=alt.Scale(scheme='blues'))
-).properties(
-    width=600,
-    height=400
-).configure_axis(
-    labelFontSize=12,
-    titleFontSize=14
-).configure_legend(
-    titleFontSize=14,
-    labelFontSize=12
-)
-st.altair_chart(chart3)
-
-st.subheader("Engagement for videos")
-box_plot = boxPlot(trump_queries)
-st.pyplot(box_plot)
-
-st.subheader("How do posts do over time?")
-posts_over_time = trackPostOverTime(df, "rank")
-st.pyplot(posts_over_time)
-
-
-st.subheader("What are people saying?")
-bad_words = ["https", 'bit ly', 'nan', 'bit', 'ly', 'youtube', 'twitter', 'facebook', 'instagram', 'https twitter', 'Facebook https', 'App https', 'app', 'Subscribe', 'bio', 'link', 'follow CBS', 'CBS New', 'NBC New', 'None None', 'None'] #'Trump', 'trump', 'assassination attempt', 'assassination', 'attempted assassination', 'donald', 'Donald', 'former President', 'attempt'
-description1_wordcloud = createWordCloud(trump_queries, column='text', filter = bad_words)
-st.pyplot(description1_wordcloud)
-
-findWordFrequency(trump_queries, filter = bad_words)
+# every section is a fragment, so its widgets only rerun it, and sections which are not
+# shown never ask for their datasets
+
+def rankChart(ranked_df):
+    import altair as alt
+    return alt.Chart(ranked_df).mark_bar().encode(
+        x=alt.X('rank:O'),
+        y='median_hours:Q',
+        color=alt.Color('platform:N', scale=alt.Scale(scheme='blues'))
+    ).properties(
+        width=600,
+        height=400
+    ).configure_axis(
+        labelFontSize=12,
+        titleFontSize=14
+    ).configure_legend(
+        titleFontSize=14,
+        labelFontSize=12
+    )
+
+def collectionMetrics(cube):
+    one, two, three, four = st.columns(4)
+    with one:
+        st.metric(label="Collected videos", value=len(cube))
+    with two:
+        st.metric(label="Unique videos", value=cube.distinct('post identity'))
+    with three:
+        st.metric(label="Queries searched", value=cube.distinct('searchTerm'))
+    with four:
+        st.metric(label="Number of accounts", value=cube.distinct('user name'))
+
+@st.fragment
+@helper.profiled(rows=False)
+def overviewSection(graph, version):
+    if st.checkbox('All: Show raw data'):
+        st.write(graph.get('posts', version))
+    if st.checkbox('All: Show memory use'):
+        st.caption("Memory used by each column of the collected posts, before and after giving them compact types")
+        st.write(graph.get('memory report', version))
+    collectionMetrics(graph.get('cube', version))
+
+    st.subheader("Summary of data collection")
+    st.write(graph.get('summary', version))
+
+    st.subheader("How many videos are there per query?")
+    st.write(graph.get('videos per query', version))
+
+    getSample(graph.get('posts', version))
+
+@st.fragment
+@helper.profiled(rows=False)
+def freshnessSection(graph, version):
+    st.markdown("""---""")
+
+    st.header("Looking at freshness across platform")
+
+    st.subheader("Analyzing post freshness by rank")
+    st.caption("Looking at the first 10 posts seen in the search results for each platform")
+    ranked_df = graph.get('hours per rank', version)
+    st.altair_chart(rankChart(ranked_df.head(40)))
+
+    st.caption("Looking at the the correlation in time passed between posting and being seen on the search page and rank")
+    st.altair_chart(rankChart(ranked_df.head(300)))
+
+    st.subheader("How many likes do fresh posts get?")
+    # the curves hold every age already, so moving the slider only picks a row of them
+    curves = graph.get('likes over time', version)
+    hours = st.slider("Posts posted less than this many hours before collection", min_value=LIKES_OVER_TIME_HOURS.start,
+                      max_value=LIKES_OVER_TIME_HOURS.stop - 1, value=24)
+    st.write(curves[curves['hours'] == hours].drop(columns='hours').set_index('platform'))
+    st.line_chart(curves, x='hours', y='average likes', color='platform')
+
+    # # hours_chart = createHoursPlot(ranked_df)
+    # hours_all_chart = createOverallHoursPlot(ranked_df)
+    # # st.pyplot(hours_chart)
+    # st.pyplot(hours_all_chart)
+
+@st.fragment
+@helper.profiled(rows=False)
+def creatorsSection(graph, version):
+    st.subheader("Who is creating the videos?")
+    st.caption("What percentage of X on each platform comes from organizations?")
+    st.write(graph.get('org share', version))
+    st.caption("Top 10 accounts by total engagement received by the account")
+    st.write(graph.get('likes per account one', version))
+    st.caption("Top 10 accounts by number of posts created")
+    st.write(graph.get('posts per account one', version))
+
+@st.fragment
+@helper.profiled(rows=False)
+def trumpSection(graph, version):
+    import altair as alt
+    st.header("Case Study: Posts about Trump Assassination")
+    st.write("Looking at data about trump")
+
+    if st.checkbox('Trump: Show raw data'):
+        st.write(graph.get('trump posts', version))
+
+    collectionMetrics(graph.get('trump cube', version))
+
+    st.write(graph.get('trump summary', version))
+    # st.write(freshness_platform_df_t)
+    # st.bar_chart(freshness_platform_df_t, x='platform', y='percentage',  color='#5481A6')
+    chart3 = alt.Chart(graph.get('trump freshness', version)).mark_bar().encode(
+        x=alt.X('platform:N', title='Platform'),
+        y=alt.Y('percentage:Q', title='Percentage'),
+        color=alt.Color('platform:N', scale=alt.Scale(scheme='blues'))
+    ).properties(
+        width=600,
+        height=400
+    ).configure_axis(
+        labelFontSize=12,
+        titleFontSize=14
+    ).configure_legend(
+        titleFontSize=14,
+        labelFontSize=12
+    )
+    st.altair_chart(chart3)
+
+    st.subheader("Engagement for videos")
+    st.pyplot(boxPlot(graph.get('trump box plot', version)))
+
+    st.subheader("How do posts do over time?")
+    st.pyplot(plotPostOverTime(graph.get('posts over time', version), "rank"))
+
+    st.subheader("What are people saying?")
+    st.image(graph.get('trump word cloud', version), width='stretch')
+
+    findWordFrequency(graph.get('trump terms', version))
+
+SECTIONS = {
+    'Summary of data collection': overviewSection,
+    'Freshness across platforms': freshnessSection,
+    'Who is creating the videos': creatorsSection,
+    'Case study: Trump assassination': trumpSection,
+}
+
+def profilerPanel():
+    # hidden, only shown with ?profile in the url. stages are timed when they compute,
+    # not when streamlit's cache gives them, so a rerun only shows what ran again
+    profiler = helper.PROFILER
+    st.markdown("""---""")
+    st.header("Profiler")
+    track_memory = st.checkbox("Track peak memory (slows down every stage)", key='track peak memory')
+    if track_memory != profiler.tracks_memory:
+        profiler.trackMemory(track_memory)
+        st.caption("Peak memory is tracked from the next stage computed on")
+
+    summary = pd.DataFrame(profiler.summary(), columns=['name', 'runs', 'seconds', 'longest seconds', 'rows in', 'rows out', 'peak bytes'])
+    summary['peak MiB'] = summary.pop('peak bytes') / 2 ** 20
+    st.dataframe(summary.sort_values('seconds', ascending=False))
+    with st.expander("Every span"):
+        st.dataframe(pd.DataFrame(profiler.spans()))
+
+    st.download_button("Export as JSON", profiler.to_json(), file_name=f"profile_{datetime.now():%m-%d-%H%M}.json", mime='application/json')
+    if st.button("Clear"):
+        profiler.clear()
+
+    previous = st.file_uploader("Compare with an exported profile", type='json')
+    if previous is not None:
+        before = pd.DataFrame(json.load(previous)['summary'])[['name', 'seconds']]
+        comparison = summary[['name', 'seconds']].merge(before, on='name', how='outer', suffixes=('', ' before'))
+        comparison['change'] = comparison['seconds'] / comparison['seconds before']
+        st.dataframe(comparison)
+
+def showDashboard():
+    store, version = datasetSource()
+    graph = declareDatasets(store)
+
+    st.header("Learning about political content on Social Media")
+    shown = st.sidebar.multiselect("Sections to show", options=list(SECTIONS), default=list(SECTIONS))
+    for title, section in SECTIONS.items():
+        if title in shown:
+            section(graph, version)
+    if 'profile' in st.query_params:
+        profilerPanel()
+
+def main():
+    parser = argparse.ArgumentParser(description="Computes the datasets of the dashboard from the collected files, and saves them to a snapshot which the dashboard loads instead.")
+    parser.add_argument('--output', default=SNAPSHOT_FILE, help=f"snapshot file to write. Defaults to {SNAPSHOT_FILE}")
+    parser.add_argument('--profile', help="also write the time, rows and peak memory of every stage to this JSON file")
+    args = parser.parse_args()
+    if args.profile:
+        helper.PROFILER.trackMemory(True)
+    datasets = buildSnapshot(args.output)
+    print(f"Wrote {len(datasets)} datasets to {args.output}")
+    if args.profile:
+        helper.PROFILER.write(args.profile)
+        print(f"Wrote the profile of {len(helper.PROFILER.summary())} stages to {args.profile}")
+
+if st.runtime.exists():
+    # streamlit run app.py
+    showDashboard()
+elif __name__ == '__main__':
+    # python app.py [--output snapshot.pkl] [--profile profile.json]
+    main()
@@ -0,0 +1,194 @@
+"""
+Measures how fast each stage of the dashboard's pipeline is, and how much memory it
+takes, on synthetic collections of a few sizes (see helper.syntheticData), and compares
+the results with the baselines saved in BASELINES_FILE.
+
+Every stage is run twice on the output of the stage before it: once timed, and once
+under tracemalloc for its peak memory, which is the most memory the stage allocated
+on top of its input. Streamlit's caches are skipped, so every run computes everything.
+
+Run it from the repository root; it exits with status 1 if a stage got slower or took
+more memory than its baseline allows:
+    python benchmark.py                      # 10K and 100K rows, compared with the baselines
+    python benchmark.py --sizes 1000000      # 1M rows
+    python benchmark.py --save               # saves the results as the new baselines
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+os.chdir(os.path.dirname(os.path.abspath(__file__))) # the dashboard reads its files from here
+sys.path.insert(0, os.getcwd())
+
+import pandas as pd
+import helper
+import app
+
+BASELINES_FILE = './benchmarkBaselines.json'
+SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_SIZES = [10_000, 100_000]
+SEED = 0
+TIME_TOLERANCE = 1.25 # a stage may take up to this many times its baseline time
+MEMORY_TOLERANCE = 1.25 # and this many times its baseline peak memory
+TIME_SLACK = 0.05 # seconds, stages this much faster than that are too quick to time reliably
+
+def raw(function):
+    # the function without streamlit's cache
+    return getattr(function, '__wrapped__', function)
+
+# stage: (input, computes the output from the input), in order, each input is a stage before it
+STAGES = {
+    'read': ('files', lambda files: pd.concat(helper.readFilesInParallel(helper.read_collection_csv, files, processes=1), ignore_index=True)),
+    'schema': ('read', helper.applyPostSchema),
+    'trending': ('schema', app.addMoreData),
+    'dedupe': ('trending', app.cleanData1),
+    'user labels': ('dedupe', app.getUserCategory),
+    'queries': ('user labels', app.cleanQueries),
+    'freshness': ('queries', app.addFreshness),
+    'posts': ('freshness', app.enforceSchema),
+    'cube': ('posts', app.buildCube),
+    'one posts': ('posts', app.pickOneDataframe),
+    'summary': ('cube', lambda cube: app.createPlatformStats(cube, app.statsPerPlatform)),
+    'fresh content': ('cube', lambda cube: app.createPlatformStats(cube, app.countFreshContent)),
+    'likes over time': ('posts', app.countLikesOverTime),
+    'hours per rank': ('posts', app.hoursSincePostedPerRank),
+    'term index': ('posts', raw(app.buildTermIndex)),
+}
+
+def rowsOf(value) -> int:
+    if isinstance(value, helper.TermIndex):
+        return len(value.vocabulary)
+    return len(value) if hasattr(value, '__len__') else 1
+
+def copyOf(value):
+    # stages may change their input in place, e.g. adding columns, so each run gets its own copy
+    return value.copy() if isinstance(value, pd.DataFrame) else value
+
+def measureStage(compute, data) -> tuple[object, float, int]:
+    gc.collect()
+    start = time.perf_counter()
+    output = compute(copyOf(data))
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    data = copyOf(data)
+    tracemalloc.start()
+    compute(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output, seconds, peak
+
+def runPipeline(rows: int, seed: int = SEED) -> dict[str, dict]:
+    """
+    Runs every stage on synthetic collections.
+
+    Args:
+        rows (int): number of posts in the collections
+        seed (int, optional): seed of the synthetic collections. Defaults to SEED.
+
+    Returns:
+        dict[str, dict]: rows in and out, seconds, rows per second and peak memory in bytes, by stage
+    """
+    user_names = list(pd.read_csv(app.USER_LABELS_FILE)['user_name'].dropna())
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        files = helper.writeCollections(directory, rows, seed, user_names=user_names)
+        print(f"{rows} rows: wrote {len(files)} files in {time.perf_counter() - start:.1f}s")
+        outputs = {'files': files}
+        last_use = {source: stage for stage, (source, _) in STAGES.items()}
+        for stage, (source, compute) in STAGES.items():
+            data = outputs[source]
+            if last_use[source] == stage:
+                del outputs[source] # only kept while a later stage needs it
+            outputs[stage], seconds, peak = measureStage(compute, data)
+            rows_in = rows if source == 'files' else rowsOf(data)
+            results[stage] = {
+                'rows in': rows_in,
+                'rows out': rowsOf(outputs[stage]),
+                'seconds': round(seconds, 4),
+                'rows per second': round(rows_in / seconds) if seconds else None,
+                'peak bytes': peak,
+            }
+            print(f"  {stage:<16} {rows_in:>9} -> {rowsOf(outputs[stage]):>9} rows  {seconds:8.3f}s  {peak / 2 ** 20:9.1f} MiB")
+            del data
+            if stage not in last_use:
+                del outputs[stage]
+    return results
+
+def compare(results: dict[str, dict[str, dict]], baselines: dict[str, dict[str, dict]]) -> list[str]:
+    """
+    Compares results with baselines, size by size and stage by stage.
+
+    Args:
+        results (dict[str, dict[str, dict]]): results of runPipeline by number of rows
+        baselines (dict[str, dict[str, dict]]): saved results by number of rows
+
+    Returns:
+        list[str]: a description of every stage slower or bigger than its baseline allows, empty if none is
+    """
+    problems = []
+    for size, stages in results.items():
+        if size not in baselines:
+            print(f"no baseline for {size} rows")
+            continue
+        for stage, result in stages.items():
+            baseline = baselines[size].get(stage)
+            if baseline is None:
+                continue
+            if result['seconds'] > max(baseline['seconds'] * TIME_TOLERANCE, baseline['seconds'] + TIME_SLACK):
+                problems.append(f"{size} rows, {stage}: {result['seconds']:.3f}s, baseline {baseline['seconds']:.3f}s")
+            if result['peak bytes'] > baseline['peak bytes'] * MEMORY_TOLERANCE:
+                problems.append(f"{size} rows, {stage}: {result['peak bytes'] / 2 ** 20:.1f} MiB, baseline {baseline['peak bytes'] / 2 ** 20:.1f} MiB")
+    return problems
+
+def machine() -> dict[str, str]:
+    # baselines only compare well with runs on the same kind of machine
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': str(os.cpu_count()),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures the stages of the dashboard's pipeline on synthetic collections.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help=f"numbers of rows to measure, e.g. {' '.join(map(str, SIZES))}. Defaults to {' '.join(map(str, DEFAULT_SIZES))}")
+    parser.add_argument('--seed', type=int, default=SEED, help=f"seed of the synthetic collections. Defaults to {SEED}")
+    parser.add_argument('--save', action='store_true', help=f"save the results as the baselines of their sizes in {BASELINES_FILE}")
+    args = parser.parse_args()
+
+    results = {str(rows): runPipeline(rows, args.seed) for rows in args.sizes}
+
+    saved = {'machine': machine(), 'seed': args.seed, 'sizes': {}}
+    if os.path.exists(BASELINES_FILE):
+        with open(BASELINES_FILE) as file:
+            saved = json.load(file)
+    if saved['machine'] != machine():
+        print(f"baselines were measured on another machine: {saved['machine']}")
+
+    if args.save:
+        saved['sizes'].update(results)
+        saved['machine'] = machine()
+        saved['seed'] = args.seed
+        saved['saved'] = datetime.now().isoformat(timespec='seconds')
+        with open(BASELINES_FILE, 'w') as file:
+            json.dump(saved, file, indent=2)
+        print(f"Saved baselines of {', '.join(results)} rows to {BASELINES_FILE}")
+        return
+
+    problems = compare(results, saved['sizes'])
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,50 @@
-from .commonTools import *
\ No newline at end of file
+"""
+Tools to read, clean and summarize the collected posts.
+
+Every public name of the modules below is a name of helper, like with
+`from .module import *`, but modules are only imported when one of their names is
+first used. Tools which only need collectionFiles or collectionCatalog, like
+getDataCollectionParameters or CollectionCatalog, never import pandas or numpy.
+"""
+from importlib import import_module
+
+# the public names of each module, so that a name imports only its module and unknown
+# names fail without importing any. if two modules have a name, the first one gives it.
+# tests/test_helperImports.py checks that these are the names the modules define
+_EXPORTS: dict[str, list[str]] = {
+    'collectionFiles': ['FACEBOOK', 'INSTAGRAM', 'TIKTOK', 'YOUTUBE', 'timefmt', 'NO_TRENDING_TIME', 'getFilesToCheck',
+                        'isRelevantFile', 'isIntermediateFile', 'getDataCollectionParameters', 'getCleanPlatform'],
+    'collectionCatalog': ['CATALOG_VERSION', 'CollectionCatalog'],
+    'commonTools': ['DEFAULT_MAX_PROCESSES', 'PARALLEL_FROM_FILES', 'ArrayLike', 'Post', 'User', 'PostBatch', 'PostReader',
+                    'PostBatchReader', 'UserReader', 'read_post_csv', 'read_post_frame', 'read_post_csvs', 'read_collection_csv',
+                    'readFilesInParallel', 'getGptResponse', 'getNum', 'getNums', 'getTimes', 'getCanonicalUrl', 'isLoginUrl',
+                    'getCanonicalUrls', 'getPostIdentity', 'getPostIdentities', 'getContentFingerprints', 'UserRecord',
+                    'getAllUsers', 'getAllUserRecords', 'extractUsers', 'getUsersFromPostFile', 'get_piece'],
+    'postCache': ['CACHE_VERSION', 'PostCache'],
+    'userLabels': ['INDIVIDUAL', 'ORGANIZATION', 'UserLabels', 'normalizeUserName'],
+    'postSchema': ['CATEGORY', 'INTERNED', 'DATETIME', 'POST_FRAME_SCHEMA', 'applyPostSchema', 'internStrings', 'memoryReport'],
+    'postCube': ['RANK_BUCKET_STARTS', 'RANK_BUCKETS', 'RANK_BUCKET', 'FRESH_HOURS', 'PostCube', 'rankBuckets'],
+    'termIndex': ['TermFrequencies', 'TermIndex', 'compileFilter', 'cloudFrequencies'],
+    'trendingEvents': ['TRENDING_GAP', 'EVENT', 'FIRST_TRENDING', 'HOURS_SINCE_TRENDING', 'TrendingEvents', 'readTrendingQueries',
+                       'queryKey'],
+    'datasetGraph': ['DatasetGraph'],
+    'snapshot': ['SNAPSHOT_VERSION', 'Snapshot'],
+    'syntheticData': ['PLATFORMS', 'SYNTHETIC_QUERIES', 'COLLECTIONS_PER_QUERY', 'PLACEHOLDER_RATE', 'RETURNING_RATE',
+                      'SHARED_RATE', 'writeCollections'],
+    'profiler': ['MAX_SPANS', 'rowsOf', 'Span', 'Profiler', 'PROFILER', 'span', 'profiled'],
+}
+_MODULES = list(_EXPORTS)
+_MODULE_OF = {name: module_name for module_name in reversed(_MODULES) for name in _EXPORTS[module_name]}
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return import_module(f'.{name}', __name__)
+    module_name = _MODULE_OF.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_MODULE_OF))
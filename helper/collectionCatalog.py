@@ -0,0 +1,158 @@
+from __future__ import annotations
+from datetime import datetime
+import json
+import os
+import threading
+import time
+from typing import Iterable
+
+from .collectionFiles import getCleanPlatform, getDataCollectionParameters, isIntermediateFile
+
+# only the standard library is imported here, like in collectionFiles
+
+CATALOG_VERSION = 1
+
+class CollectionCatalog:
+    """
+    Catalog of the collection files under a directory, with the parameters of each one
+    parsed from its filename once: query, platform, trending time and collection time, as
+    getDataCollectionParameters gives them, and the file's size and modification time.
+
+    Refreshing the catalog lists the directory again with os.scandir, and only parses the
+    names of new files. The catalog can be kept in a JSON file, so a new process only
+    parses the names of files added since it was last refreshed.
+
+    Files are selected by platform, query and time window from the catalog alone, so
+    files which are not selected are never opened. CSV files whose name is not one of a
+    collection are not in the catalog.
+
+    For example, to read the collections of some queries:
+        catalog = CollectionCatalog(data_dir, './.cache/catalog.json')
+        catalog.refresh()
+        df = cache.read_all(catalog.select(queries=['Trump rally', 'Trump shooting']))
+    """
+    def __init__(self, directory: str, catalog_file: str = None) -> None:
+        """
+        Args:
+            directory (str): the directory of collection files, searched recursively
+            catalog_file (str, optional): JSON file to keep the catalog in. Defaults to None, for none.
+        """
+        self.directory = directory
+        self.catalog_file = catalog_file
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = self._load()
+        self._refreshed: float | None = None # time.monotonic() of the last refresh
+
+    def _load(self) -> dict[str, dict]:
+        if self.catalog_file is None:
+            return {}
+        try:
+            with open(self.catalog_file) as file:
+                catalog = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        if catalog.get('version') != CATALOG_VERSION or catalog.get('directory') != os.path.abspath(self.directory):
+            return {}
+        entries = catalog.get('entries', {})
+        for entry in entries.values():
+            entry['trending_time'] = datetime.fromisoformat(entry['trending_time'])
+            entry['collection_time'] = datetime.fromisoformat(entry['collection_time'])
+        return entries
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.catalog_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        entries = {
+            path: {**entry, 'trending_time': entry['trending_time'].isoformat(), 'collection_time': entry['collection_time'].isoformat()}
+            for path, entry in self._entries.items()
+        }
+        tmp_path = self.catalog_file + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump({'version': CATALOG_VERSION, 'directory': os.path.abspath(self.directory), 'entries': entries}, file)
+        os.replace(tmp_path, self.catalog_file)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def refresh(self, max_age: float = None) -> bool:
+        """
+        Lists the directory again: adds new files, updates the size and modification time
+        of changed ones, and drops removed ones. Saves the catalog if anything changed.
+
+        Args:
+            max_age (float, optional): seconds a refresh is good for: the directory is not listed again
+                                       if it was less than this long ago. Defaults to None, to always list it.
+
+        Returns:
+            bool: whether anything changed
+        """
+        with self._lock:
+            if max_age is not None and self._refreshed is not None and time.monotonic() - self._refreshed < max_age:
+                return False
+            found = {}
+            for entry in self._scan(self.directory):
+                stat = entry.stat()
+                known = self._entries.get(entry.path)
+                if known is None:
+                    try:
+                        known = getDataCollectionParameters(entry.path)
+                    except ValueError:
+                        continue # not a collection
+                    known['intermediate'] = bool(isIntermediateFile(entry.path, known['platform']))
+                found[entry.path] = {**known, 'size': stat.st_size, 'modified': stat.st_mtime_ns}
+
+            changed = found != self._entries
+            self._entries = found
+            self._refreshed = time.monotonic()
+            if changed and self.catalog_file is not None:
+                self._save()
+            return changed
+
+    def _scan(self, directory: str) -> Iterable[os.DirEntry]:
+        # csv files, in the order getFilesToCheck gives them
+        for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+            if entry.is_dir():
+                yield from self._scan(entry.path)
+            elif entry.name.endswith('.csv') and entry.is_file():
+                yield entry
+
+    def entries(self) -> list[dict]:
+        """
+        Gets every file of the catalog.
+
+        Returns:
+            list[dict]: for each file, in order: its path, the keys of getDataCollectionParameters,
+                        intermediate (bool), size (bytes) and modified (ns since the epoch)
+        """
+        with self._lock:
+            return [{'path': path, **entry} for path, entry in self._entries.items()]
+
+    def select(self, platform: str = 'all', queries: Iterable[str] = None, start: datetime = None, end: datetime = None,
+               by: str = 'collection_time', include_intermediate: bool = False) -> list[str]:
+        """
+        Selects files of the catalog, without opening any.
+
+        Args:
+            platform (str, optional): platform of the files. use 'all' for all platforms. Defaults to 'all'.
+            queries (Iterable[str], optional): queries of the files, as written in their names. Defaults to None, for all.
+            start (datetime, optional): earliest time of the files, included. Defaults to None, for no limit.
+            end (datetime, optional): latest time of the files, excluded. Defaults to None, for no limit.
+            by (str, optional): the time to select by, 'collection_time' or 'trending_time'. Defaults to 'collection_time'.
+            include_intermediate (bool, optional): whether to include intermediate files of a platform. Defaults to False.
+                                                   Like getFilesToCheck, 'all' gives intermediate files too.
+
+        Returns:
+            list[str]: the filepaths, in the order getFilesToCheck gives them
+        """
+        platform = getCleanPlatform(platform)
+        queries = None if queries is None else set(queries)
+        return [
+            entry['path'] for entry in self.entries()
+            if (platform == 'all' or entry['platform'] == platform)
+            and (queries is None or entry['query'] in queries)
+            and (start is None or entry[by] >= start)
+            and (end is None or entry[by] < end)
+            and (include_intermediate or platform == 'all' or not entry['intermediate'])
+        ]
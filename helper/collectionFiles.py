@@ -0,0 +1,146 @@
+from __future__ import annotations
+from datetime import datetime
+import os
+
+# only the standard library is imported here, so that tools which only look at
+# collection filenames do not load pandas and numpy
+
+FACEBOOK = 'facebook'
+INSTAGRAM = 'instagram'
+TIKTOK = 'tiktok'
+YOUTUBE = 'youtube'
+
+timefmt = "%m-%d-%H"
+
+# trending time of collections whose filename has none
+NO_TRENDING_TIME = datetime.strptime("01-01-00", timefmt).replace(year=2024)
+
+def getFilesToCheck(dir: str, platform: str, include_intermediate: bool = False) -> list[str]:
+    """
+    Get a list of csv filepaths to check. Recursive.
+
+    Args:
+        dir (str): directory to start from
+        platform (str): platform to get files for. use 'all' for all platforms.
+        include_intermediate (bool): whether to include intermediate files
+
+    Returns:
+        list[str]: list of filepaths to check
+    """
+    files_to_check = []
+    # scandir knows whether each entry is a file or a directory, without a stat per entry
+    for entry in sorted(os.scandir(dir), key=lambda entry: entry.name):
+        if entry.is_dir():
+            files_to_check.extend(getFilesToCheck(entry.path, platform, include_intermediate))
+        elif entry.is_file() and _isRelevantPath(entry.path, platform, include_intermediate):
+            files_to_check.append(entry.path)
+
+    return files_to_check
+
+def isRelevantFile(filepath: str, platform: str, include_intermediate: bool = False) -> bool:
+    """
+    Tells whether the given filepath is relevant to the given platform.
+
+    Args:
+        filepath (str): the filepath to check
+        platform (str): the platform for relevancy. use 'all' for all platforms.
+        include_intermediate (str): whether to include intermediate files
+
+    Returns:
+        bool: whether the filepath is relevant
+    """
+    return os.path.isfile(filepath) and _isRelevantPath(filepath, platform, include_intermediate)
+
+def _isRelevantPath(filepath: str, platform: str, include_intermediate: bool = False) -> bool:
+    if platform == 'all' and include_intermediate:
+        raise ValueError(f"can only get all files for all platforms")
+    platform = getCleanPlatform(platform)
+    return (
+        (platform == 'all' or platform in filepath.lower())
+        and filepath.endswith('.csv')
+        and (include_intermediate or not isIntermediateFile(filepath, platform))
+    )
+
+def isIntermediateFile(filepath: str, platform: str) -> bool:
+    """
+    Tells whether a file is intermediate, based on the platform's conventions.
+
+    Args:
+        filepath (str): the file to check
+
+    Returns:
+        bool: whether the file is intermediate
+    """
+    isIntermediate = 'intermediate' in filepath.lower()
+    if platform is YOUTUBE:
+        return isIntermediate or len(os.path.basename(filepath).split('_')) == 1
+
+def getDataCollectionParameters(filepath: str) -> dict[str, str | datetime]:
+    """
+    Gets parameters of data collection from its filename, using its filepath.
+    Returns a dictionary of these parameters
+
+    Args:
+        filepath (str): path to the file to get parameters from
+
+    Returns:
+        dict[str, str | datetime]: a dictionary describing parameters of data collection for the file. Keys are:
+                                   query: str
+                                   platform: str
+                                   trending_time: datetime
+                                   collection_time: datetime
+    """
+    fn, _ = os.path.splitext(os.path.basename(filepath))
+    parts = fn.split('_')
+    try:
+        # query_platform[_trending@MM-DD-HH]_collected@MM-DD-HH, collections from before
+        # trending times were recorded have none
+        if len(parts) == 4:
+            query, platform, trending, collected = parts
+            trending_time = _parseFilenameTime(trending)
+        else:
+            query, platform, collected = parts
+            trending_time = NO_TRENDING_TIME
+        return {
+            'query': query,
+            'platform': getCleanPlatform(platform),
+            'trending_time': trending_time,
+            'collection_time': _parseFilenameTime(collected),
+        }
+    except ValueError:
+        raise ValueError(f"filepath is not a valid data collection file: {filepath}") from None
+
+def _parseFilenameTime(part: str) -> datetime:
+    # 'collected@07-13-18' -> 2024-07-13 18:00
+    _, _, time = part.partition('@')
+    if not time:
+        raise ValueError(f"no time in {part}")
+    return datetime.strptime(time, timefmt).replace(year=2024)
+
+def getCleanPlatform(platform: str) -> str:
+    """
+    Gets a clean version of the platform given. Checks if the platform name
+    is in the platform string, then returns the appropriate platform constant.
+    For example, both 'instagram' and 'Instagram1' would return INSTAGRAM.
+
+    Raises a ValueError if the appropriate platform constant cannot be found.
+
+    Args:
+        platform (str): the platform to get
+
+    Returns:
+        str: a clean version of the platform string
+    """
+    platform = platform.lower()
+    if FACEBOOK in platform:
+        return FACEBOOK
+    if INSTAGRAM in platform:
+        return INSTAGRAM
+    if TIKTOK in platform:
+        return TIKTOK
+    if YOUTUBE in platform:
+        return YOUTUBE
+    if platform.lower() == 'all':
+        return 'all'
+
+    raise ValueError(f"platform {platform} is not supported!")
@@ -1,20 +1,67 @@
 from __future__ import annotations
-from csv import DictReader
-from datetime import datetime, timedelta
-from functools import cached_property
+from concurrent.futures import ProcessPoolExecutor
+from csv import DictReader, reader
+from datetime import datetime
+from functools import cached_property, lru_cache
+from hashlib import blake2b
 import os
-from typing import Any, Iterator, Type
+import re
+import string
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Type, Union
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+from zoneinfo import ZoneInfo
 
-from numpy import isin
+from numpy import datetime64, empty, frombuffer, fromiter, full, generic, integer, isin, isnat, nan, ndarray, where, zeros
 # from openai import OpenAI
-from pandas import DataFrame
-
-FACEBOOK = 'facebook'
-INSTAGRAM = 'instagram'
-TIKTOK = 'tiktok'
-YOUTUBE = 'youtube'
-
-timefmt = "%m-%d-%H"
+from pandas import NA, DataFrame, NaT, Series, StringDtype, Timestamp, concat, factorize, read_csv, to_datetime
+from pandas.api.extensions import ExtensionArray
+from pandas.arrays import IntegerArray
+from pandas.api.types import infer_dtype
+from pandas.util import hash_pandas_object
+
+from .collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE, timefmt, getCleanPlatform, getDataCollectionParameters, getFilesToCheck, isIntermediateFile, isRelevantFile
+from .profiler import profiled
+from .userLabels import normalizeUserName
+
+# any digit, unicode ones included like strptime's
+_DIGIT = re.compile(r'\d')
+
+# a count like getNum reads, once commas are removed and it is lowercased: '1.2k', '3m', '12k plays'
+_COUNT_PATTERN = r'(?P<sign>[+-]?)(?P<whole>[0-9]*)(?:\.(?P<decimal>[0-9]*))?\s*(?P<suffix>[km]?)\s*(?:plays?)?'
+_COUNT = re.compile(_COUNT_PATTERN)
+_COUNT_FACTORS = {'': 1, 'k': 1_000, 'm': 1_000_000}
+
+# ascii characters str.strip and \s treat as whitespace
+_ASCII_WHITESPACE = ''.join(chr(code) for code in range(128) if chr(code).isspace())
+# every character a count can have before it is normalized
+_COUNT_CHARS = string.digits + ',.+-' + 'kmplays' + 'KMPLAYS' + _ASCII_WHITESPACE
+# characters of a count which only _parseCount handles: unicode, and whitespace pandas' regexes may not know
+_UNUSUAL_COUNT_CHARS = r'[^\t\n\r\f ,.+\-0-9a-zA-Z]'
+
+# default pool of readFilesInParallel: each process holds its own copy of the parsed files,
+# so a big machine should not start one per CPU, and a few files are read faster serially
+DEFAULT_MAX_PROCESSES = 4
+PARALLEL_FROM_FILES = 8
+
+# post ids found in the urls of each platform, tried in order
+_POST_ID_PATTERNS = {
+    FACEBOOK: [re.compile(p) for p in (r'[?&]story_fbid=([\w.-]+)', r'[?&]v=(\d+)', r'/(?:posts|videos|reel|permalink)/([\w.-]+)')],
+    INSTAGRAM: [re.compile(r'instagram\.com/(?:[\w.]+/)?(?:p|reels?|tv)/([\w-]+)')],
+    TIKTOK: [re.compile(r'/(?:video|photo|v)/(\d+)')],
+    YOUTUBE: [re.compile(p) for p in (r'[?&]v=([\w-]{11})', r'youtu\.be/([\w-]{11})', r'/(?:shorts|embed|live)/([\w-]{11})')],
+}
+# path of a login page, which platforms show instead of posts that need an account
+_LOGIN_PATH = re.compile(r'/login(?:/|\.php|$)')
+# canonical url of a post, from its post id
+_CANONICAL_URLS = {
+    INSTAGRAM: 'https://www.instagram.com/p/{}',
+    TIKTOK: 'https://www.tiktok.com/@/video/{}',
+    YOUTUBE: 'https://www.youtube.com/watch?v={}',
+}
+
+_NOT_GOTTEN = object()
+
+ArrayLike = Union[ndarray, ExtensionArray]
 
 class _SocialMediaItem:
     """
@@ -22,12 +69,29 @@ class _SocialMediaItem:
     """
     PLATFORM_MAPPINGS: dict[str, dict[str, str]]
     PLACEHOLDERS: dict[str, set[str]]
-    
+
+    # built once per subclass from PLATFORM_MAPPINGS:
+    REVERSE_MAPPINGS: dict[str, dict[str, str]] # platform -> platform key -> standard key
+    _VALUE_SLOTS: dict[str, int] # standard key -> where its converted value is remembered in _values
+
+    __slots__ = ('_info', 'platform', '_map', '_reverse_map', '_placeholders', '_values')
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.REVERSE_MAPPINGS = {
+            platform: {platform_key: standard_key for standard_key, platform_key in _map.items()}
+            for platform, _map in cls.PLATFORM_MAPPINGS.items()
+        }
+        standard_keys = sorted({key for _map in cls.PLATFORM_MAPPINGS.values() for key in _map})
+        cls._VALUE_SLOTS = {key: i for i, key in enumerate(standard_keys)}
+
     def __init__(self, info: dict[str, str], platform: str) -> None:
         self._info = info
         self.platform = getCleanPlatform(platform)
         self._map = self.PLATFORM_MAPPINGS[self.platform]
+        self._reverse_map = self.REVERSE_MAPPINGS[self.platform]
         self._placeholders = self.PLACEHOLDERS[self.platform]
+        self._values = None # converted values of standard keys, so each is only converted once
 
     def __eq__(self, other: Post) -> bool:
         return hash(self) == hash(other)
@@ -48,16 +112,19 @@ class _SocialMediaItem:
         Returns:
             str: the information that is gotten
         """
-        try:
-            new_key = self._map[key]
-            return self._info.get(new_key, default) if default is not None else self._info[new_key]
-        except KeyError:
-            pass
-
-        try:
-            return self._info.get(key, default) if default is not None else self._info[key]
-        except KeyError:
-            raise KeyError(f"{self.platform.title()} {self.__class__.__name__} does not support key '{key}'!")
+        info = self._info
+        new_key = self._map.get(key)
+        if new_key is not None:
+            if default is not None:
+                return info.get(new_key, default)
+            if new_key in info:
+                return info[new_key]
+
+        if default is not None:
+            return info.get(key, default)
+        if key in info:
+            return info[key]
+        raise KeyError(f"{self.platform.title()} {self.__class__.__name__} does not support key '{key}'!")
 
     def get(self, key: str, default=None, *, converters=None) -> str | Any:
         """
@@ -81,6 +148,8 @@ class _SocialMediaItem:
             converters = []
 
         for converter in converters:
+            if not isinstance(value, str): # converters only convert from strings
+                break
             try:
                 value = converter(value)
             except:
@@ -88,6 +157,24 @@ class _SocialMediaItem:
 
         return value
 
+    def _getOnce(self, key: str, default, converters) -> str | Any:
+        """
+        Same as get, but remembers the values of standard keys gotten without a default,
+        so that each is only converted once per item.
+        """
+        slot = self._VALUE_SLOTS.get(key)
+        if default is not None or slot is None:
+            return _SocialMediaItem.get(self, key, default, converters=converters)
+
+        values = self._values
+        if values is None:
+            values = self._values = [_NOT_GOTTEN] * len(self._VALUE_SLOTS)
+        elif values[slot] is not _NOT_GOTTEN:
+            return values[slot]
+
+        value = values[slot] = _SocialMediaItem.get(self, key, converters=converters)
+        return value
+
     def isPlaceholder(self, value: str) -> bool:
         """
         Predicate to check if a given value is a placeholder for this Post's platform.
@@ -109,7 +196,7 @@ class _SocialMediaItem:
             dict[str, str | int | datetime | None]: the information in this SocialMediaItem as a dictionary
         """
         new_dict = {}
-        reverse_map = {platform_key: standard_key for standard_key, platform_key in self._map.items()}
+        reverse_map = self._reverse_map
         for platform_key in self._info.keys():
             key = reverse_map.get(platform_key, platform_key)
             new_dict[key] = self.get(key)
@@ -151,6 +238,11 @@ class Post(_SocialMediaItem):
     of different platforms. Using a string like 'upload time' directly may break if the string attached
     to the UPLOAD_TIME variable is modified in the future.
 
+    The url of every post is its canonical url from getCanonicalUrl, and post.post_id is
+    the platform's own id of the post, found in its url or id. post.identity is a 64-bit
+    number identifying the post, from getPostIdentity. Posts are equal when they are the
+    same post with the same likes.
+
     The following are converted from strings, if their value is not a placeholder:
      - upload_time: datetime object
      - likes: int
@@ -166,6 +258,8 @@ class Post(_SocialMediaItem):
     a TikTok post, one can use post.get('author_signature'). This will raise a ValueError for other
     platforms, as they do not have this key.
     """
+    __slots__ = ()
+
     # standard keys:
     URL = 'url'
     UPLOAD_TIME = 'upload time'
@@ -183,6 +277,10 @@ class Post(_SocialMediaItem):
     VIEWS = 'views'
     SHARES = 'shares'
 
+    # keys derived from others, not read from files:
+    POST_ID = 'post id' # the platform's own id of the post, from getCanonicalUrl
+    IDENTITY = 'post identity' # 64-bit number identifying the post, from getPostIdentity
+
     PLATFORM_MAPPINGS = {
         FACEBOOK: {
             URL: 'url',
@@ -243,6 +341,13 @@ class Post(_SocialMediaItem):
         YOUTUBE: "%Y-%m-%d %H:%M:%S",
     }
 
+    # all times are given in the time zone data was collected in, like collection times in filenames.
+    # platforms which store times in another time zone are converted when their times are parsed
+    TIME_ZONE = 'America/New_York'
+    SOURCE_TIME_ZONES = {
+        TIKTOK: 'UTC',
+    }
+
     PLACEHOLDERS = { # here mainly to prevent converting an attribute which is a placeholder
         FACEBOOK: {'', 'name', 'no display name', 'likes', 'views', 'shares', 'comments', 'description', 'description not found', 'time', 'time not found'},
         INSTAGRAM: {'<<could not collect>>', '<<not collected>>'},
@@ -252,22 +357,23 @@ class Post(_SocialMediaItem):
 
     @property
     def url(self) -> str:
-        if self.platform is INSTAGRAM:
-            p_or_reel = 'p' if self.type == 'post' else 'reel'
-            return f"https://www.instagram.com/{p_or_reel}/{self.id}"
-        elif self.platform is TIKTOK:
-            if isinstance(self.id, str) and 'https://' in self.id:
-                return self.id
-            return f"https://www.tiktok.com/@{self.user_unique_name}/video/{id}"
-        else:
-            return self.get(self.URL)
+        return getCanonicalUrl(self._urlSource(), self.platform)[0]
+
+    @property
+    def post_id(self) -> str:
+        return getCanonicalUrl(self._urlSource(), self.platform)[1]
+
+    @property
+    def identity(self) -> int:
+        return getPostIdentity(self.platform, self.post_id, self.url)
+
+    def _urlSource(self) -> str | int | None:
+        # Instagram and TikTok posts are found by their id, other platforms by their url
+        return self.id if self.platform in (INSTAGRAM, TIKTOK) else self.get(self.URL)
 
     @property
     def upload_time(self) -> datetime:
-        time = self.get(self.UPLOAD_TIME)
-        if self.platform is TIKTOK: # patch to deal with time zone difference in TikTok
-            time -= timedelta(0, 0, 0, 0, 0, 4)
-        return time
+        return self.get(self.UPLOAD_TIME)
 
     @property
     def user_name(self) -> str:
@@ -337,13 +443,16 @@ class Post(_SocialMediaItem):
         Returns:
             str | int | datetime | None: the value associated with the key, converted if appropriate
         """
-        return super().get(key, default, converters=[getNum, self.getTime])
+        return self._getOnce(key, default, (getNum, self.getTime))
 
     def __getitem__(self, key: str) -> str | int | datetime | None:
         return self.get(key)
 
+    def __eq__(self, other: Post) -> bool:
+        return isinstance(other, Post) and (self.identity, self.likes) == (other.identity, other.likes)
+
     def __hash__(self) -> int:
-        return hash(self.url) + hash(self.likes)
+        return hash((self.identity, self.likes))
 
     def isSamePost(self, other: Post) -> bool:
         """
@@ -363,17 +472,20 @@ class Post(_SocialMediaItem):
     def getTime(self, time: str) -> datetime:
         """
         Converts a time string to a datetime object, using the format this post's
-        platform stores its time data.
+        platform stores its time data. Times from platforms in SOURCE_TIME_ZONES are
+        converted to TIME_ZONE.
 
         Args:
             time (str): the time, as a str
 
         Returns:
-            datetime: the time, as a datetime object
+            datetime: the time, as a naive datetime object in TIME_ZONE
         """
-        return datetime.strptime(time, self.TIME_FORMATS[self.platform])
+        return _parseTime(time, self.platform)
 
 class User(_SocialMediaItem):
+    __slots__ = ()
+
     # standard keys:
     NAME = 'name'
     UNIQUE_NAME = 'unique name'
@@ -389,6 +501,7 @@ class User(_SocialMediaItem):
 
         if self.platform is INSTAGRAM and not self.name:
             self._info[self._map[self.NAME]] = self.unique_name # when no full name, username is full name
+            self._values = None
 
     PLATFORM_MAPPINGS = {
         FACEBOOK: {
@@ -456,11 +569,185 @@ class User(_SocialMediaItem):
         Returns:
             str | int: the value associated with the key, converted if appropriate
         """
-        return super().get(key, default, converters=[getNum])
+        return self._getOnce(key, default, (getNum,))
 
     def __hash__(self) -> int:
         return hash(self.name) + (hash(self.unique_name) if self.platform in (INSTAGRAM, TIKTOK) else 0)
 
+class PostBatch:
+    """
+    Holds the posts of one platform as columns, one array per key, instead of one Post
+    per row. Columns use Post's standard keys, and hold the same values Post.get would
+    give, typed per column: ints as int64 (Int64 when some are missing), times as
+    datetime64, and everything else as objects.
+
+    The standard keys can be gotten as whole columns, as attributes or by key:
+     - batch.likes
+     - batch[Post.LIKES] or batch['likes']
+
+    Indexing with a slice, a boolean mask or an array of positions gives a new PostBatch.
+    Slices share memory with the original batch, so they are cheap. Indexing with an int,
+    or iterating, gives Post views, which support the whole Post API and read from the
+    columns of the batch.
+
+    A PostBatch is usually gotten from PostBatchReader.
+    """
+    def __init__(self, columns: dict[str, ArrayLike], platform: str) -> None:
+        self.platform = getCleanPlatform(platform)
+        self._columns = columns
+        self._length = len(next(iter(columns.values()))) if columns else 0
+
+    @property
+    def keys(self) -> list[str]:
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Post]:
+        for row in range(self._length):
+            yield _PostView(self, row)
+
+    def __getitem__(self, key: str | int | slice | ArrayLike) -> ArrayLike | Post | PostBatch:
+        if isinstance(key, str):
+            return self.column(key)
+        if isinstance(key, (int, integer)):
+            row = int(key)
+            if not -self._length <= row < self._length:
+                raise IndexError(f"post {row} is out of range for a batch of {self._length} posts")
+            return _PostView(self, row % self._length)
+        return PostBatch({name: column[key] for name, column in self._columns.items()}, self.platform)
+
+    def column(self, key: str) -> ArrayLike:
+        """
+        Gets a whole column, using a standard or platform-specific key. Raises a
+        KeyError if the key is not supported, like Post.get.
+
+        Args:
+            key (str): the key of the column to get
+
+        Returns:
+            ArrayLike: the column
+        """
+        key = Post.REVERSE_MAPPINGS[self.platform].get(key, key)
+        try:
+            return self._columns[key]
+        except KeyError:
+            raise KeyError(f"{self.platform.title()} {self.__class__.__name__} does not support key '{key}'!")
+
+    def to_frame(self) -> DataFrame:
+        """
+        Returns the posts as a DataFrame, using Post's standard keys.
+
+        Returns:
+            DataFrame: the posts
+        """
+        return DataFrame(self._columns)
+
+    @property
+    def url(self) -> ArrayLike:
+        return self._canonicalUrls()[Post.URL].to_numpy()
+
+    @property
+    def post_id(self) -> ArrayLike:
+        return self._canonicalUrls()[Post.POST_ID].to_numpy()
+
+    @property
+    def identity(self) -> ArrayLike:
+        urls = self._canonicalUrls()
+        platforms = Series(self.platform, index=urls.index, dtype=object)
+        return getPostIdentities(platforms, urls[Post.POST_ID], urls[Post.URL]).to_numpy()
+
+    def _canonicalUrls(self) -> DataFrame:
+        source = self.id if self.platform in (INSTAGRAM, TIKTOK) else self.column(Post.URL)
+        return getCanonicalUrls(source, self.platform)
+
+    @property
+    def upload_time(self) -> ArrayLike:
+        return self.column(Post.UPLOAD_TIME)
+
+    @property
+    def user_name(self) -> ArrayLike:
+        return self.column(Post.USER_NAME)
+
+    @property
+    def text(self) -> ArrayLike:
+        return self.column(Post.TEXT)
+
+    @property
+    def likes(self) -> ArrayLike:
+        return self.column(Post.LIKES)
+
+    @property
+    def id(self) -> ArrayLike:
+        return self.column(Post.ID)
+
+    @property
+    def rank(self) -> ArrayLike:
+        return self.column(Post.RANK)
+
+    @property
+    def user_unique_name(self) -> ArrayLike:
+        return self.column(Post.USER_UNIQUE_NAME)
+
+    @property
+    def type(self) -> ArrayLike:
+        return self.column(Post.TYPE)
+
+    @property
+    def video_duration(self) -> ArrayLike:
+        return self.column(Post.VIDEO_DURATION)
+
+    @property
+    def comments(self) -> ArrayLike:
+        return self.column(Post.COMMENTS)
+
+    @property
+    def views(self) -> ArrayLike:
+        return self.column(Post.VIEWS)
+
+    @property
+    def shares(self) -> ArrayLike:
+        return self.column(Post.SHARES)
+
+class _PostView(Post):
+    """
+    A Post which reads its values from one row of a PostBatch, instead of from a
+    dictionary of strings. Values in the batch are already converted, so nothing is
+    converted again.
+    """
+    __slots__ = ('_batch', '_row')
+
+    def __init__(self, batch: PostBatch, row: int) -> None:
+        self._batch = batch
+        self._row = row
+        self._info = None
+        self.platform = batch.platform
+        self._map = self.PLATFORM_MAPPINGS[self.platform]
+        self._reverse_map = self.REVERSE_MAPPINGS[self.platform]
+        self._placeholders = self.PLACEHOLDERS[self.platform]
+        self._values = None
+
+    def get(self, key: str, default=None) -> str | int | datetime | None:
+        try:
+            column = self._batch.column(key)
+        except KeyError:
+            if default is not None:
+                return default
+            raise KeyError(f"{self.platform.title()} Post does not support key '{key}'!")
+
+        value = column[self._row]
+        if value is None or value is NA or value is NaT:
+            return None
+        if isinstance(value, datetime64):
+            return None if isnat(value) else Timestamp(value).to_pydatetime()
+        if isinstance(value, generic):
+            return value.item()
+        return value
+
+    def to_dict(self) -> dict[str, str | int | datetime | None]:
+        return {key: self.get(key) for key in self._batch.keys}
+
 def PostReader(filepath: str, platform: str = None) -> Iterator[Post]:
     """
     Reads posts from a file and yields them in order. Assumes the file contains
@@ -478,6 +765,39 @@ def PostReader(filepath: str, platform: str = None) -> Iterator[Post]:
     platform = platform if platform else getDataCollectionParameters(filepath)['platform']
     return _SocialMediaItemReader(Post, filepath, platform)
 
+def PostBatchReader(filepath: str, platform: str = None) -> PostBatch:
+    """
+    Reads all posts from a file at once, as a PostBatch. Gets the platform from the
+    filename if it is not given.
+
+    Args:
+        filepath (str): the filepath to read
+        platform (str, optional): the platform of the file
+
+    Returns:
+        PostBatch: the posts in the file, as columns
+    """
+    platform = getCleanPlatform(platform if platform else getDataCollectionParameters(filepath)['platform'])
+    columns = _readPostColumns(filepath, platform)
+    return PostBatch({key: _typedColumn(values) for key, values in columns.items()}, platform)
+
+def _typedColumn(column: Series) -> ArrayLike:
+    """
+    Gives a converted column a compact type: int64 for ints (Int64 when some are
+    missing), datetime64 for times, and objects for everything else.
+
+    Args:
+        column (Series): the column, as _convertPostColumns types it
+
+    Returns:
+        ArrayLike: the typed column
+    """
+    if column.dtype == 'Int64':
+        return column.array
+    if column.dtype == 'str':
+        return column.to_numpy(dtype=object, na_value=None)
+    return column.to_numpy()
+
 def UserReader(filepath: str, platform: str) -> Iterator[User]:
     """
     Reads users from a file and yields them in order. Assumes the file contains
@@ -511,76 +831,423 @@ def read_post_csv(filepath: str) -> DataFrame:
     Reads posts from a file as a DataFrame, using Post's standard keys.
 
     Args:
-        filepath (str): _description_
+        filepath (str): the filepath to read
 
     Returns:
-        DataFrame: _description_
+        DataFrame: one row per post, with the same columns and values as Post.to_dict()
     """
-    posts = [post.to_dict() for post in PostReader(filepath)]
-    return DataFrame(posts)
+    return read_post_frame(filepath)
 
+def read_post_frame(filepath: str, platform: str = None) -> DataFrame:
+    """
+    Reads posts from a file as a DataFrame without building a Post per row. The file
+    is read once as strings, then columns are renamed to standard keys using
+    Post.PLATFORM_MAPPINGS, placeholders are masked as None, and types are converted
+    one whole column at a time. The result is the same as building every Post and calling to_dict(), like
+    read_post_csv used to.
 
+    Args:
+        filepath (str): the filepath to read
+        platform (str, optional): the platform of the file. Gotten from the filename if not given.
 
-def getFilesToCheck(dir: str, platform: str, include_intermediate: bool = False) -> list[str]:
+    Returns:
+        DataFrame: one row per post, using Post's standard keys
     """
-    Get a list of csv filepaths to check. Recursive.
+    platform = getCleanPlatform(platform if platform else getDataCollectionParameters(filepath)['platform'])
+    columns = _readPostColumns(filepath, platform)
+    if not columns:
+        return DataFrame()
+
+    return DataFrame({key: _inferredColumn(column) for key, column in columns.items()})
+
+def _inferredColumn(column: Series) -> Series:
+    """
+    Gives a converted column the dtype DataFrame(list of dicts) would infer from its values:
+    ints with missing values become floats, and strings get pandas' string dtype.
+    """
+    if column.dtype == 'Int64':
+        return column.astype('float64') if column.hasnans else column.astype('int64')
+    if column.dtype == object:
+        if infer_dtype(column, skipna=True) in ('string', 'empty'):
+            return column.infer_objects()
+        return Series(column.tolist()) # mixed types, e.g. counts and text
+    return column
+
+def _readPostColumns(filepath: str, platform: str) -> dict[str, Series]:
+    """
+    Reads posts from a file as columns of converted values, using Post's standard keys.
 
     Args:
-        dir (str): directory to start from
-        platform (str): platform to get files for. use 'all' for all platforms.
-        include_intermediate (bool): whether to include intermediate files
+        filepath (str): the filepath to read
+        platform (str): the clean platform of the file
 
     Returns:
-        list[str]: list of filepaths to check
+        dict[str, Series]: the values Post.get would give, by key, typed like _convertPostColumns types them. Empty if the file has no posts.
+    """
+    raw = _readRawCsv(filepath)
+    if raw.empty:
+        return {}
+
+    _map = Post.PLATFORM_MAPPINGS[platform]
+    reverse_map = Post.REVERSE_MAPPINGS[platform]
+
+    sources = {}
+    for platform_key in raw.columns:
+        key = reverse_map.get(platform_key, platform_key)
+        if key in sources:
+            continue
+        source = _map.get(key)
+        sources[key] = source if source in raw.columns else key
+
+    columns = dict(zip(sources, _convertPostColumns([raw[source] for source in sources.values()], platform)))
+    if platform is FACEBOOK:
+        columns[Post.RANK] = Series(range(len(raw)), dtype='int64') # like PostReader, ranks are the order of the rows
+    return columns
+
+def _readRawCsv(filepath: str) -> DataFrame:
     """
-    print(dir)
-    files_to_check = []
-    for file in os.listdir(dir):
-        print("FILE")
-        print(file)
-        path = os.path.join(dir, file)
-        if isRelevantFile(path, platform, include_intermediate):
-            files_to_check.append(path)
-        elif os.path.isdir(path):
-            files_to_check.extend(getFilesToCheck(path, platform, include_intermediate))
+    Reads a file as strings, without turning any of them into missing values. Files are
+    read with pyarrow's parser, which is a few times faster than pandas' own. pyarrow
+    comes with streamlit; without it, or for files it cannot parse, pandas' parser is used.
+    """
+    try:
+        return _readRawCsvWithPyarrow(filepath)
+    except (ImportError, ValueError):
+        pass
+    return read_csv(filepath, dtype=str, keep_default_na=False)
 
-    return files_to_check
+def _readRawCsvWithPyarrow(filepath: str) -> DataFrame:
+    """
+    Same as _readRawCsv, with pyarrow's parser. It is used directly, since telling it every
+    column is a string is faster than pandas' converting columns after it read them.
+
+    Raises an ImportError without pyarrow, and a ValueError for files it cannot parse like
+    pandas would, e.g. with repeated column names, which pandas renames.
+    """
+    import pyarrow
+    from pyarrow import csv as pyarrow_csv
+
+    with open(filepath, newline='') as file:
+        names = next(reader(file), [])
+    if len(set(names)) < len(names):
+        raise ValueError(f"{filepath} has repeated column names")
 
-def isRelevantFile(filepath: str, platform: str, include_intermediate: bool = False) -> bool:
+    options = pyarrow_csv.ConvertOptions(column_types={name: pyarrow.large_string() for name in names},
+                                         strings_can_be_null=False, quoted_strings_can_be_null=False)
+    table = pyarrow_csv.read_csv(filepath, convert_options=options)
+    return table.to_pandas(types_mapper={pyarrow.large_string(): StringDtype('pyarrow', na_value=nan)}.get)
+
+def _convertPostColumns(columns: list[Series], platform: str) -> list[Series]:
     """
-    Tells whether the given filepath is relevant to the given platform.
+    Converts columns of raw strings the same way Post.get converts a single value:
+    placeholders become None, then getNum is tried, then the platform's time format.
+
+    The columns are put one after another, so that each step runs once per file rather
+    than once per column. Only values made of the characters a count or a time can have
+    are parsed: counts with _parseCounts, once per distinct value, and times with one
+    to_datetime.
 
     Args:
-        filepath (str): the filepath to check
-        platform (str): the platform for relevancy. use 'all' for all platforms.
-        include_intermediate (str): whether to include intermediate files
+        columns (list[Series]): the raw columns of a file, as strings
+        platform (str): the platform the columns were read from
 
     Returns:
-        bool: whether the filepath is relevant
+        list[Series]: each column, as int64 (Int64 when some are missing) if every value is a
+                      count, datetime64 if every value is a time, strings (NaN for placeholders)
+                      if every value is text, and objects otherwise, with None for placeholders
     """
-    if platform == 'all' and include_intermediate:
-        raise ValueError(f"can only get all files for all platforms")
-    platform = getCleanPlatform(platform)
-    return (
-        os.path.isfile(filepath)
-        and (platform == 'all' or platform in filepath.lower())
-        and filepath.endswith('.csv')
-        and (include_intermediate or not isIntermediateFile(filepath, platform))
-    )
+    rows = len(columns[0])
+    values = concat(columns, ignore_index=True)
+    present = (values.notna() & ~values.isin(Post.PLACEHOLDERS[platform])).to_numpy(dtype=bool)
+    # every count and time has a digit
+    has_digit = present & values.str.contains('[0-9]', na=False).to_numpy(dtype=bool)
+    is_count, counts = _findCounts(values, has_digit)
+    times = _findTimes(values, has_digit & ~is_count, platform)
+    is_time = ~isnat(times)
+
+    converted = []
+    for i, column in enumerate(columns):
+        part = slice(i * rows, (i + 1) * rows)
+        converted.append(_assembleColumn(column, present[part], is_count[part], counts[part], is_time[part], times[part]))
+    return converted
+
+def _findCounts(values: Series, maybe_count: ndarray) -> tuple[ndarray, ndarray]:
+    """
+    Finds and parses the counts among raw strings, for _convertPostColumns.
+
+    Args:
+        values (Series): the raw strings
+        maybe_count (ndarray): which strings may be counts, e.g. they are not placeholders and have a digit
+
+    Returns:
+        tuple[ndarray, ndarray]: which values are counts, and the counts: int64, or objects if
+                                 some do not fit in an int64. Other values are left as 0.
+    """
+    is_count = zeros(len(values), dtype=bool)
+    counts = zeros(len(values), dtype='int64')
+    candidates = maybe_count.nonzero()[0]
+    candidates = candidates[values.iloc[candidates].str.fullmatch(_onlyChars(_COUNT_CHARS), na=False).to_numpy(dtype=bool)]
+    if not len(candidates):
+        return is_count, counts
+    candidate_values = values.iloc[candidates]
+
+    # most counts and ids are plain digits, which are cast at once when they fit in an int64.
+    # digit strings of the same length compare like their numbers
+    lengths = candidate_values.str.len()
+    plain = ((candidate_values.str.lstrip(string.digits).str.len() == 0) & (lengths > 0)
+             & ((lengths < 19) | ((lengths == 19) & (candidate_values <= str(2 ** 63 - 1))))).to_numpy(dtype=bool)
+    is_count[candidates[plain]] = True
+    counts[candidates[plain]] = _castDigits(candidate_values[plain], 'int64')
+    candidates = candidates[~plain]
+    if not len(candidates):
+        return is_count, counts
+
+    # the others, like '1.2K', repeat a lot, so each distinct one is only parsed once
+    codes, uniques = factorize(candidate_values[~plain])
+    found, parsed = _parseDistinctCounts(Series(uniques))
+    if parsed.dtype == object:
+        counts = counts.astype(object) # kept as python ints
+
+    is_count[candidates] = found[codes]
+    counts[candidates] = parsed[codes]
+    return is_count, counts
+
+def _parseDistinctCounts(nums: Series) -> tuple[ndarray, ndarray]:
+    """
+    Parses distinct strings with _parseCounts, leaving those with unicode characters or
+    counts too big for an int64 to _parseCount.
+
+    Returns:
+        tuple[ndarray, ndarray]: which strings are counts, and the counts: int64, or objects if
+                                 some do not fit in an int64. Other strings are left as 0.
+    """
+    found = zeros(len(nums), dtype=bool)
+    parsed = zeros(len(nums), dtype='int64')
+    normalized = nums.str.replace(',', '', regex=False).str.strip().str.lower()
+    # _parseCount strips and matches whitespace the unicode way, so strings with unicode
+    # characters or rare whitespace are left to it
+    unsure = nums.str.contains(_UNUSUAL_COUNT_CHARS, na=False).to_numpy(dtype=bool, copy=True)
+    matched = ~unsure & normalized.str.fullmatch(_COUNT_PATTERN, na=False).to_numpy(dtype=bool)
+
+    # counts without digits, like '.' or 'k' alone, are NA too, and _parseCount rejects them
+    counts = _parseCounts(normalized[matched])
+    fits = counts.notna().to_numpy(dtype=bool)
+    positions = matched.nonzero()[0]
+    found[positions[fits]] = True
+    parsed[positions[fits]] = counts[fits].to_numpy(dtype='int64')
+    unsure[positions[~fits]] = True
+
+    positions = unsure.nonzero()[0]
+    others = [_parseCount(num) for num in nums.iloc[positions]]
+    positions = fromiter((i for i, num in zip(positions, others) if num is not None), dtype='int64')
+    others = [num for num in others if num is not None]
+    if not all(-2 ** 63 <= num < 2 ** 63 for num in others):
+        parsed = parsed.astype(object)
+    found[positions] = True
+    parsed[positions] = others
+    return found, parsed
+
+def _findTimes(values: Series, maybe_time: ndarray, platform: str) -> ndarray:
+    """
+    Parses the times among raw strings, for _convertPostColumns.
+
+    Args:
+        values (Series): the raw strings
+        maybe_time (ndarray): which strings may be times: they are not placeholders or counts, and have a digit
+        platform (str): the platform the strings were read from
+
+    Returns:
+        ndarray: the times, as datetime64, NaT for values which are not times
+    """
+    times = full(len(values), datetime64('NaT'), dtype='datetime64[ns]')
+    candidates = maybe_time.nonzero()[0]
+    candidates = candidates[values.iloc[candidates].str.fullmatch(_timeChars(Post.TIME_FORMATS[platform]), na=False).to_numpy(dtype=bool)]
+    if len(candidates):
+        # times repeat a lot (to the minute on Facebook), so each distinct one is parsed once
+        codes, distinct = factorize(values.iloc[candidates])
+        parsed = getTimes(Series(distinct), platform).to_numpy()[codes]
+        times = times.astype(parsed.dtype)
+        times[candidates] = parsed
+    return times
+
+@lru_cache(maxsize=None)
+def _onlyChars(allowed: str) -> str:
+    """
+    Gets a regex of strings whose ascii characters are all allowed. Unicode characters
+    are always allowed, since _parseCount and strptime treat unicode whitespace as whitespace.
+    """
+    forbidden = [code for code in range(128) if chr(code) not in allowed]
+    ranges = [] # runs of consecutive codes, so that the regex stays short to parse
+    for code in forbidden:
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return '[^' + ''.join(f'\\x{first:02x}-\\x{last:02x}' for first, last in ranges) + ']*'
+
+@lru_cache(maxsize=None)
+def _timeChars(time_format: str) -> str:
+    """
+    Gets a regex of the strings which may be times in a strptime format: digits, whitespace,
+    the format's other characters in any case, and letters if it has names like '%A'.
+    """
+    literals = re.sub('%.', '', time_format)
+    allowed = string.digits + _ASCII_WHITESPACE + literals.lower() + literals.upper()
+    if re.search('%[aAbBp]', time_format):
+        allowed += string.ascii_letters
+    return _onlyChars(allowed)
+
+def _assembleColumn(column: Series, present: ndarray, is_count: ndarray, counts: ndarray, is_time: ndarray, times: ndarray) -> Series:
+    """
+    Puts together one column converted by _convertPostColumns, from its raw strings and
+    which of them are counts and times.
+    """
+    is_text = present & ~is_count & ~is_time
+    if not present.any():
+        return Series([None] * len(column), dtype=object)
+    if not is_text.any() and not is_time.any():
+        if counts.dtype == object: # some do not fit in int64
+            converted = empty(len(column), dtype=object)
+            converted[is_count] = counts[is_count]
+            return Series(converted, dtype=object)
+        if is_count.all():
+            return Series(counts)
+        return Series(IntegerArray(counts, ~is_count))
+    if not is_text.any() and not is_count.any():
+        return Series(times)
+    if not is_count.any() and not is_time.any(): # text, kept as strings
+        return column.where(present).reset_index(drop=True)
+
+    converted = column.to_numpy(dtype=object, copy=True)
+    converted[~present] = None
+    if is_count.any():
+        converted[is_count] = counts[is_count].tolist()
+    if is_time.any():
+        converted[is_time] = list(Series(times[is_time]).dt.to_pydatetime())
+    return Series(converted, dtype=object)
+
+def _parseCounts(nums: Series) -> Series:
+    """
+    Same as _parseCount, for a whole column of counts at once. Counts must already match
+    _COUNT_PATTERN once normalized: without commas, stripped and lowercase. Counts which
+    may not fit in an int64, or have no digits, are NA, for _parseCount to parse.
+
+    Args:
+        nums (Series): the normalized counts, as strings
+
+    Returns:
+        Series: the counts, as Int64
+    """
+    nums = nums.reset_index(drop=True)
+    if nums.empty:
+        return Series(dtype='Int64') # pyarrow's string functions fail on no strings
+    # in a count, 'k' and 'm' can only be its suffix and '-' its sign
+    is_k = nums.str.contains('k', regex=False).to_numpy(dtype=bool)
+    is_m = nums.str.contains('m', regex=False).to_numpy(dtype=bool)
+    negative = nums.str.startswith('-').to_numpy(dtype=bool)
+    factors = where(is_k, 1_000, where(is_m, 1_000_000, 1)).astype('uint64')
+    factor_digits = where(is_k, 3, where(is_m, 6, 0))
+
+    # '-1.25k plays' is read as 125 with 2 decimal digits
+    nums = nums.str.rstrip('kmplays' + _ASCII_WHITESPACE).str.lstrip('+-')
+    points = nums.str.find('.').to_numpy(dtype='int64')
+    decimal_digits = where(points < 0, 0, nums.str.len().to_numpy(dtype='int64') - points - 1)
+    nums = nums.str.replace('.', '', regex=False)
+    digits = nums.str.len().to_numpy(dtype='int64')
+
+    # below 10 ** 19, so nothing overflows a uint64 before the int64 check
+    fits = (digits > 0) & (digits + factor_digits <= 19)
+    values = zeros(len(nums), dtype='uint64')
+    values[fits] = _castDigits(nums[fits], 'uint64')
+    values = values * factors // (10 ** where(fits, decimal_digits, 0).astype('uint64'))
+    fits &= values < 2 ** 63
+    values = values.astype('int64')
+    values[negative] *= -1
+    return Series(IntegerArray(values, ~fits))
+
+def _castDigits(digits: Series, dtype: str) -> ndarray:
+    """
+    Casts strings of digits to ints of a numpy dtype. Strings held by pyarrow are cast by
+    pyarrow, which is many times faster than pandas' casting.
+    """
+    if getattr(digits.dtype, 'storage', None) == 'pyarrow':
+        return digits.astype(f'{dtype}[pyarrow]').to_numpy(dtype=dtype)
+    return digits.astype(dtype).to_numpy()
+
+@profiled()
+def read_post_csvs(filepaths: list[str], processes: int = None) -> DataFrame:
+    """
+    Reads posts from many files as one DataFrame, reading the files in parallel.
+    Rows keep the order of filepaths, then the order within each file.
 
-def isIntermediateFile(filepath: str, platform: str) -> bool:
+    Args:
+        filepaths (list[str]): the filepaths to read
+        processes (int, optional): number of processes to use. Defaults to readFilesInParallel's default.
+
+    Returns:
+        DataFrame: the posts from every file, one file after another
+    """
+    frames = readFilesInParallel(read_post_csv, filepaths, processes)
+    if not frames:
+        return DataFrame()
+    return concat(frames, axis=0, ignore_index=True)
+
+def read_collection_csv(filepath: str, fill_empty_youtube_urls: bool = False) -> DataFrame:
+    """
+    Reads posts from a data collection file, and adds the parameters of the collection
+    as columns: searchTerm, platform, trendingTime and collectedTime. Also adds the
+    canonical url and post id of every post, from getCanonicalUrls.
+
+    Args:
+        filepath (str): the filepath to read
+        fill_empty_youtube_urls (bool, optional): for YouTube, whether to also use the text as url when
+                                                  the url column exists but is empty. Defaults to False.
+
+    Returns:
+        DataFrame: the posts in the file, with the collection parameters
+    """
+    df = read_post_csv(filepath)
+    data = getDataCollectionParameters(filepath)
+    df['searchTerm'] = data['query']
+    df['platform'] = data['platform']
+    df['trendingTime'] = data['trending_time']
+    df['collectedTime'] = data['collection_time']
+    if data['platform'] in (INSTAGRAM, TIKTOK):
+        df['url'] = df['id']
+    if data['platform'] == YOUTUBE:
+        if 'url' not in df.columns or (fill_empty_youtube_urls and (df['url'].isnull().all() or df['url'].eq('').all())):
+            df['url'] = df['text']
+    if 'url' in df.columns:
+        df[[Post.URL, Post.POST_ID]] = getCanonicalUrls(df['url'], data['platform'])
+    return df
+
+@profiled()
+def readFilesInParallel(reader: Callable[[str], Any], filepaths: list[str], processes: int = None) -> list:
     """
-    Tells whether a file is intermediate, based on the platform's conventions.
+    Reads many files at once on a pool of processes. Results are returned in the
+    same order as filepaths, no matter which file finishes first. The reader must
+    be picklable, e.g. a module-level function or a functools.partial of one.
 
     Args:
-        filepath (str): the file to check
+        reader (Callable[[str], Any]): function to read a single file
+        filepaths (list[str]): the filepaths to read
+        processes (int, optional): number of processes to use. Defaults to one per CPU, at most
+                                   DEFAULT_MAX_PROCESSES, and none for fewer than PARALLEL_FROM_FILES
+                                   files, which are read faster than a pool starts.
+                                   Use 1 to read in this process, one file after another.
 
     Returns:
-        bool: whether the file is intermediate
+        list: what the reader returned for each file
     """
-    isIntermediate = 'intermediate' in filepath.lower()
-    if platform is YOUTUBE:
-        return isIntermediate or len(os.path.basename(filepath).split('_')) == 1
+    if processes is None:
+        processes = min(DEFAULT_MAX_PROCESSES, os.cpu_count() or 1) if len(filepaths) >= PARALLEL_FROM_FILES else 1
+    processes = min(processes, len(filepaths))
+    if processes <= 1:
+        return [reader(filepath) for filepath in filepaths]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(reader, filepaths))
+
 
 def getGptResponse(gpt: OpenAI, system_prompt: str, user_prompt) -> str:
     """
@@ -608,7 +1275,11 @@ def getGptResponse(gpt: OpenAI, system_prompt: str, user_prompt) -> str:
 def getNum(num: str) -> int:
     """
     Transforms a string into a number. Aware of 'K' and 'M' abbreviations, case
-    insensitive. Ignores commas.
+    insensitive. Ignores commas, and a trailing 'play' or 'plays', which Facebook
+    adds to view counts. Decimals are kept as far as the abbreviation allows, and
+    truncated after that: '1.25K' is 1250 and '1.5' is 1.
+
+    Raises a ValueError if the string is not a number like that, e.g. '3m ago'.
 
     Args:
         num (str): the number as a string
@@ -616,88 +1287,313 @@ def getNum(num: str) -> int:
     Returns:
         int: the number as an int
     """
-    num = num.replace(',', '').lower()
-    num = num.replace('play', '') # for Facebook
-    
-    if 'k' in num:
-        factor = 1_000
-        num = num.replace('k', '')
-    elif 'm' in num:
-        factor = 1_000_000
-        num = num.replace('m', '')
-    else:
-        factor = 1
+    value = _parseCount(num)
+    if value is None:
+        raise ValueError(f"{num!r} is not a number")
+    return value
 
-    if len(num.split('.')) > 1:
-        whole, decimal = num.split('.')
-        num = whole + decimal
-        factor //= 10 ** len(decimal)
+def _parseCount(num: str) -> int | None:
+    """
+    Same as getNum, but returns None when the string is not a number.
+    """
+    if num.isascii() and num.isdigit(): # most counts are plain digits
+        return int(num)
+
+    match = _COUNT.fullmatch(num.replace(',', '').strip().lower())
+    if match is None or not (match['whole'] or match['decimal']):
+        return None
+
+    factor = _COUNT_FACTORS[match['suffix']]
+    decimal = match['decimal'] or ''
+    value = int(match['whole'] or 0) * factor + int(decimal or 0) * factor // 10 ** len(decimal)
+    return -value if match['sign'] == '-' else value
 
-    return int(num) * factor
+def _parseTime(time: str, platform: str) -> datetime:
+    """
+    Same as Post.getTime, for a platform.
+    """
+    time = datetime.strptime(time, Post.TIME_FORMATS[platform])
+    source_time_zone = Post.SOURCE_TIME_ZONES.get(platform)
+    if source_time_zone is not None:
+        time = time.replace(tzinfo=ZoneInfo(source_time_zone)).astimezone(ZoneInfo(Post.TIME_ZONE)).replace(tzinfo=None)
+    return time
 
-def getDataCollectionParameters(filepath: str) -> dict[str, str | datetime]:
+def getNums(nums: Series | ArrayLike) -> Series:
     """
-    Gets parameters of data collection from its filename, using its filepath.
-    Returns a dictionary of these parameters
+    Transforms a whole column of strings into numbers at once, the same way getNum
+    transforms one string, with pandas' string methods. Each distinct string which is
+    not plain digits is only parsed once.
+
+    Values which are not numbers, including placeholders and missing values, become
+    NA. Values which already are ints are kept.
 
     Args:
-        filepath (str): path to the file to get parameters from
+        nums (Series | ArrayLike): the numbers, as strings
 
     Returns:
-        dict[str, str | datetime]: a dictionary describing parameters of data collection for the file. Keys are:
-                                   query: str
-                                   platform: str
-                                   trending_time: datetime
-                                   collection_time: datetime
+        Series: the numbers, as nullable Int64. Keeps the index of nums if it is a Series.
     """
-    try:
-        fn, _ = os.path.splitext(os.path.basename(filepath))
-       
-        try:
-            query, platform, trending, collected = fn.split('_')
-            trending_time = datetime.strptime(trending.split('@')[1], timefmt).replace(year=2024),
-        except:
-            query, platform, collected = fn.split('_')
-            trending_time = datetime.strptime("01-01-00", timefmt).replace(year=2024),
-        
-        return {
-            'query': query,
-            'platform': getCleanPlatform(platform),
-            'trending_time': trending_time,
-            'collection_time': datetime.strptime(collected.split('@')[1], timefmt).replace(year=2024),
-        }
-    except:
-        raise ValueError(f"filepath is not a valid data collection file: {filepath}")
+    nums = nums if isinstance(nums, Series) else Series(nums)
+    if nums.dtype.kind in 'iu':
+        return nums.astype('Int64')
+
+    values = nums.reset_index(drop=True)
+    is_int = zeros(len(values), dtype=bool)
+    if values.dtype != 'str' and infer_dtype(values, skipna=True) in ('string', 'empty'):
+        values = values.astype('str')
+    elif values.dtype != 'str':
+        types = values.map(type)
+        is_int = (types == int).to_numpy(dtype=bool)
+        values = values.where(types == str).astype('str')
+
+    is_count, counts = _findCounts(values, values.notna().to_numpy(dtype=bool))
+    if is_int.any(): # ints are kept
+        counts = counts.astype(object)
+        counts[is_int] = nums.to_numpy(dtype=object)[is_int]
+        is_count |= is_int
+    if counts.dtype == object: # counts which do not fit in an int64 become NA
+        is_count &= fromiter((-2 ** 63 <= count < 2 ** 63 for count in counts), dtype=bool, count=len(counts))
+        counts = where(is_count, counts, 0).astype('int64')
+    return Series(IntegerArray(counts, ~is_count), index=nums.index)
+
+def getTimes(times: Series | ArrayLike, platform: str) -> Series:
+    """
+    Transforms a whole column of time strings into times at once, the same way
+    Post.getTime transforms one string: using the platform's format in Post.TIME_FORMATS,
+    and converting to Post.TIME_ZONE if the platform stores times in another time zone.
+
+    Values which are not times in that format become NaT.
+
+    Args:
+        times (Series | ArrayLike): the times, as strings
+        platform (str): the platform the times come from
 
-def getCleanPlatform(platform: str) -> str:
+    Returns:
+        Series: the times, as naive datetime64 in Post.TIME_ZONE. Keeps the index of times if it is a Series.
+    """
+    platform = getCleanPlatform(platform)
+    times = times if isinstance(times, Series) else Series(times, dtype=object)
+    times = to_datetime(times, format=Post.TIME_FORMATS[platform], errors='coerce')
+    source_time_zone = Post.SOURCE_TIME_ZONES.get(platform)
+    if source_time_zone is not None:
+        times = times.dt.tz_localize(source_time_zone).dt.tz_convert(Post.TIME_ZONE).dt.tz_localize(None)
+    return times
+
+def getCanonicalUrl(value: Any, platform: str) -> tuple[str | None, str | None]:
     """
-    Gets a clean version of the platform given. Checks if the platform name
-    is in the platform string, then returns the appropriate platform constant.
-    For example, both 'instagram' and 'Instagram1' would return INSTAGRAM.
+    Gets the canonical url and the platform's own id of a post. Facebook and YouTube
+    posts are found from their url, and Instagram and TikTok posts from their id, which
+    may also be a url. The same post always gets the same canonical url:
+     - Facebook: the url with only its story_fbid parameter, or as is for videos (watch urls)
+     - Instagram: https://www.instagram.com/p/<id>
+     - TikTok: https://www.tiktok.com/@/video/<id>
+     - YouTube: https://www.youtube.com/watch?v=<id>
+
+    Facebook login pages, which were collected instead of posts that could not be opened,
+    lose their query string like other urls, e.g. https://www.facebook.com/login/, and
+    have no post id, even when the post they lead to is in their url. isLoginUrl tells
+    them apart.
+
+    Values which are not recognized are kept as urls as they are (formatted into the
+    canonical url for Instagram and TikTok, like their ids), with no post id. Results are
+    memoized, so repeated values are only parsed once per process.
 
-    Raises a ValueError if the appropriate platform constant cannot be found.
+    Args:
+        value (Any): the url or id of the post
+        platform (str): the platform of the post
+
+    Returns:
+        tuple[str | None, str | None]: the canonical url and the post id. Both are None if value is missing.
+    """
+    return _canonicalUrl(value, getCleanPlatform(platform))
+
+@lru_cache(maxsize=1 << 18)
+def _canonicalUrl(value: Any, platform: str) -> tuple[str | None, str | None]:
+    if value is None or value is NA or value != value: # missing, including NaN
+        return None, None
+    value = str(value).strip()
+
+    post_id = None
+    is_url = '://' in value or '.com/' in value or 'youtu.be/' in value
+    if is_url:
+        for pattern in _POST_ID_PATTERNS[platform]:
+            match = pattern.search(value)
+            if match is not None:
+                post_id = match[1]
+                break
+    elif platform in (INSTAGRAM, TIKTOK) and value and not value.isspace():
+        post_id = value if platform is INSTAGRAM or value.isdigit() else None
+
+    if platform is FACEBOOK:
+        return _cleanFacebookUrl(value), None if isLoginUrl(value) else post_id
+    if post_id is not None:
+        return _CANONICAL_URLS[platform].format(post_id), post_id
+    if platform is YOUTUBE or is_url:
+        return value, None
+    return _CANONICAL_URLS[platform].format(value), None
+
+def isLoginUrl(url: str) -> bool:
+    """
+    Tells whether a url, raw or canonical, is a login page rather than a post.
+
+    Args:
+        url (str): the url to check
+
+    Returns:
+        bool: True iff the url's path is a login page, like /login/ or /login.php
+    """
+    return _LOGIN_PATH.match(urlparse(url).path) is not None
+
+def _cleanFacebookUrl(url: str) -> str:
+    """
+    Removes every query parameter of a Facebook url except story_fbid, which identifies
+    the post. Video (watch) urls are kept as they are.
+    """
+    if 'watch' in url:
+        return url
+
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query)
+    clean_query_params = {k: v for k, v in query_params.items() if k == 'story_fbid'}
+    return urlunparse(parsed_url._replace(query=urlencode(clean_query_params, doseq=True)))
+
+@profiled()
+def getCanonicalUrls(values: Series | ArrayLike, platforms: str | Series | ArrayLike) -> DataFrame:
+    """
+    Gets the canonical urls and post ids of a whole column of posts at once, the same
+    way getCanonicalUrl does for one post. Each distinct value is only parsed once per
+    platform.
 
     Args:
-        platform (str): the platform to get
+        values (Series | ArrayLike): the urls or ids of the posts
+        platforms (str | Series | ArrayLike): the platform of every post, or one platform for all of them
 
     Returns:
-        str: a clean version of the platform string
+        DataFrame: 'url' and 'post id' columns, as objects. Keeps the index of values if it is a Series.
     """
-    platform = platform.lower()
-    if FACEBOOK in platform:
-        return FACEBOOK
-    if INSTAGRAM in platform:
-        return INSTAGRAM
-    if TIKTOK in platform:
-        return TIKTOK
-    if YOUTUBE in platform:
-        return YOUTUBE
-    if platform.lower() == 'all':
-        return 'all'
+    values = values if isinstance(values, Series) else Series(values, dtype=object)
+    urls = empty(len(values), dtype=object)
+    post_ids = empty(len(values), dtype=object)
 
-    raise ValueError(f"platform {platform} is not supported!")
+    if isinstance(platforms, str):
+        groups = [(platforms, slice(None))]
+    else:
+        platform_codes, platform_uniques = factorize(Series(platforms).to_numpy(dtype=object))
+        groups = [(platform, platform_codes == i) for i, platform in enumerate(platform_uniques)]
+
+    for platform, rows in groups:
+        platform = getCleanPlatform(platform)
+        codes, uniques = factorize(values.to_numpy(dtype=object)[rows])
+        canonical = [_canonicalUrl(value, platform) for value in uniques] + [(None, None)] # missing values have code -1
+        unique_urls = empty(len(canonical), dtype=object)
+        unique_ids = empty(len(canonical), dtype=object)
+        unique_urls[:], unique_ids[:] = zip(*canonical)
+        urls[rows] = unique_urls[codes]
+        post_ids[rows] = unique_ids[codes]
+
+    return DataFrame({Post.URL: urls, Post.POST_ID: post_ids}, index=values.index, dtype=object)
+
+@lru_cache(maxsize=1 << 16)
+def getPostIdentity(platform: str, post_id: Any, url: str = None) -> int:
+    """
+    Gets a 64-bit number which identifies a post, from its platform and post id (or its
+    url when it has no post id). The same post gets the same number in every collection
+    and every process. Same as getPostIdentities, for one post.
 
-def getAllUsers(data_dir: str, platform: str) -> set[User]:
+    Args:
+        platform (str): the platform of the post
+        post_id (Any): the post id, as given by getCanonicalUrl
+        url (str, optional): the canonical url of the post, used if it has no post id
+
+    Returns:
+        int: the identity of the post
+    """
+    key = url if _isMissing(post_id) else post_id
+    return int(_identities([_identityKey(getCleanPlatform(platform), None if _isMissing(key) else str(key))])[0])
+
+def _identityKey(platform: str, key: str | None) -> bytes:
+    """
+    Gets the bytes a post's identity hashes: its platform's, followed by its key's, missing
+    keys being told apart from empty ones.
+    """
+    return platform.encode() + (b'\x01' + key.encode() if key is not None else b'\x00')
+
+def _identities(keys: Iterable[bytes]) -> ndarray:
+    """
+    Hashes _identityKeys into identities with blake2b, which gives the same identities in
+    every process, unlike hash().
+    """
+    digests = b''.join(blake2b(key, digest_size=8).digest() for key in keys)
+    return frombuffer(digests, dtype='<u8').astype('uint64')
+
+def _isMissing(value: Any) -> bool:
+    return value is None or value is NA or value != value # NaN
+
+@profiled()
+def getPostIdentities(platforms: Series, post_ids: Series, urls: Series = None) -> Series:
+    """
+    Gets the 64-bit identity of every post in a column at once: a hash of the platform
+    and the post id, or the url for posts with no post id. Posts with neither share one
+    identity. Same as getPostIdentity for every post, each distinct post being hashed once.
+
+    Args:
+        platforms (Series): the clean platform of every post
+        post_ids (Series): the post ids, as given by getCanonicalUrls
+        urls (Series, optional): the canonical urls, used where there is no post id
+
+    Returns:
+        Series: the identities, as uint64. Keeps the index of post_ids.
+    """
+    keys = post_ids.to_numpy(dtype=object, copy=True)
+    if urls is not None:
+        missing = post_ids.isna().to_numpy()
+        keys[missing] = urls.to_numpy(dtype=object)[missing]
+
+    platform_codes, platform_names = factorize(platforms.to_numpy(dtype=object))
+    key_codes, key_values = factorize(keys) # missing keys have code -1
+    pair_codes, pairs = factorize(platform_codes * (len(key_values) + 1) + key_codes + 1)
+    platform_of, key_of = divmod(pairs, len(key_values) + 1)
+    # an _identityKey is its platform's bytes followed by its key's, so each is encoded once
+    names = [name.encode() for name in platform_names]
+    keys = [_identityKey('', None)] + [_identityKey('', str(key)) for key in key_values] # 123 and '123' are the same id
+    distinct = _identities(names[platform] + keys[key] for platform, key in zip(platform_of.tolist(), key_of.tolist()))
+    return Series(distinct[pair_codes], index=post_ids.index)
+
+@profiled()
+def getContentFingerprints(df: DataFrame, columns: list[str] = None) -> Series:
+    """
+    Gets a 64-bit hash of every row of a DataFrame, so that rows with the same values in
+    every column get the same fingerprint. Finding duplicate rows by their fingerprints
+    is much cheaper than comparing rows as strings. Lists, which cannot be hashed, are
+    compared as tuples.
+
+    Args:
+        df (DataFrame): the rows to fingerprint
+        columns (list[str], optional): the columns to use. Defaults to all of them.
+
+    Returns:
+        Series: the fingerprints, as uint64. Keeps the index of df.
+    """
+    df = df if columns is None else df[columns]
+    df = df.apply(lambda column: column.map(_hashable) if column.dtype == object else column)
+    return hash_pandas_object(df, index=False)
+
+def _hashable(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+class UserRecord(NamedTuple):
+    """
+    A user found in collection files, as extractUsers gives it. Names are normalized like
+    normalizeUserName does: unicode is normalized (NFKC), whitespace is collapsed and
+    trimmed, and case is kept.
+    """
+    name: str
+    unique_name: str | None # only Instagram and TikTok files have unique names
+    posts: int | None = None # rows of the user in the files, a post found by many collections counts many times
+    platforms: int | None = None # platforms the user was found on
+
+@profiled()
+def getAllUsers(data_dir: str, platform: str, processes: int = None) -> set[User]:
     """
     Gets all users in the data set for a given platform. Users are returned
     incomplete. All platforms will fill in the NAME property, while only Instagram
@@ -706,6 +1602,7 @@ def getAllUsers(data_dir: str, platform: str) -> set[User]:
     Args:
         data_dir (str): the directory to search through
         platform (str): platform to get users for. Use 'all' to search through all.
+        processes (int, optional): number of processes to read files with. Defaults to readFilesInParallel's default.
 
     Returns:
         set[User]: a list of username, full name for each user found
@@ -714,9 +1611,88 @@ def getAllUsers(data_dir: str, platform: str) -> set[User]:
 
     data_filepaths = getFilesToCheck(data_dir, platform)
 
-    for fp in data_filepaths:
-        users.update(getUsersFromPostFile(fp))
+    for users_in_file in readFilesInParallel(getUsersFromPostFile, data_filepaths, processes):
+        users.update(users_in_file)
+
+    return users
+
+@profiled()
+def getAllUserRecords(data_dir: str, platform: str, processes: int = None, counts: bool = False) -> list[UserRecord]:
+    """
+    Gets all users in the data set for a given platform, with extractUsers, as normalized
+    names instead of User objects. All platforms fill in the name, while only Instagram
+    and TikTok fill in the unique name.
+
+    Args:
+        data_dir (str): the directory to search through
+        platform (str): platform to get users for. Use 'all' to search through all.
+        processes (int, optional): number of processes to read files with. Defaults to readFilesInParallel's default.
+        counts (bool, optional): whether to count the posts and platforms of each user. Defaults to False.
 
+    Returns:
+        list[UserRecord]: each user found, once
+    """
+    return extractUsers(getFilesToCheck(data_dir, platform), processes, counts)
+
+@profiled()
+def extractUsers(filepaths: list[str], processes: int = None, counts: bool = False) -> list[UserRecord]:
+    """
+    Gets every user in collection files, reading only the name and unique name columns
+    of each file, in parallel. Users are the same when their normalized name and unique
+    name are, on any platform. On Instagram, users without a full name are named by
+    their username. Placeholders are missing names, and rows without any name are skipped.
+
+    Args:
+        filepaths (list[str]): the collection files
+        processes (int, optional): number of processes to read files with. Defaults to readFilesInParallel's default.
+        counts (bool, optional): whether to count the posts and platforms of each user. Defaults to False.
+
+    Returns:
+        list[UserRecord]: each user found, once, in the order they are first found
+    """
+    frames = [df for df in readFilesInParallel(_readUsers, filepaths, processes) if len(df)]
+    if not frames:
+        return []
+    users = concat(frames, ignore_index=True)
+    if not counts:
+        users = users.drop_duplicates(['name', 'unique name'])
+        return [UserRecord(name, unique_name or None) for name, unique_name in zip(users['name'], users['unique name'])]
+
+    users = users.groupby(['name', 'unique name'], sort=False).agg(posts=('posts', 'sum'), platforms=('platform', 'nunique')).reset_index()
+    return [
+        UserRecord(name, unique_name or None, int(posts), int(platforms))
+        for name, unique_name, posts, platforms in zip(users['name'], users['unique name'], users['posts'], users['platforms'])
+    ]
+
+def _readUsers(filepath: str) -> DataFrame:
+    """
+    Reads the users of one collection file, for extractUsers.
+
+    Returns:
+        DataFrame: name, unique name ('' if none), posts (rows of the user) and platform of each user of the file
+    """
+    platform = getDataCollectionParameters(filepath)['platform']
+    columns = Post.PLATFORM_MAPPINGS[platform]
+    name_column = columns[Post.USER_NAME]
+    unique_column = columns.get(Post.USER_UNIQUE_NAME)
+    # without parsing anything else, or turning strings like 'NA' into missing values
+    df = read_csv(filepath, usecols=lambda column: column in (name_column, unique_column), dtype=str, na_filter=False)
+
+    placeholders = Post.PLACEHOLDERS[platform]
+    names = {}
+    for column in (name_column, unique_column):
+        values = df[column] if column in df.columns else Series('', index=df.index, dtype=object)
+        # each distinct name is normalized once, placeholders become ''
+        normalized = {value: '' if value in placeholders else normalizeUserName(value) for value in values.unique()}
+        names[column] = values.map(normalized).astype(object)
+    names, unique_names = names[name_column], names[unique_column]
+    if platform is INSTAGRAM:
+        names = names.where(names != '', unique_names) # when no full name, username is full name
+
+    users = DataFrame({'name': names, 'unique name': unique_names})
+    users = users[(users['name'] != '') | (users['unique name'] != '')]
+    users = users.groupby(['name', 'unique name'], sort=False).size().rename('posts').reset_index()
+    users['platform'] = platform
     return users
 
 def getUsersFromPostFile(filepath: str) -> set[User]:
@@ -0,0 +1,133 @@
+from __future__ import annotations
+from typing import Any, Callable, Hashable, Iterator
+
+class DatasetGraph:
+    """
+    Declared graph of derived datasets: each dataset has a name, the function which
+    computes it, and the datasets it is computed from, which are passed to the function in
+    order. A dataset can only depend on datasets declared before it, so the graph has no
+    cycles.
+
+    Datasets are computed lazily, the first time they are asked for, along with the
+    datasets they depend on, and memoized with the version token of the input they were
+    computed for. Asking again for the same version gives the memoized dataset. Asking for
+    a new version computes it again. Only the latest version of each dataset is kept.
+
+    The memoized datasets live in store, so a graph which is declared again, e.g. on every
+    rerun of a script, can keep them by being given the same store. Graphs sharing a store
+    from different threads may compute a dataset twice, but always memoize a whole one.
+
+    For example:
+        graph = DatasetGraph()
+
+        @graph.dataset()
+        def posts(): ...
+
+        @graph.dataset(deps=['posts'])
+        def cube(posts): ...
+
+        graph.get('cube', version) # computes posts, then cube
+    """
+    def __init__(self, store: dict[str, tuple[Hashable, Any]] = None) -> None:
+        """
+        Args:
+            store (dict[str, tuple[Hashable, Any]], optional): version and value of each memoized dataset. Defaults to a new dict.
+        """
+        self.store = {} if store is None else store
+        self._nodes: dict[str, tuple[Callable, tuple[str, ...]]] = {}
+
+    def add(self, name: str, compute: Callable, deps: list[str] = ()) -> None:
+        """
+        Declares a dataset.
+
+        Args:
+            name (str): the name of the dataset
+            compute (Callable): computes the dataset from its dependencies, given in the order of deps
+            deps (list[str], optional): the names of the datasets it is computed from. Defaults to ().
+        """
+        for dep in deps:
+            if dep not in self._nodes:
+                raise KeyError(f"dataset '{name}' depends on '{dep}', which is not declared before it")
+        self._nodes[name] = (compute, tuple(deps))
+
+    def dataset(self, name: str = None, deps: list[str] = ()) -> Callable[[Callable], Callable]:
+        """
+        Declares a dataset, as a decorator of the function which computes it.
+
+        Args:
+            name (str, optional): the name of the dataset. Defaults to the name of the function.
+            deps (list[str], optional): the names of the datasets it is computed from. Defaults to ().
+
+        Returns:
+            Callable[[Callable], Callable]: the decorator, which gives back the function as it is
+        """
+        def declare(compute: Callable) -> Callable:
+            self.add(name or compute.__name__, compute, deps)
+            return compute
+        return declare
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._nodes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._nodes) # in the order they were declared
+
+    def get(self, name: str, version: Hashable) -> Any:
+        """
+        Gets a dataset, computing it and what it depends on if they are not memoized for version.
+
+        Args:
+            name (str): the name of the dataset
+            version (Hashable): the version token of the input
+
+        Returns:
+            Any: the dataset
+        """
+        if name not in self._nodes:
+            raise KeyError(f"no dataset '{name}' is declared")
+        memoized = self.store.get(name)
+        if memoized is not None and memoized[0] == version:
+            return memoized[1]
+        compute, deps = self._nodes[name]
+        value = compute(*(self.get(dep, version) for dep in deps))
+        self.store[name] = (version, value)
+        return value
+
+    def isComputed(self, name: str, version: Hashable) -> bool:
+        """
+        Tells whether a dataset is memoized for a version, so getting it would not compute anything.
+
+        Args:
+            name (str): the name of the dataset
+            version (Hashable): the version token of the input
+
+        Returns:
+            bool: True iff the dataset is memoized for version
+        """
+        memoized = self.store.get(name)
+        return memoized is not None and memoized[0] == version
+
+    def dependencies(self, name: str) -> list[str]:
+        """
+        Gets every dataset which a dataset is computed from, directly or not.
+
+        Args:
+            name (str): the name of the dataset
+
+        Returns:
+            list[str]: the names of the datasets, each before the datasets depending on it
+        """
+        ordered = []
+        def visit(node: str) -> None:
+            for dep in self._nodes[node][1]:
+                if dep not in ordered:
+                    visit(dep)
+                    ordered.append(dep)
+        visit(name)
+        return ordered
+
+    def clear(self) -> None:
+        """
+        Forgets every memoized dataset.
+        """
+        self.store.clear()
@@ -0,0 +1,92 @@
+"""
+Checks that importing helper and the dashboard stays fast. Each module is imported in
+a new interpreter, a few times, and the fastest import must fit in its time budget and
+must not load the modules it is not allowed to.
+
+Run it from the repository root; it exits with status 1 if a budget is exceeded:
+    python -m helper.importBudget
+"""
+from __future__ import annotations
+import json
+import subprocess
+import sys
+
+# plotting and text libraries, which are only imported when a section drawing with them is shown
+PLOTTING = ['matplotlib', 'seaborn', 'altair', 'wordcloud', 'requests']
+DATA = ['pandas', 'numpy']
+DASHBOARD = ['streamlit'] # helper is used without the dashboard too
+
+# module: (most seconds its import may take, modules it must not load)
+IMPORT_BUDGETS: dict[str, tuple[float, list[str]]] = {
+    'helper': (0.05, DATA + PLOTTING + DASHBOARD),
+    'helper.collectionFiles': (0.05, DATA + PLOTTING + DASHBOARD),
+    'helper.collectionCatalog': (0.05, DATA + PLOTTING + DASHBOARD),
+    'helper.commonTools': (0.6, PLOTTING + DASHBOARD),
+    'app': (1.5, PLOTTING),
+}
+
+_MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': sorted(name for name in sys.modules if '.' not in name)}}))
+"""
+
+def measureImport(module: str, repeat: int = 3) -> tuple[float, set[str]]:
+    """
+    Imports a module in new interpreters, from the current directory.
+
+    Args:
+        module (str): the module to import
+        repeat (int, optional): how many times to import it. Defaults to 3.
+
+    Raises:
+        ImportError: if the module cannot be imported
+
+    Returns:
+        tuple[float, set[str]]: the fastest import time in seconds, and the top-level modules it loaded
+    """
+    times = []
+    loaded = set()
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', _MEASURE.format(module=module)], capture_output=True, text=True)
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()
+            raise ImportError(f"importing {module} failed: {error[-1] if error else result.returncode}")
+        measured = json.loads(result.stdout.strip().splitlines()[-1])
+        times.append(measured['seconds'])
+        loaded.update(measured['loaded'])
+    return min(times), loaded
+
+def checkImportBudgets(budgets: dict[str, tuple[float, list[str]]] = IMPORT_BUDGETS, repeat: int = 3) -> list[str]:
+    """
+    Checks the import of every module against its budget.
+
+    Args:
+        budgets (dict[str, tuple[float, list[str]]], optional): the budget of each module. Defaults to IMPORT_BUDGETS.
+        repeat (int, optional): how many times to import each module. Defaults to 3.
+
+    Returns:
+        list[str]: a description of every exceeded budget, empty if none is
+    """
+    problems = []
+    for module, (budget, forbidden) in budgets.items():
+        try:
+            seconds, loaded = measureImport(module, repeat)
+        except ImportError as error:
+            problems.append(str(error))
+            continue
+        print(f"{module}: {seconds:.3f}s (budget {budget:.3f}s)")
+        if seconds > budget:
+            problems.append(f"importing {module} took {seconds:.3f}s, more than its budget of {budget:.3f}s")
+        for name in forbidden:
+            if name in loaded:
+                problems.append(f"importing {module} loads {name}")
+    return problems
+
+if __name__ == '__main__':
+    problems = checkImportBudgets()
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    sys.exit(1 if problems else 0)
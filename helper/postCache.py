@@ -0,0 +1,177 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import suppress
+from typing import IO, Callable
+
+from pandas import DataFrame, concat, read_pickle
+
+from .commonTools import read_post_csv, readFilesInParallel
+from .profiler import profiled
+
+CACHE_VERSION = 3
+
+class PostCache:
+    """
+    Persistent on-disk cache of DataFrames read from collection files, with one entry
+    per source file. An entry is keyed by the file's path, size and modification time,
+    so it is only read again when the file changes.
+
+    Entries are stored as pickled DataFrames, which keeps every column's dtype, and a
+    manifest.json in the cache directory records which source file each entry belongs to.
+    read_all drops the entries of files it was not asked for, so the cache only holds
+    the files of its last read.
+
+    For example, to read a directory and only parse new or changed files:
+        cache = PostCache('./.cache/posts', reader=read_post_csv)
+        df = cache.read_all(getFilesToCheck(data_dir, 'all'))
+    """
+    def __init__(self, cache_dir: str, reader: Callable[[str], DataFrame] = read_post_csv, version: int | str = 0) -> None:
+        """
+        Args:
+            cache_dir (str): directory to keep the cache in. Created if it does not exist.
+            reader (Callable[[str], DataFrame], optional): function to read one file. Defaults to read_post_csv.
+            version (int | str, optional): version of the reader. Change it when the reader's output changes,
+                                           to invalidate every entry. Defaults to 0.
+        """
+        self.cache_dir = cache_dir
+        self.reader = reader
+        self.version = f"{CACHE_VERSION}.{version}"
+        self._manifest_path = os.path.join(cache_dir, 'manifest.json')
+        self._manifest = self._loadManifest()
+
+    def _loadManifest(self) -> dict[str, dict]:
+        try:
+            with open(self._manifest_path) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        if manifest.get('version') != self.version:
+            return {}
+        return manifest.get('entries', {})
+
+    def _saveManifest(self) -> None:
+        self._writeAtomically(self._manifest_path, 'w', lambda file: json.dump({'version': self.version, 'entries': self._manifest}, file))
+
+    def _writeAtomically(self, path: str, mode: str, write: Callable[[IO], None]) -> None:
+        """
+        Writes a file of the cache through a temporary file of its own, then moves it into
+        place, so that a file is never seen half written, even with several writers at once.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file = tempfile.NamedTemporaryFile(mode, dir=self.cache_dir, suffix='.tmp', delete=False)
+        try:
+            with file:
+                write(file)
+            os.replace(file.name, path)
+        except BaseException:
+            with suppress(OSError):
+                os.remove(file.name)
+            raise
+
+    def _entryPath(self, filepath: str) -> str:
+        name = hashlib.sha1(os.path.abspath(filepath).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.pkl")
+
+    def isFresh(self, filepath: str) -> bool:
+        """
+        Tells whether the cache has an up to date entry for a file.
+
+        Args:
+            filepath (str): the source file to check
+
+        Returns:
+            bool: True iff the file's size and modification time match its entry
+        """
+        entry = self._manifest.get(os.path.abspath(filepath))
+        if entry is None:
+            return False
+        stat = os.stat(filepath)
+        return (
+            entry['size'] == stat.st_size
+            and entry['mtime'] == stat.st_mtime_ns
+            and os.path.isfile(self._entryPath(filepath))
+        )
+
+    def read(self, filepath: str) -> DataFrame:
+        """
+        Reads a file using its cache entry if it is up to date. Otherwise, reads the
+        file with the reader and stores the result.
+
+        Args:
+            filepath (str): the source file to read
+
+        Returns:
+            DataFrame: the file's contents, as given by the reader
+        """
+        df, changed = self._read([filepath], processes=1)
+        if changed:
+            self._saveManifest()
+        return df
+
+    @profiled('PostCache.read_all')
+    def read_all(self, filepaths: list[str], processes: int = None) -> DataFrame:
+        """
+        Reads many files, parsing only the ones that are new or changed, and
+        concatenates them in order in a single pass. Files which need parsing are
+        read in parallel. Once they are read, the entries of every other file are
+        dropped, so that files which left the selection do not stay cached forever.
+
+        Args:
+            filepaths (list[str]): the source files to read
+            processes (int, optional): number of processes to parse files with. Defaults to readFilesInParallel's default.
+
+        Returns:
+            DataFrame: the files' contents, one after another
+        """
+        df, changed = self._read(filepaths, processes)
+        if self._dropEntriesExcept(filepaths) or changed:
+            self._saveManifest()
+        return df
+
+    def _read(self, filepaths: list[str], processes: int | None) -> tuple[DataFrame, bool]:
+        """
+        Reads files like read_all, without dropping other entries or saving the manifest.
+        Also tells whether the manifest changed.
+        """
+        frames = {filepath: self._readEntry(filepath) for filepath in filepaths}
+        stale = [filepath for filepath, df in frames.items() if df is None]
+        if stale:
+            stats = {filepath: os.stat(filepath) for filepath in stale}
+            for filepath, df in zip(stale, readFilesInParallel(self.reader, stale, processes)):
+                self._writeEntry(filepath, df, stats[filepath])
+                frames[filepath] = df
+
+        if not frames:
+            return DataFrame(), bool(stale)
+        return concat([frames[filepath] for filepath in filepaths], axis=0, ignore_index=True), bool(stale)
+
+    def _dropEntriesExcept(self, filepaths: list[str]) -> bool:
+        """
+        Drops the entries of every file not in filepaths, and their pickles.
+
+        Returns:
+            bool: True iff some entry was dropped
+        """
+        kept = {os.path.abspath(filepath) for filepath in filepaths}
+        dropped = [path for path in self._manifest if path not in kept]
+        for path in dropped:
+            del self._manifest[path]
+            with suppress(OSError):
+                os.remove(self._entryPath(path))
+        return bool(dropped)
+
+    def _readEntry(self, filepath: str) -> DataFrame | None:
+        if not self.isFresh(filepath):
+            return None
+        try:
+            return read_pickle(self._entryPath(filepath))
+        except Exception:
+            return None # unreadable entry, read the file again
+
+    def _writeEntry(self, filepath: str, df: DataFrame, stat: os.stat_result) -> None:
+        self._writeAtomically(self._entryPath(filepath), 'wb', df.to_pickle)
+        self._manifest[os.path.abspath(filepath)] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
@@ -0,0 +1,205 @@
+from __future__ import annotations
+from typing import Any
+
+from numpy import inf
+from pandas import DataFrame, Series, cut, factorize
+
+from .commonTools import Post
+
+# first rank of each rank bucket. the last bucket has no end
+RANK_BUCKET_STARTS = [0, 10, 11, 21, 51, 101]
+RANK_BUCKETS = [
+    f"{start}-{end - 1}" if end - 1 > start else f"{start}"
+    for start, end in zip(RANK_BUCKET_STARTS, RANK_BUCKET_STARTS[1:])
+] + [f"{RANK_BUCKET_STARTS[-1]}+"] # '0-9', '10', '11-20', '21-50', '51-100', '101+'
+
+RANK_BUCKET = 'rank bucket'
+
+FRESH_HOURS = 24 # posts uploaded at most this many hours before collection are fresh
+
+class PostCube:
+    """
+    Aggregates of the unified post frame over a few dimensions, computed once, so that
+    summary tables are slices of small tables instead of scans of every post. Dimensions
+    are platform, searchTerm, collectedTime, firstTrending, rank bucket (see RANK_BUCKETS)
+    and cat, for the ones the frame has.
+
+    The cube holds three tables, each grouped by every dimension:
+     - cells: the number of posts, the sum of their likes, the number with likes, and
+       the number which are fresh (see FRESH_HOURS) or have an age
+     - accounts: the same, also grouped by user name, to count and rank accounts
+     - videos: the number of posts, also grouped by post identity, to count unique videos
+
+    Missing values of a dimension, like posts of unlabelled accounts, are kept as their
+    own group.
+
+    For example, the number of unique TikTok videos in the top 10 results:
+        cube = PostCube.from_frame(df)
+        cube.slice({'platform': 'tiktok'}).upToRank(10).distinct(Post.IDENTITY)
+    """
+    DIMENSIONS = ('platform', 'searchTerm', 'collectedTime', 'firstTrending', RANK_BUCKET, 'cat')
+    MEASURES = ('posts', 'likes', 'liked posts', 'fresh posts', 'aged posts')
+
+    def __init__(self, cells: DataFrame, accounts: DataFrame, videos: DataFrame, dimensions: list[str], platforms: list[str]) -> None:
+        self.cells = cells
+        self.accounts = accounts
+        self.videos = videos
+        self.dimensions = dimensions
+        self.platforms = platforms # in order of first appearance, like df['platform'].unique()
+
+    @classmethod
+    def from_frame(cls, df: DataFrame, fresh_hours: float = FRESH_HOURS) -> PostCube:
+        """
+        Builds the cube of a post frame.
+
+        Args:
+            df (DataFrame): the posts
+            fresh_hours (float, optional): most hours from upload to collection for a post to be fresh. Defaults to FRESH_HOURS.
+
+        Returns:
+            PostCube: the cube
+        """
+        keys = DataFrame(index=df.index)
+        dimensions = []
+        for dimension in cls.DIMENSIONS:
+            if dimension == RANK_BUCKET and Post.RANK in df.columns:
+                keys[RANK_BUCKET] = rankBuckets(df[Post.RANK])
+            elif dimension in df.columns:
+                keys[dimension] = df[dimension]
+            else:
+                continue
+            dimensions.append(dimension)
+
+        likes = df[Post.LIKES] if Post.LIKES in df.columns else Series(float('nan'), index=df.index)
+        hours = df['time_difference_hours'] if 'time_difference_hours' in df.columns else Series(float('nan'), index=df.index)
+        measures = DataFrame({
+            'posts': 1,
+            'likes': likes.astype('float64'),
+            'liked posts': likes.notna().astype('int64'),
+            'fresh posts': (hours <= fresh_hours).fillna(False).astype('int64'),
+            'aged posts': hours.notna().astype('int64'),
+        }, index=df.index)
+
+        if Post.IDENTITY in df.columns:
+            identities = df[Post.IDENTITY]
+        else: # frames which were not cleaned, videos are told apart by url
+            codes, _ = factorize(df[Post.URL])
+            identities = Series(codes, index=df.index).where(codes != -1)
+
+        rows = keys.join(measures)
+        cells = _sumBy(rows, dimensions)
+        accounts = _sumBy(rows.join(df[[Post.USER_NAME]]), dimensions + [Post.USER_NAME], dropna_keys=[Post.USER_NAME])
+        videos = _sumBy(rows[dimensions + ['posts']].assign(**{Post.IDENTITY: identities}), dimensions + [Post.IDENTITY], dropna_keys=[Post.IDENTITY])
+        platforms = list(df['platform'].unique()) if 'platform' in df.columns else []
+        return cls(cells, accounts, videos, dimensions, platforms)
+
+    def __len__(self) -> int:
+        return int(self.cells['posts'].sum())
+
+    def slice(self, filters: dict[str, Any]) -> PostCube:
+        """
+        Keeps only the posts with given values of some dimensions.
+
+        Args:
+            filters (dict[str, Any]): the value, or list of values, to keep for each dimension
+
+        Returns:
+            PostCube: a cube of the kept posts
+        """
+        def keep(table: DataFrame) -> DataFrame:
+            mask = Series(True, index=table.index)
+            for dimension, values in filters.items():
+                if dimension not in self.dimensions:
+                    raise KeyError(f"cube has no dimension '{dimension}'")
+                values = values if isinstance(values, (list, tuple, set)) else [values]
+                mask &= table[dimension].isin(values)
+            return table[mask]
+
+        cells = keep(self.cells)
+        platforms = [platform for platform in self.platforms if platform in set(cells['platform'])] if 'platform' in cells else []
+        return PostCube(cells, keep(self.accounts), keep(self.videos), self.dimensions, platforms)
+
+    def upToRank(self, rank: int) -> PostCube:
+        """
+        Keeps only the posts ranked at most rank, like df[df['rank'] <= rank]. rank must be
+        the last rank of a bucket, e.g. 9 or 10.
+
+        Args:
+            rank (int): the last rank to keep
+
+        Returns:
+            PostCube: a cube of the kept posts
+        """
+        if rank + 1 not in RANK_BUCKET_STARTS:
+            raise ValueError(f"rank {rank} is not the end of a rank bucket, which start at {RANK_BUCKET_STARTS}")
+        return self.slice({RANK_BUCKET: RANK_BUCKETS[:RANK_BUCKET_STARTS.index(rank + 1)]})
+
+    def totals(self, by: str | list[str] = None) -> DataFrame | Series:
+        """
+        Sums the measures, overall or by some dimensions.
+
+        Args:
+            by (str | list[str], optional): the dimensions to sum by. Defaults to None, for overall sums.
+
+        Returns:
+            DataFrame | Series: the measures, by the given dimensions as index, or as a Series if overall
+        """
+        if by is None:
+            return self.cells[list(self.MEASURES)].sum()
+        return self.cells.groupby(by, observed=True, dropna=False)[list(self.MEASURES)].sum()
+
+    def distinct(self, key: str, by: str | list[str] = None) -> int | Series:
+        """
+        Counts distinct user names, post identities or values of a dimension, overall or by
+        some dimensions. Missing values are not counted.
+
+        Args:
+            key (str): Post.USER_NAME, Post.IDENTITY or a dimension
+            by (str | list[str], optional): the dimensions to count by. Defaults to None, for an overall count.
+
+        Returns:
+            int | Series: the number of distinct values, by the given dimensions as index if any
+        """
+        if key == Post.USER_NAME:
+            table = self.accounts
+        elif key == Post.IDENTITY:
+            table = self.videos
+        elif key in self.dimensions:
+            table = self.cells
+        else:
+            raise KeyError(f"cube cannot count distinct '{key}'")
+        if by is None:
+            return int(table[key].nunique())
+        return table.groupby(by, observed=True, dropna=False)[key].nunique()
+
+    def accountTotals(self, by: str | list[str] = None) -> DataFrame:
+        """
+        Sums the measures per account, across every other dimension.
+
+        Args:
+            by (str | list[str], optional): dimensions to also group by, like 'cat'. Defaults to None.
+
+        Returns:
+            DataFrame: the measures, with the user name (and by) as columns
+        """
+        by = [] if by is None else [by] if isinstance(by, str) else list(by)
+        return self.accounts.groupby(by + [Post.USER_NAME], observed=True, dropna=False)[list(self.MEASURES)].sum().reset_index()
+
+def rankBuckets(ranks: Series) -> Series:
+    """
+    Gets the rank bucket of each rank, from RANK_BUCKETS.
+
+    Args:
+        ranks (Series): the ranks
+
+    Returns:
+        Series: the buckets, as an ordered categorical. Missing ranks have no bucket.
+    """
+    ranks = ranks.astype('float64')
+    return cut(ranks, bins=[-inf] + [start - 0.5 for start in RANK_BUCKET_STARTS[1:]] + [inf], labels=RANK_BUCKETS)
+
+def _sumBy(rows: DataFrame, keys: list[str], dropna_keys: list[str] = ()) -> DataFrame:
+    if dropna_keys:
+        rows = rows.dropna(subset=list(dropna_keys))
+    measures = [column for column in rows.columns if column not in keys]
+    return rows.groupby(keys, observed=True, dropna=False, sort=False)[measures].sum(min_count=0).reset_index()
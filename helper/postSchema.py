@@ -0,0 +1,150 @@
+from __future__ import annotations
+import sys
+
+from numpy import iinfo, isfinite
+from pandas import DataFrame, Series, factorize, to_datetime, to_numeric
+from pandas.api.types import infer_dtype, is_datetime64_any_dtype, is_numeric_dtype
+
+from .commonTools import Post
+from .profiler import profiled
+
+CATEGORY = 'category'
+INTERNED = 'interned' # objects, with every distinct string stored once
+DATETIME = 'datetime64[ns]'
+
+# dtype of every column of the unified post frame, for the columns it has.
+# other columns are kept as they are
+POST_FRAME_SCHEMA: dict[str, str] = {
+    'platform': CATEGORY,
+    'searchTerm': CATEGORY,
+    Post.TYPE: CATEGORY,
+    'cat': CATEGORY,
+
+    Post.USER_NAME: INTERNED,
+    Post.USER_UNIQUE_NAME: INTERNED,
+    Post.URL: INTERNED,
+    Post.POST_ID: INTERNED,
+
+    Post.RANK: 'Int16',
+    Post.LIKES: 'Int32',
+    Post.COMMENTS: 'Int32',
+    Post.SHARES: 'Int32',
+    Post.VIDEO_DURATION: 'Int32',
+    Post.VIEWS: 'Int32',
+    Post.IDENTITY: 'uint64',
+    'trendingEvent': 'Int32',
+
+    Post.UPLOAD_TIME: DATETIME,
+    'collectedTime': DATETIME,
+    'firstTrending': DATETIME,
+    'time_difference_hours': 'float32',
+    'trendingCollectedDifference': 'float32',
+}
+
+# nullable ints to widen to, in order, when values do not fit the declared one
+_WIDER_INTS = ['Int8', 'Int16', 'Int32', 'Int64']
+
+@profiled()
+def applyPostSchema(df: DataFrame, schema: dict[str, str] = POST_FRAME_SCHEMA) -> DataFrame:
+    """
+    Gives the columns of a post frame the compact dtypes declared in a schema:
+     - CATEGORY: categoricals, for fields with few distinct values
+     - INTERNED: objects, with every distinct string stored once and shared by all its rows
+     - nullable ints, like 'Int16': widened to a bigger int if some values do not fit
+     - DATETIME: naive datetime64
+     - any other dtype: converted with astype
+
+    Columns whose values cannot be converted, like ints with decimals or times as text,
+    are kept as they are. Columns which are not in the schema are kept as they are.
+
+    Args:
+        df (DataFrame): the post frame
+        schema (dict[str, str], optional): dtype of each column. Defaults to POST_FRAME_SCHEMA.
+
+    Returns:
+        DataFrame: a new frame, with the same rows and columns
+    """
+    columns = {}
+    for name, dtype in schema.items():
+        if name in df.columns and isinstance(df[name], Series): # not duplicated column names
+            columns[name] = _convertColumn(df[name], dtype)
+    return df.assign(**columns)
+
+def _convertColumn(column: Series, dtype: str) -> Series:
+    if dtype == CATEGORY:
+        return column if column.dtype == CATEGORY else column.astype(CATEGORY)
+    if dtype == INTERNED:
+        return internStrings(column)
+    if dtype in _WIDER_INTS:
+        return _toNullableInt(column, dtype)
+    if dtype == DATETIME:
+        if is_datetime64_any_dtype(column):
+            return column if column.dt.tz is None else column.dt.tz_localize(None)
+        if infer_dtype(column, skipna=True) in ('datetime', 'datetime64', 'date', 'empty'):
+            return to_datetime(column)
+        return column
+    try:
+        return column.astype(dtype)
+    except (TypeError, ValueError):
+        return column
+
+def _toNullableInt(column: Series, dtype: str) -> Series:
+    if column.dtype.kind == 'O' or not is_numeric_dtype(column):
+        column = to_numeric(column, errors='coerce')
+    values = column.to_numpy(dtype='float64', na_value=float('nan'))
+    present = values[isfinite(values)]
+    if (present != present.round()).any():
+        return column # not ints
+
+    for wider in _WIDER_INTS[_WIDER_INTS.index(dtype):]:
+        limits = iinfo(wider.lower())
+        if present.size == 0 or (limits.min <= present.min() and present.max() <= limits.max):
+            return column.astype(wider)
+    return column
+
+def internStrings(column: Series) -> Series:
+    """
+    Stores every distinct string of a column once: rows with equal strings share one
+    string object, instead of holding a copy each.
+
+    Args:
+        column (Series): the column
+
+    Returns:
+        Series: the column as objects, with missing values as None. Keeps the index of column.
+    """
+    codes, uniques = factorize(column.to_numpy(dtype=object))
+    interned = Series([sys.intern(value) if type(value) is str else value for value in uniques] + [None], dtype=object)
+    return Series(interned.to_numpy()[codes], index=column.index, dtype=object)
+
+def memoryReport(before: DataFrame, after: DataFrame) -> DataFrame:
+    """
+    Compares the memory used by each column of two versions of a frame, e.g. before and
+    after applyPostSchema. Objects shared by many rows, like interned strings, are only
+    counted once.
+
+    Args:
+        before (DataFrame): the frame before
+        after (DataFrame): the frame after
+
+    Returns:
+        DataFrame: 'before (MB)', 'after (MB)' and 'saved (%)' for every column, and a 'total' row
+    """
+    names = list(dict.fromkeys([*before.columns, *after.columns]))
+    report = DataFrame({
+        'before (MB)': [_columnMemory(before, name) for name in names],
+        'after (MB)': [_columnMemory(after, name) for name in names],
+    }, index=names)
+    report.loc['total'] = report.sum()
+    report = report / 2 ** 20
+    report['saved (%)'] = (100 * (1 - report['after (MB)'] / report['before (MB)'])).round(1)
+    return report.round({'before (MB)': 2, 'after (MB)': 2})
+
+def _columnMemory(df: DataFrame, name: str) -> int:
+    if name not in df.columns:
+        return 0
+    column = df[name]
+    if column.dtype != object:
+        return int(column.memory_usage(index=False, deep=True))
+    distinct = {id(value): value for value in column.to_numpy()}
+    return column.memory_usage(index=False, deep=False) + sum(sys.getsizeof(value) for value in distinct.values())
@@ -0,0 +1,270 @@
+"""
+Spans, which time the stages of reading and cleaning posts: wall time, rows in and out,
+and, when memory is tracked, the peak memory of the stage. Only the standard library is
+used, so timing a stage never loads anything.
+
+A span is opened with a context manager, or around every call of a function with a
+decorator. Spans opened inside another one are its children:
+    @profiled()
+    def cleanData(df): ...
+
+    with span('read files') as read:
+        df = readFiles()
+        read.rows_out = len(df)
+
+Spans are recorded by PROFILER, which keeps the latest MAX_SPANS of them and exports
+them as JSON, so runs can be compared.
+"""
+from __future__ import annotations
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+import json
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator
+
+MAX_SPANS = 1000
+
+def rowsOf(value: Any) -> int | None:
+    """
+    Counts the rows of a stage's input or output.
+
+    Args:
+        value (Any): a frame or series, an array, a tuple starting with one, or a list of them
+
+    Returns:
+        int | None: the number of rows, None if value has none
+    """
+    if hasattr(value, 'shape') and len(value.shape) > 0:
+        return int(value.shape[0])
+    if isinstance(value, tuple) and value:
+        return rowsOf(value[0])
+    if isinstance(value, list):
+        rows = [rowsOf(item) for item in value]
+        return sum(rows) if rows and None not in rows else len(value)
+    return None
+
+class Span:
+    """
+    One timed run of a stage.
+    """
+    def __init__(self, name: str, parent: Span = None, rows_in: int = None) -> None:
+        """
+        Args:
+            name (str): the name of the stage
+            parent (Span, optional): the span this one was opened in. Defaults to None.
+            rows_in (int, optional): rows the stage was given. Defaults to None.
+        """
+        self.name = name
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.rows_in = rows_in
+        self.rows_out: int | None = None
+        self.started = datetime.now()
+        self.seconds: float | None = None
+        self.peak_bytes: int | None = None
+        self.error: str | None = None
+        self._start = time.perf_counter()
+        self._start_bytes: int | None = None
+        self._peak: int = 0 # highest traced memory seen, before a child reset the peak
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'name': self.name,
+            'parent': None if self.parent is None else self.parent.name,
+            'depth': self.depth,
+            'started': self.started.isoformat(timespec='milliseconds'),
+            'seconds': self.seconds,
+            'rows in': self.rows_in,
+            'rows out': self.rows_out,
+            'peak bytes': self.peak_bytes,
+            'error': self.error,
+        }
+
+class Profiler:
+    """
+    Records spans, from every thread. Each thread has its own stack of open spans, so
+    spans of different threads are never children of one another.
+
+    Timing is always on, and costs about a microsecond per span. Memory is only tracked
+    once trackMemory(True) is called, with tracemalloc, which slows down everything run
+    meanwhile. tracemalloc counts the memory of every thread, so the peak of a span also
+    counts what other threads allocated meanwhile.
+    """
+    def __init__(self, max_spans: int = MAX_SPANS) -> None:
+        """
+        Args:
+            max_spans (int, optional): spans kept, the oldest are dropped first. Defaults to MAX_SPANS.
+        """
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._tracing = False
+
+    def _stack(self) -> list[Span]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @property
+    def tracks_memory(self) -> bool:
+        return self._tracing and tracemalloc.is_tracing()
+
+    def trackMemory(self, on: bool = True) -> None:
+        """
+        Starts or stops tracking the peak memory of spans opened from now on.
+
+        Args:
+            on (bool, optional): whether to track memory. Defaults to True.
+        """
+        if on and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not on and self._tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._tracing = on
+
+    @contextmanager
+    def span(self, name: str, rows_in: int = None) -> Iterator[Span]:
+        """
+        Times the code run inside it, as a stage.
+
+        Args:
+            name (str): the name of the stage
+            rows_in (int, optional): rows the stage is given. Defaults to None.
+
+        Yields:
+            Span: the span, whose rows_out can be set before it ends
+        """
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        current = Span(name, parent, rows_in)
+        tracing = self.tracks_memory
+        if tracing:
+            size, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent._peak = max(parent._peak, peak)
+            current._start_bytes = size
+            current._peak = size
+            tracemalloc.reset_peak()
+        stack.append(current)
+        try:
+            yield current
+        except BaseException as error:
+            current.error = type(error).__name__
+            raise
+        finally:
+            current.seconds = time.perf_counter() - current._start
+            stack.pop()
+            if tracing and tracemalloc.is_tracing():
+                peak = max(current._peak, tracemalloc.get_traced_memory()[1])
+                current.peak_bytes = peak - current._start_bytes
+                if parent is not None:
+                    parent._peak = max(parent._peak, peak)
+            with self._lock:
+                self._spans.append(current)
+
+    def profiled(self, name: str = None, rows: bool = True) -> Callable[[Callable], Callable]:
+        """
+        Times every call of a function, as a stage, with a decorator.
+
+        Args:
+            name (str, optional): the name of the stage. Defaults to the name of the function.
+            rows (bool, optional): whether to count the rows of its first argument and of its result. Defaults to True.
+
+        Returns:
+            Callable[[Callable], Callable]: the decorator
+        """
+        def decorate(function: Callable) -> Callable:
+            stage = name or function.__name__
+            @wraps(function)
+            def timed(*args, **kwargs):
+                rows_in = rowsOf(args[0]) if rows and args else None
+                with self.span(stage, rows_in) as current:
+                    result = function(*args, **kwargs)
+                    if rows:
+                        current.rows_out = rowsOf(result)
+                    return result
+            return timed
+        return decorate
+
+    def spans(self) -> list[dict[str, Any]]:
+        """
+        Gets the recorded spans, in the order they ended, so children come before their parent.
+
+        Returns:
+            list[dict[str, Any]]: the spans
+        """
+        with self._lock:
+            return [span.to_dict() for span in self._spans]
+
+    def summary(self) -> list[dict[str, Any]]:
+        """
+        Sums up the recorded spans by stage.
+
+        Returns:
+            list[dict[str, Any]]: for each stage, in the order it first ended: its runs, total and
+            longest seconds, rows in and out of its latest run, and highest peak memory
+        """
+        stages: dict[str, dict[str, Any]] = {}
+        for span in self.spans():
+            stage = stages.setdefault(span['name'], {
+                'name': span['name'], 'runs': 0, 'seconds': 0.0, 'longest seconds': 0.0,
+                'rows in': None, 'rows out': None, 'peak bytes': None,
+            })
+            stage['runs'] += 1
+            stage['seconds'] += span['seconds']
+            stage['longest seconds'] = max(stage['longest seconds'], span['seconds'])
+            stage['rows in'] = span['rows in']
+            stage['rows out'] = span['rows out']
+            if span['peak bytes'] is not None:
+                stage['peak bytes'] = max(stage['peak bytes'] or 0, span['peak bytes'])
+        return list(stages.values())
+
+    def to_json(self) -> str:
+        """
+        Exports the recorded spans and their summary as JSON.
+
+        Returns:
+            str: the JSON
+        """
+        return json.dumps({
+            'exported': datetime.now().isoformat(timespec='seconds'),
+            'memory tracked': self.tracks_memory,
+            'summary': self.summary(),
+            'spans': self.spans(),
+        }, indent=2)
+
+    def write(self, filepath: str) -> None:
+        """
+        Writes the JSON of the recorded spans to a file.
+
+        Args:
+            filepath (str): the file to write
+        """
+        with open(filepath, 'w') as file:
+            file.write(self.to_json())
+
+    def clear(self) -> None:
+        """
+        Forgets every recorded span.
+        """
+        with self._lock:
+            self._spans.clear()
+
+# the profiler which spans and profiled record to
+PROFILER = Profiler()
+
+def span(name: str, rows_in: int = None):
+    """
+    Times the code run inside it as a stage, with PROFILER. See Profiler.span.
+    """
+    return PROFILER.span(name, rows_in)
+
+def profiled(name: str = None, rows: bool = True) -> Callable[[Callable], Callable]:
+    """
+    Times every call of a function as a stage, with PROFILER. See Profiler.profiled.
+    """
+    return PROFILER.profiled(name, rows)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+import os
+import pickle
+from datetime import datetime
+from typing import Any, Hashable
+
+SNAPSHOT_VERSION = 2 # of the file format, files of other versions are built again
+
+class Snapshot:
+    """
+    Datasets computed offline, e.g. the cleaned post frame, summary tables and chart data
+    of a dashboard, saved to one file so they can be loaded without computing anything.
+
+    A snapshot file is a pickle with the snapshot format version (SNAPSHOT_VERSION), the
+    version token of the input the datasets were computed from, when it was built, and the
+    datasets by name. Files of another format version are not read.
+
+    For example:
+        Snapshot(datasets, data_version).write('./snapshot.pkl')
+        datasets = Snapshot.read('./snapshot.pkl').datasets
+    """
+    def __init__(self, datasets: dict[str, Any], data_version: Hashable, created: datetime = None) -> None:
+        """
+        Args:
+            datasets (dict[str, Any]): the datasets, by name
+            data_version (Hashable): version token of the input they were computed from
+            created (datetime, optional): when they were computed. Defaults to now.
+        """
+        self.datasets = datasets
+        self.data_version = data_version
+        self.created = datetime.now() if created is None else created
+
+    def __len__(self) -> int:
+        return len(self.datasets)
+
+    def write(self, filepath: str) -> None:
+        """
+        Writes the snapshot to a file, replacing it at once so that readers never see half a snapshot.
+
+        Args:
+            filepath (str): the file to write
+        """
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            pickle.dump({
+                'version': SNAPSHOT_VERSION,
+                'data version': self.data_version,
+                'created': self.created,
+                'datasets': self.datasets,
+            }, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, filepath)
+
+    @classmethod
+    def read(cls, filepath: str) -> Snapshot:
+        """
+        Reads a snapshot file.
+
+        Args:
+            filepath (str): the file to read
+
+        Raises:
+            ValueError: if the file is not a snapshot of the current format version
+
+        Returns:
+            Snapshot: the snapshot
+        """
+        with open(filepath, 'rb') as file:
+            content = pickle.load(file)
+        if not isinstance(content, dict) or content.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"{filepath} is not a snapshot of version {SNAPSHOT_VERSION}, build it again")
+        return cls(content['datasets'], content['data version'], content['created'])
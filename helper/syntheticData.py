@@ -0,0 +1,189 @@
+"""
+Writes synthetic data collection files, which look like the real ones without holding
+any real post, so that the pipeline can be run and measured outside the lab.
+
+Files are named like real collections, '{query}_{platform}_trending@MM-DD-HH_collected@MM-DD-HH.csv',
+and have the columns of Post.PLATFORM_MAPPINGS for their platform, with times in
+Post.TIME_FORMATS, counts written like the platforms do ('1.2K', '3M'), and some values
+replaced by the platform's Post.PLACEHOLDERS. Like real collections:
+ - every query is collected a few times, and most posts are found again by later collections
+ - some posts are found by more than one query
+ - a few accounts make most of the posts
+ - a few words make most of the text
+
+The same seed always writes the same files. For example, from the repository root:
+    python -m helper.syntheticData ./synthetic --rows 100000 --seed 0
+"""
+from __future__ import annotations
+import argparse
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from .collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE, timefmt
+from .commonTools import Post
+
+PLATFORMS = [FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE]
+
+# queries which the dashboard keeps, see cleanQueries in app.py
+SYNTHETIC_QUERIES = [
+    "Trump assassination",
+    "Trump rally",
+    "Trump shooting",
+    "Biden Hunter White House",
+    "US Supreme Court",
+    "GOP Convention 2024",
+]
+
+COLLECTIONS_PER_QUERY = 3
+PLACEHOLDER_RATE = 0.02 # share of values replaced by a placeholder
+RETURNING_RATE = 0.6 # share of a collection's posts found by an earlier collection of the query
+SHARED_RATE = 0.05 # share of a collection's posts also found by another query
+
+_WORDS = (
+    "trump biden rally shooting shot news breaking pa butler secret service president former campaign "
+    "vote election gop convention court supreme ruling justice america people watch live video update "
+    "today says new first just now crowd speech stage ear fight hunter white house wow prayers "
+    "https bit ly link bio follow subscribe app"
+).split()
+_FACEBOOK_TYPES = ['post', 'video', 'reel', 'photo']
+_INSTAGRAM_TYPES = ['post', 'reel', 'carousel']
+
+def writeCollections(directory: str, rows: int, seed: int = 0, queries: list[str] = SYNTHETIC_QUERIES,
+                     collections_per_query: int = COLLECTIONS_PER_QUERY, user_names: list[str] = None) -> list[str]:
+    """
+    Writes synthetic collection files for every platform, query and collection.
+
+    Args:
+        directory (str): directory to write to. Created if it does not exist.
+        rows (int): number of posts to write, across all files
+        seed (int, optional): seed of the random values. Defaults to 0.
+        queries (list[str], optional): the queries. Defaults to SYNTHETIC_QUERIES.
+        collections_per_query (int, optional): number of collections of each query. Defaults to COLLECTIONS_PER_QUERY.
+        user_names (list[str], optional): names of accounts, e.g. labelled ones, used before made-up ones. Defaults to None.
+
+    Returns:
+        list[str]: the filepaths written, in order
+    """
+    rnd = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    files = len(queries) * collections_per_query * len(PLATFORMS)
+    rows_per_file = max(1, rows // files)
+    accounts = _accounts(rnd, max(50, rows // 40), user_names or [])
+    account_weights = list(accumulate(1 / (rank + 1) for rank in range(len(accounts))))
+    word_weights = list(accumulate(1 / (rank + 1) for rank in range(len(_WORDS))))
+
+    filepaths = []
+    written = 0
+    for platform in PLATFORMS:
+        seen: dict[str, list[int]] = {query: [] for query in queries} # post numbers found by each query
+        seen_set: dict[str, set[int]] = {query: set() for query in queries}
+        next_post = 0
+        for q, query in enumerate(queries):
+            trending = datetime(2024, 7, 13, 10) + timedelta(days=q % 7, hours=q)
+            for collection in range(collections_per_query):
+                collected = trending + timedelta(hours=2 + 24 * collection + rnd.randrange(4))
+                count = rows_per_file if len(filepaths) < files - 1 else max(1, rows - written)
+
+                posts = {} # a post is found once per collection
+                while len(posts) < count:
+                    draw = rnd.random()
+                    if seen[query] and draw < RETURNING_RATE:
+                        post = rnd.choice(seen[query])
+                    elif draw < RETURNING_RATE + SHARED_RATE and next_post:
+                        post = rnd.randrange(next_post)
+                    else:
+                        post = None
+                    if post is None or post in posts:
+                        post = next_post
+                        next_post += 1
+                    posts[post] = None
+                posts = list(posts)
+                seen[query].extend(post for post in posts if post not in seen_set[query])
+                seen_set[query].update(posts)
+
+                filename = f"{query}_{platform}_trending@{trending.strftime(timefmt)}_collected@{collected.strftime(timefmt)}.csv"
+                filepath = os.path.join(directory, filename)
+                _writeFile(filepath, platform, posts, collected, rnd, accounts, account_weights, word_weights)
+                filepaths.append(filepath)
+                written += len(posts)
+    return filepaths
+
+def _accounts(rnd: random.Random, count: int, user_names: list[str]) -> list[str]:
+    names = [name for name in dict.fromkeys(user_names) if name]
+    while len(names) < count:
+        names.append(f"{rnd.choice(['The', 'Daily', 'Real', ''])}{rnd.choice(_WORDS).title()} {rnd.choice(['News', 'Times', 'Fan', 'Official', str(rnd.randrange(1000))])}".strip())
+    return names[:count]
+
+def _writeFile(filepath: str, platform: str, posts: list[int], collected: datetime, rnd: random.Random,
+               accounts: list[str], account_weights: list[float], word_weights: list[float]) -> None:
+    mapping = Post.PLATFORM_MAPPINGS[platform]
+    placeholders = sorted(Post.PLACEHOLDERS[platform])
+    with open(filepath, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(mapping.values())
+        for rank, post in enumerate(posts):
+            post_rnd = random.Random(f"{platform}{post}") # the same post has the same author, text and upload time
+            values = _postValues(platform, post, rank, collected, post_rnd, rnd, accounts, account_weights, word_weights)
+            row = []
+            for key in mapping:
+                value = values.get(key, '')
+                if key not in (Post.URL, Post.ID, Post.RANK) and rnd.random() < PLACEHOLDER_RATE:
+                    value = rnd.choice(placeholders)
+                row.append(value)
+            writer.writerow(row)
+
+def _postValues(platform: str, post: int, rank: int, collected: datetime, post_rnd: random.Random, rnd: random.Random,
+                accounts: list[str], account_weights: list[float], word_weights: list[float]) -> dict[str, str]:
+    user = post_rnd.choices(accounts, cum_weights=account_weights)[0]
+    uploaded = datetime(2024, 7, 13, 6) + timedelta(minutes=post_rnd.randrange(60 * 24 * 20))
+    uploaded = min(uploaded, collected - timedelta(minutes=post_rnd.randrange(1, 600)))
+    words = post_rnd.choices(_WORDS, cum_weights=word_weights, k=post_rnd.randrange(3, 30))
+    likes = int(post_rnd.paretovariate(1.1) * 10) + rnd.randrange(50) # keeps getting likes
+
+    values = {
+        Post.UPLOAD_TIME: uploaded.strftime(Post.TIME_FORMATS[platform]),
+        Post.USER_NAME: user,
+        Post.USER_UNIQUE_NAME: ''.join(user.lower().split()),
+        Post.TEXT: ' '.join(words),
+        Post.LIKES: _count(likes, rnd),
+        Post.RANK: str(rank),
+        Post.COMMENTS: _count(likes // 20, rnd),
+        Post.SHARES: _count(likes // 50, rnd),
+        Post.VIEWS: _count(likes * 30, rnd),
+        Post.VIDEO_DURATION: str(post_rnd.randrange(5, 1200)),
+    }
+    if platform == FACEBOOK:
+        values[Post.URL] = f"https://www.facebook.com/permalink.php?story_fbid={10 ** 15 + post}&id={post_rnd.randrange(10 ** 9)}&__cft__[0]={rnd.getrandbits(32):x}"
+        values[Post.TYPE] = post_rnd.choice(_FACEBOOK_TYPES)
+    elif platform == INSTAGRAM:
+        values[Post.ID] = f"C{post:09d}x"
+        values[Post.TYPE] = post_rnd.choice(_INSTAGRAM_TYPES)
+    elif platform == TIKTOK:
+        values[Post.ID] = str(7_300_000_000_000_000_000 + post)
+        values[Post.TYPE] = 'True' if post_rnd.random() < 0.02 else 'False'
+    elif platform == YOUTUBE:
+        values[Post.URL] = f"https://www.youtube.com/watch?v={post:011d}"
+    return values
+
+def _count(value: int, rnd: random.Random) -> str:
+    # written like the platforms do: '987', '1.2K', '3.4M', sometimes with commas
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.1f}M"
+    if value >= 10_000 or (value >= 1_000 and rnd.random() < 0.5):
+        return f"{value / 1_000:.1f}K"
+    if value >= 1_000:
+        return f"{value:,}"
+    return str(value)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Writes synthetic data collection files.")
+    parser.add_argument('directory', help="directory to write the files to")
+    parser.add_argument('--rows', type=int, default=10_000, help="number of posts to write, across all files. Defaults to 10000")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the random values. Defaults to 0")
+    args = parser.parse_args()
+    filepaths = writeCollections(args.directory, args.rows, args.seed)
+    print(f"Wrote {len(filepaths)} files to {args.directory}")
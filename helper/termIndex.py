@@ -0,0 +1,244 @@
+from __future__ import annotations
+import re
+from array import array
+from collections import defaultdict
+from typing import Iterable
+
+from numpy import bincount, concatenate, flatnonzero, frombuffer, maximum, ndarray, ones, zeros
+from pandas import DataFrame, Series, factorize
+from pandas.util import hash_pandas_object
+
+from .commonTools import Post
+
+_CLOUD_WORD = re.compile(r"\w[\w']*") # how WordCloud splits text into words
+
+class TermFrequencies:
+    """
+    How often each word appears in some posts, with words ranked from most to least
+    frequent. Words which appear as often are ranked by where they first appear, like
+    Counter.most_common. Looking up the frequency or rank of a word is O(1).
+    """
+    def __init__(self, words: Series, key: tuple = None) -> None:
+        """
+        Args:
+            words (Series): the count of each word, indexed by word, in rank order
+            key (tuple, optional): what the words were selected from, the same for equal selections. Defaults to None.
+        """
+        self.counts = words
+        self.key = key
+        self._ranks = {word: rank for rank, word in enumerate(words.index, start=1)}
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._ranks
+
+    def frequency(self, word: str) -> int:
+        """
+        Args:
+            word (str): the word, as written in the posts
+
+        Returns:
+            int: how many times the word appears, 0 if it does not
+        """
+        rank = self._ranks.get(word)
+        return 0 if rank is None else int(self.counts.iloc[rank - 1])
+
+    def rank(self, word: str) -> int | None:
+        """
+        Args:
+            word (str): the word, as written in the posts
+
+        Returns:
+            int | None: the rank of the word, starting from 1, or None if it does not appear
+        """
+        return self._ranks.get(word)
+
+    def most_common(self, n: int = None) -> list[tuple[str, int]]:
+        """
+        Args:
+            n (int, optional): number of words to give. Defaults to all of them.
+
+        Returns:
+            list[tuple[str, int]]: the n most frequent words and their counts, like Counter.most_common
+        """
+        counts = self.counts if n is None else self.counts.iloc[:n]
+        return list(zip(counts.index, counts.astype(int).tolist()))
+
+    def to_dict(self) -> dict[str, int]:
+        return dict(self.most_common())
+
+class TermIndex:
+    """
+    Index of the words in the posts, built once. Words are split on whitespace, and
+    counted per slice of the posts, e.g. per platform and query. Any selection of slices
+    is then merged from the counts, without reading the posts again.
+
+    Words can be filtered out with filter terms: a word is filtered out if it contains
+    any filter term, ignoring case. The terms are compiled into one pattern, which is only
+    matched against each distinct word once. Selections are memoized per filter.
+
+    For example:
+        index = TermIndex.from_frame(df, 'text', by=['platform', 'searchTerm'])
+        terms = index.select({'searchTerm': ['Trump rally']}, filter=['https', 'bit'])
+        terms.frequency('Trump'), terms.rank('Trump')
+    """
+    def __init__(self, terms: DataFrame, vocabulary: Series, by: list[str]) -> None:
+        """
+        Args:
+            terms (DataFrame): count and first position of each word code per slice
+            vocabulary (Series): the word of each word code
+            by (list[str]): the columns which the slices are made by
+        """
+        self._terms = terms
+        self.vocabulary = vocabulary
+        self.by = by
+        # changes when the counted posts do, so that selections of different posts have different keys
+        self.version = int(hash_pandas_object(terms, index=False).sum()) ^ int(hash_pandas_object(vocabulary, index=False).sum())
+        self._filters: dict[frozenset[str], Series] = {}
+        self._selections: dict[tuple, TermFrequencies] = {}
+
+    @classmethod
+    def from_frame(cls, df: DataFrame, column: str = Post.TEXT, by: list[str] = ('platform', 'searchTerm')) -> TermIndex:
+        """
+        Builds the index of the words in a column of posts.
+
+        Args:
+            df (DataFrame): the posts
+            column (str, optional): the column of text. Defaults to Post.TEXT.
+            by (list[str], optional): the columns to make slices by. Defaults to ('platform', 'searchTerm').
+
+        Returns:
+            TermIndex: the index
+        """
+        by = [key for key in by if key in df.columns]
+        slices = df[by].reset_index(drop=True)
+        if by:
+            slice_codes = slices.groupby(by, observed=True, dropna=False, sort=False).ngroup().to_numpy()
+        else:
+            slice_codes = zeros(len(slices), dtype='int64')
+        slices = slices.iloc[_firstPositions(slice_codes)].reset_index(drop=True)
+
+        # words are counted on integer codes, so that no frame or list of every word is built.
+        # codes are numbered in order of first appearance in the posts joined together
+        vocabulary: dict[str, int] = {}
+        word_codes = array('q')
+        lengths = zeros(len(df), dtype='int64')
+        for i, text in enumerate(df[column].astype(str).fillna('')): # posts without text have no words
+            row = [vocabulary.setdefault(word, len(vocabulary)) for word in text.split()]
+            lengths[i] = len(row)
+            word_codes.extend(row)
+
+        size = max(len(vocabulary), 1)
+        pair_codes, pairs = factorize(slice_codes.repeat(lengths) * size + frombuffer(word_codes, dtype='int64'))
+        terms = slices.iloc[pairs // size].reset_index(drop=True)
+        terms['word'] = pairs % size
+        terms['count'] = bincount(pair_codes, minlength=len(pairs))
+        terms['first'] = _firstPositions(pair_codes)
+        return cls(terms, Series(list(vocabulary), dtype=object), by)
+
+    def filtered(self, filter: Iterable[str] = None) -> Series:
+        """
+        Tells which words of the vocabulary are filtered out by some filter terms.
+
+        Args:
+            filter (Iterable[str], optional): the filter terms. Defaults to None, for none.
+
+        Returns:
+            Series: True for each word code which contains a filter term, ignoring case
+        """
+        key = frozenset(filter or ())
+        if key not in self._filters:
+            matcher = compileFilter(key)
+            if matcher is None:
+                self._filters[key] = Series(False, index=self.vocabulary.index)
+            else:
+                self._filters[key] = self.vocabulary.str.lower().str.contains(matcher, regex=True)
+        return self._filters[key]
+
+    def select(self, slices: dict[str, list] = None, filter: Iterable[str] = None) -> TermFrequencies:
+        """
+        Gets the frequency and rank of every word in some slices of the posts.
+
+        Args:
+            slices (dict[str, list], optional): the values to keep for some of the by columns. Defaults to all posts.
+            filter (Iterable[str], optional): filter terms, to leave out words containing any of them. Defaults to None.
+
+        Returns:
+            TermFrequencies: the words of the selected posts
+        """
+        slices = slices or {}
+        key = (tuple(sorted((name, tuple(sorted(map(str, values)))) for name, values in slices.items())), frozenset(filter or ()))
+        if key not in self._selections:
+            terms = self._terms
+            mask = ones(len(terms), dtype=bool)
+            for name, values in slices.items():
+                mask &= terms[name].isin(list(values)).to_numpy()
+            terms = terms[mask]
+
+            words = terms.groupby('word').agg(count=('count', 'sum'), first=('first', 'min'))
+            words = words[~self.filtered(filter).to_numpy()[words.index]]
+            words = words.sort_values(['count', 'first'], ascending=[False, True])
+            words = Series(words['count'].to_numpy(), index=self.vocabulary.to_numpy()[words.index])
+            self._selections[key] = TermFrequencies(words, key=(self.version,) + key)
+        return self._selections[key]
+
+def _firstPositions(codes: ndarray) -> ndarray:
+    # where each code first appears, for codes numbered in order of first appearance
+    highest = maximum.accumulate(codes) if len(codes) else codes
+    return flatnonzero(highest > concatenate(([-1], highest[:-1])))
+
+def compileFilter(filter: Iterable[str]) -> re.Pattern | None:
+    """
+    Compiles filter terms into one pattern, which finds any of the terms in a lowercased
+    word, like any(term.lower() in word.lower() for term in filter).
+
+    Args:
+        filter (Iterable[str]): the filter terms
+
+    Returns:
+        re.Pattern | None: the pattern, or None if there are no terms
+    """
+    terms = sorted({term.lower() for term in filter}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile('|'.join(map(re.escape, terms)))
+
+def cloudFrequencies(terms: TermFrequencies, stopwords: Iterable[str] = (), normalize_plurals: bool = True) -> dict[str, int]:
+    """
+    Counts the words of a word cloud from word frequencies, like WordCloud.generate does
+    from the text with collocations=False: words are split on non-word characters, 's
+    endings, numbers and stopwords are removed, each word is written in its most common
+    case, and plurals are merged into their singular. Only the distinct words are read,
+    so this does not depend on how long the text is. Two-word collocations are not
+    counted, as they need the words next to each other: draw them with WordCloud.generate
+    on the text instead.
+
+    Args:
+        terms (TermFrequencies): the word frequencies
+        stopwords (Iterable[str], optional): words to leave out, ignoring case. Defaults to ().
+        normalize_plurals (bool, optional): whether to merge words ending in 's' into the word without it. Defaults to True.
+
+    Returns:
+        dict[str, int]: the count of each word, for WordCloud.generate_from_frequencies
+    """
+    stopwords = {word.lower() for word in stopwords}
+    cases: dict[str, dict[str, int]] = defaultdict(dict) # lowercased word -> count of each way it is written
+    for text, count in terms.most_common():
+        for word in _CLOUD_WORD.findall(text):
+            if word.lower().endswith("'s"):
+                word = word[:-2]
+            if word.isdigit() or word.lower() in stopwords:
+                continue
+            written = cases[word.lower()]
+            written[word] = written.get(word, 0) + count
+
+    if normalize_plurals:
+        for plural in list(cases):
+            if plural.endswith('s') and not plural.endswith('ss') and plural[:-1] in cases:
+                singular = cases[plural[:-1]]
+                for word, count in cases.pop(plural).items():
+                    singular[word[:-1]] = singular.get(word[:-1], 0) + count
+
+    return {max(written.items(), key=lambda item: item[1])[0]: sum(written.values()) for written in cases.values()}
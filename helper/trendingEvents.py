@@ -0,0 +1,172 @@
+from __future__ import annotations
+import re
+
+from numpy import arange
+from pandas import DataFrame, NaT, Series, Timedelta, Timestamp, concat, merge_asof, read_csv, to_datetime
+
+from .collectionFiles import NO_TRENDING_TIME, timefmt
+from .commonTools import Post
+
+# trending queries are polled every hour, so a query seen again within this time is still the same event
+TRENDING_GAP = Timedelta(hours=1)
+
+EVENT = 'trendingEvent'
+FIRST_TRENDING = 'firstTrending'
+HOURS_SINCE_TRENDING = 'trendingCollectedDifference'
+
+_WHITESPACE = re.compile(r'\s+')
+
+class TrendingEvents:
+    """
+    Timeline of trending events: the times when a query was trending, from the trending
+    queries file (static/political_queries.csv, with the entities of a trending topic on
+    each row) and the trending times in collection filenames. Times when the same query
+    was seen at most TRENDING_GAP apart are one event, which has an id, a start and an end.
+
+    The trending time in a post's filename is when it trended. Posts collected without
+    one are matched to the event of their query which started last before they were
+    collected, with one as-of join for all posts instead of a lookup per post.
+
+    For example:
+        events = TrendingEvents.from_sources('./static/political_queries.csv', df)
+        df = df.join(events.annotate(df))
+    """
+    def __init__(self, observations: DataFrame, gap: Timedelta = TRENDING_GAP) -> None:
+        """
+        Args:
+            observations (DataFrame): a query and a time it was trending on each row, as 'query' and 'time' columns
+            gap (Timedelta, optional): longest time between observations of one event. Defaults to TRENDING_GAP.
+        """
+        observations = observations[['query', 'time']].dropna()
+        observations = observations[observations['time'] != NO_TRENDING_TIME]
+        observations = observations.assign(key=observations['query'].map(queryKey), time=to_datetime(observations['time']))
+        observations = observations.sort_values(['key', 'time'], kind='stable').reset_index(drop=True)
+
+        new_query = observations['key'] != observations['key'].shift()
+        new_event = new_query | (observations['time'] - observations['time'].shift() > gap)
+        observations['event'] = new_event.cumsum() - 1
+
+        self.events = observations.groupby('event').agg(
+            query=('query', 'first'), key=('key', 'first'), start=('time', 'min'), end=('time', 'max'), observations=('time', 'size'),
+        )
+        self.gap = gap
+
+    @classmethod
+    def from_sources(cls, queries_file: str = None, collections: DataFrame = None, gap: Timedelta = TRENDING_GAP) -> TrendingEvents:
+        """
+        Builds the timeline from the trending queries file and the trending times of collections.
+
+        Args:
+            queries_file (str, optional): the trending queries file. Defaults to None, for none.
+            collections (DataFrame, optional): posts or collections with searchTerm and trendingTime columns,
+                                               as read by read_collection_csv. Defaults to None, for none.
+            gap (Timedelta, optional): longest time between observations of one event. Defaults to TRENDING_GAP.
+
+        Returns:
+            TrendingEvents: the timeline
+        """
+        observations = [DataFrame({'query': Series(dtype=object), 'time': Series(dtype='datetime64[ns]')})]
+        if queries_file is not None:
+            observations.append(readTrendingQueries(queries_file))
+        if collections is not None:
+            trending = collections[['searchTerm', 'trendingTime']].drop_duplicates()
+            observations.append(DataFrame({'query': trending['searchTerm'].astype(object), 'time': to_datetime(trending['trendingTime'])}))
+        return cls(concat(observations, ignore_index=True), gap)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def match(self, df: DataFrame, query: str = 'searchTerm', at: str = 'collectedTime') -> DataFrame:
+        """
+        Finds the event each post was collected for: the last event of its query which
+        started at or before it was collected.
+
+        Args:
+            df (DataFrame): the posts
+            query (str, optional): the column of queries. Defaults to 'searchTerm'.
+            at (str, optional): the column of collection times. Defaults to 'collectedTime'.
+
+        Returns:
+            DataFrame: EVENT (the event id, missing if none) and 'trendingStart' (when it started) of each post. Keeps the index of df.
+        """
+        posts = DataFrame({'key': df[query].astype(object).map(queryKey).to_numpy(), 'at': to_datetime(df[at]).to_numpy(), 'row': arange(len(df))})
+        posts = posts[posts['at'].notna()].sort_values('at', kind='stable')
+        events = self.events.reset_index()[['event', 'key', 'start']].sort_values('start', kind='stable')
+        events['start'] = events['start'].astype(posts['at'].dtype)
+
+        matched = merge_asof(posts, events, left_on='at', right_on='start', by='key', direction='backward')
+        matched = matched.set_index('row').reindex(arange(len(df)))
+        return DataFrame({EVENT: matched['event'].astype('Int32').array, 'trendingStart': matched['start'].to_numpy()}, index=df.index)
+
+    def annotate(self, df: DataFrame, first_by: str = Post.URL, query: str = 'searchTerm', at: str = 'collectedTime',
+                 trending: str = 'trendingTime') -> DataFrame:
+        """
+        Gets the trending columns of every post at once:
+         - EVENT: the event the post trended in: the event with its trending time, or
+           for posts without one, the event it was collected for, from match
+         - FIRST_TRENDING: the earliest trending time of every post with the same first_by
+           value, e.g. when a video first trended under any query. Posts without a trending
+           time use the start of the event they were collected for, and posts without
+           either count as NO_TRENDING_TIME
+         - HOURS_SINCE_TRENDING: hours from FIRST_TRENDING to when the post was collected
+
+        Args:
+            df (DataFrame): the posts
+            first_by (str, optional): the column of what is first trending, Defaults to Post.URL.
+            query (str, optional): the column of queries. Defaults to 'searchTerm'.
+            at (str, optional): the column of collection times. Defaults to 'collectedTime'.
+            trending (str, optional): the column of trending times from the filenames, NO_TRENDING_TIME
+                                      when there was none. Defaults to 'trendingTime'.
+
+        Returns:
+            DataFrame: the EVENT, FIRST_TRENDING and HOURS_SINCE_TRENDING columns. Keeps the index of df.
+        """
+        if trending in df.columns:
+            trending_times = Series(to_datetime(df[trending]).to_numpy(), index=df.index)
+            trending_times = trending_times.where(trending_times != Timestamp(NO_TRENDING_TIME))
+        else:
+            trending_times = Series(NaT, index=df.index, dtype='datetime64[ns]')
+        # a trending time is in the event it was seen in, the collection time only comes after one
+        times = trending_times.fillna(Series(to_datetime(df[at]).to_numpy(), index=df.index))
+        matched = self.match(DataFrame({query: df[query], at: times}, index=df.index), query=query, at=at)
+        starts = trending_times.fillna(matched['trendingStart']).fillna(Timestamp(NO_TRENDING_TIME))
+        first_trending = starts.groupby(df[first_by].to_numpy(), dropna=False).transform('min')
+        hours = (to_datetime(df[at]) - first_trending) / Timedelta(hours=1)
+        return DataFrame({
+            EVENT: matched[EVENT],
+            FIRST_TRENDING: first_trending,
+            HOURS_SINCE_TRENDING: hours.astype('float32'),
+        }, index=df.index)
+
+def readTrendingQueries(filepath: str) -> DataFrame:
+    """
+    Reads the trending queries file, with a time ('MM-DD-HH', in 2024) and a trending topic
+    on each row. A topic is a comma-separated list of entities, like
+    "Joe Biden, Karine Jean-Pierre, White House Press Secretary", and each of them was
+    trending as a query of its own.
+
+    Args:
+        filepath (str): the filepath to read
+
+    Returns:
+        DataFrame: 'query' and 'time' columns, with one entity per row and times as datetimes
+    """
+    topics = read_csv(filepath, dtype=str, keep_default_na=False)
+    times = to_datetime('2024-' + topics['time'], format='%Y-' + timefmt, errors='coerce')
+    queries = DataFrame({'query': topics['query'].astype(object).str.split(','), 'time': times}).explode('query')
+    queries['query'] = queries['query'].str.strip().astype(object)
+    return queries[queries['query'] != ''].reset_index(drop=True)
+
+def queryKey(query: str) -> str:
+    """
+    Writes a query the same way wherever it comes from: case and whitespace are ignored.
+
+    Args:
+        query (str): the query
+
+    Returns:
+        str: the query, casefolded, with whitespace collapsed and trimmed
+    """
+    if not isinstance(query, str):
+        return ''
+    return _WHITESPACE.sub(' ', query).strip().casefold()
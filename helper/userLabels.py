@@ -0,0 +1,139 @@
+from __future__ import annotations
+import os
+import re
+import unicodedata
+from typing import Any
+
+from numpy import asarray, full
+from pandas import Index, Series, factorize, read_csv
+
+INDIVIDUAL = 'IND'
+ORGANIZATION = 'ORG'
+
+_WHITESPACE = re.compile(r'\s+')
+
+class UserLabels:
+    """
+    Index of the category of each labelled account, read once from a labels file with
+    user_name and cat columns. Categories are collapsed to INDIVIDUAL (any cat containing
+    'IND') or ORGANIZATION, and the last label of a name wins.
+
+    Names are normalized with normalizeUserName and dictionary-encoded: each labelled
+    name has an integer code, and labels are stored per code. Looking up one name is a
+    dictionary lookup, and labelling a column of names only normalizes and looks up each
+    distinct name once, so it does not depend on the size of the labels file.
+
+    For example:
+        labels = UserLabels('./labelledUsers.csv')
+        labels.get('The Western Journal') # 'ORG'
+        df['cat'] = labels.label(df['user name'])
+    """
+    CATEGORIES = (INDIVIDUAL, ORGANIZATION)
+
+    def __init__(self, filepath: str) -> None:
+        """
+        Args:
+            filepath (str): the labels file to read
+        """
+        self.filepath = filepath
+        stat = os.stat(filepath)
+        self._signature = (stat.st_size, stat.st_mtime_ns)
+
+        labels = read_csv(filepath, dtype=str, keep_default_na=False)
+        names = labels['user_name'].map(normalizeUserName)
+        is_individual = labels['cat'].str.contains(INDIVIDUAL, regex=False).to_numpy()
+        label_codes = Series((~is_individual).astype('int8'), index=names) # position in CATEGORIES
+        label_codes = label_codes[names.to_numpy() != ''] # names which are missing are never labelled
+        label_codes = label_codes[~label_codes.index.duplicated(keep='last')]
+
+        self._names = Index(label_codes.index) # code -> normalized name
+        self._codes = {name: code for code, name in enumerate(self._names)}
+        self._label_codes = label_codes.to_numpy()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return normalizeUserName(name) in self._codes
+
+    def isStale(self) -> bool:
+        """
+        Tells whether the labels file changed since it was read.
+
+        Returns:
+            bool: True iff the file's size or modification time changed
+        """
+        try:
+            stat = os.stat(self.filepath)
+        except OSError:
+            return True
+        return self._signature != (stat.st_size, stat.st_mtime_ns)
+
+    def code(self, name: str) -> int | None:
+        """
+        Gets the integer code of a labelled name.
+
+        Args:
+            name (str): the user name, normalized or not
+
+        Returns:
+            int | None: the code of the name, or None if it is not labelled
+        """
+        return self._codes.get(normalizeUserName(name))
+
+    def get(self, name: str, default: Any = None) -> str | Any:
+        """
+        Gets the category of a user.
+
+        Args:
+            name (str): the user name, normalized or not
+            default (Any, optional): what to return if the user is not labelled. Defaults to None.
+
+        Returns:
+            str | Any: INDIVIDUAL or ORGANIZATION, or default if the user is not labelled
+        """
+        code = self.code(name)
+        if code is None:
+            return default
+        return self.CATEGORIES[self._label_codes[code]]
+
+    def __getitem__(self, name: str) -> str:
+        category = self.get(name)
+        if category is None:
+            raise KeyError(f"user {name!r} is not labelled")
+        return category
+
+    def label(self, names: Series) -> Series:
+        """
+        Gets the category of every user in a column at once. Names are factorized, each
+        distinct name is normalized once, and categories are joined on the integer codes.
+
+        Args:
+            names (Series): the user names
+
+        Returns:
+            Series: the categories, as objects, None where a user is not labelled. Keeps the index of names.
+        """
+        post_codes, uniques = factorize(names.to_numpy(dtype=object))
+        codes = self._names.get_indexer([normalizeUserName(name) for name in uniques])
+
+        labelled = codes != -1
+        unique_labels = full(len(uniques) + 1, None, dtype=object) # missing names have code -1
+        unique_labels[:-1][labelled] = asarray(self.CATEGORIES, dtype=object)[self._label_codes[codes[labelled]]]
+        return Series(unique_labels[post_codes], index=names.index, dtype=object)
+
+def normalizeUserName(name: Any) -> str:
+    """
+    Normalizes a user name so that the same account is written the same way: unicode is
+    normalized (NFKC), and whitespace is collapsed and trimmed. Case is kept, since
+    accounts like 'BURDEN' and 'Burden' are labelled differently. Missing names become ''.
+
+    Args:
+        name (Any): the user name
+
+    Returns:
+        str: the normalized name
+    """
+    if not isinstance(name, str):
+        return ''
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFKC', name)).strip()
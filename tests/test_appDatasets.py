@@ -0,0 +1,143 @@
+import importlib.util
+import os
+import pickle
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+import app
+import helper
+from helper.syntheticData import writeCollections
+
+QUERIES = ['Trump assassination', 'Trump rally', 'Menendez Senator', 'Paris Olympics'] # the last is not approved
+# datasets drawn with libraries the dashboard only needs for some sections
+PLOTTED = {'trump word cloud': 'wordcloud'}
+# steps which the dataset graph memoizes once per version of the input files
+GRAPH_STEPS = [app.getD, app.getAllTrump, app.enforceSchema, app.cleanData1, app.pickOneDataframe, app.addMoreData, app.buildCube, app.addFreshness]
+
+@pytest.fixture(scope='module')
+def collections(tmp_path_factory):
+    data = tmp_path_factory.mktemp('data')
+    trump = tmp_path_factory.mktemp('trump')
+    writeCollections(str(data), 1500, seed=19, queries=QUERIES[1:], collections_per_query=2)
+    writeCollections(str(trump), 500, seed=20, queries=QUERIES[:1], collections_per_query=2)
+    return str(data), str(trump)
+
+@pytest.fixture
+def dashboard(collections, tmp_path, monkeypatch):
+    data, trump = collections
+    monkeypatch.setattr(app, 'DATA_DIRECTORY', data)
+    monkeypatch.setattr(app, 'TRUMP_DIRECTORY', trump)
+    monkeypatch.setattr(app, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(app, 'INGEST_PROCESSES', 1)
+    monkeypatch.setattr(app, 'CATALOG_MAX_AGE', 0) # tests change the files within a rerun's time
+    reads = []
+    getPosts = app.getPosts
+    def countedGetPosts():
+        reads.append(1)
+        return getPosts()
+    monkeypatch.setattr(app, 'getPosts', countedGetPosts)
+    return reads
+
+def _shown(name: str) -> bool:
+    return name not in PLOTTED or importlib.util.find_spec(PLOTTED[name]) is not None
+
+@pytest.mark.parametrize('step', GRAPH_STEPS, ids=lambda step: step.__name__)
+def test_graph_steps_are_not_cached_by_streamlit_too(step):
+    assert not hasattr(step, 'clear') # what st.cache_data adds
+    assert hasattr(app.renderWordCloud, 'clear')
+
+def test_every_dataset_is_computed_once_per_version(dashboard):
+    store = {}
+    graph = app.declareDatasets(store)
+    version = app.dataVersion()
+    datasets = {name: graph.get(name, version) for name in graph if _shown(name)}
+    assert dashboard == [1]
+    assert all(graph.get(name, version) is dataset for name, dataset in datasets.items())
+    assert {name for name, (stored_version, _) in store.items() if stored_version == version} == set(datasets)
+
+    # a graph declared again on the next rerun keeps them
+    again = app.declareDatasets(store)
+    assert again.get('posts', version) is datasets['posts']
+    assert dashboard == [1]
+
+def test_posts_are_the_approved_queries_of_both_directories(dashboard):
+    graph = app.declareDatasets({})
+    version = app.dataVersion()
+    posts = graph.get('posts', version)
+    assert set(posts['searchTerm']) == set(QUERIES[:3])
+    assert set(graph.get('trump posts', version)['searchTerm']) == {'Trump assassination'}
+    assert set(graph.get('one posts', version)['searchTerm']) <= set(posts['searchTerm'])
+    assert graph.get('cube', version).cells['posts'].sum() == len(posts)
+    assert posts['firstTrending'].notna().all() and posts['post identity'].notna().all()
+
+def test_changed_input_files_are_a_new_version(dashboard, collections, tmp_path):
+    data, _ = collections
+    graph = app.declareDatasets({})
+    version = app.dataVersion()
+    posts = graph.get('posts', version)
+
+    added = writeCollections(str(tmp_path / 'more'), 100, seed=21, queries=['Trump shooting'], collections_per_query=1)
+    moved = [os.path.join(data, os.path.basename(filepath)) for filepath in added]
+    try:
+        for source, destination in zip(added, moved):
+            os.replace(source, destination)
+        new_version = app.dataVersion()
+        assert new_version != version
+        assert 'Trump shooting' in set(graph.get('posts', new_version)['searchTerm'])
+        assert dashboard == [1, 1]
+        assert graph.get('posts', version) is not posts # only the latest version is kept
+    finally:
+        for filepath in moved:
+            os.remove(filepath)
+
+def test_charts_are_kept_as_the_frames_they_are_drawn_from(dashboard):
+    graph = app.declareDatasets({})
+    version = app.dataVersion()
+    assert list(graph.get('trump box plot', version).columns) == ['platform', 'likes']
+    assert list(graph.get('posts over time', version).columns) == ['url', 'collectedTime', 'rank']
+    datasets = {name: graph.get(name, version) for name in graph if _shown(name) and name not in app.UNSAVED_DATASETS}
+    pickle.dumps(datasets) # what a snapshot holds
+
+def test_dataVersion_is_the_same_in_every_process(dashboard, collections):
+    data, trump = collections
+    script = f"import app; app.DATA_DIRECTORY, app.TRUMP_DIRECTORY = {data!r}, {trump!r}; print(app.dataVersion())"
+    versions = {subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout.split()[-1] for _ in range(2)}
+    assert versions == {app.dataVersion()}
+
+@pytest.fixture
+def warnings(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'SNAPSHOT_FILE', str(tmp_path / 'snapshot.pkl'))
+    shown = []
+    monkeypatch.setattr(app.st, 'warning', shown.append)
+    return shown
+
+def test_snapshots_of_the_input_files_are_used(dashboard, warnings):
+    helper.Snapshot({'posts': 'from the snapshot'}, app.dataVersion()).write(app.SNAPSHOT_FILE)
+    store, version = app.datasetSource()
+    assert version == app.dataVersion()
+    assert app.declareDatasets(store).get('posts', version) == 'from the snapshot'
+    assert warnings == [] and dashboard == []
+
+def test_snapshots_of_other_input_files_are_not_used(dashboard, warnings):
+    helper.Snapshot({'posts': 'from the snapshot'}, 'other files').write(app.SNAPSHOT_FILE)
+    store, version = app.datasetSource()
+    assert version == app.dataVersion()
+    assert isinstance(app.declareDatasets(store).get('posts', version), pd.DataFrame)
+    assert dashboard == [1] and len(warnings) == 1
+
+def test_a_rerun_lists_each_directory_once(dashboard, collections, warnings, monkeypatch):
+    listed = []
+    scandir = os.scandir
+    def countedScandir(path):
+        listed.append(path)
+        return scandir(path)
+    monkeypatch.setattr(os, 'scandir', countedScandir)
+    monkeypatch.setattr(app, 'CATALOG_MAX_AGE', 60)
+    app.collectionCatalog.clear() # catalogs which were never refreshed
+
+    store, version = app.datasetSource()
+    app.declareDatasets(store).get('posts', version)
+    assert sorted(path for path in listed if path in collections) == sorted(collections)
@@ -0,0 +1,89 @@
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+import pytest
+from pandas import Series
+
+from helper.collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE
+from helper.commonTools import getCanonicalUrl, getCanonicalUrls, isLoginUrl, read_collection_csv
+
+def _baselineCleanFacebookUrl(url: str) -> str:
+    """
+    clean_fb_url, which app.py used for Facebook urls before they were canonicalized when read.
+    """
+    if 'watch' in url:
+        return url
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query)
+    clean_query_params = {k: v for k, v in query_params.items() if k == 'story_fbid'}
+    return urlunparse(parsed_url._replace(query=urlencode(clean_query_params, doseq=True)))
+
+FACEBOOK_URLS = [
+    'https://www.facebook.com/permalink.php?story_fbid=pfbid02abc&id=100064&__cft__[0]=AZX&__tn__=%2CO%2CP-R',
+    'https://www.facebook.com/permalink.php?id=100064&story_fbid=1000000000022971',
+    'https://www.facebook.com/watch/?v=1234567890&ref=sharing',
+    'https://www.facebook.com/CNN/posts/pfbid0xyz?__cft__[0]=AZX',
+    'https://www.facebook.com/CNN/videos/987654321/',
+    'https://www.facebook.com/reel/1122334455?s=yWDuG2&fs=e',
+    'https://www.facebook.com/groups/123/permalink/456/?mibextid=abc',
+]
+
+@pytest.mark.parametrize('url', FACEBOOK_URLS)
+def test_facebook_urls_are_cleaned_like_they_used_to_be(url):
+    assert getCanonicalUrl(url, FACEBOOK)[0] == _baselineCleanFacebookUrl(url)
+
+@pytest.mark.parametrize('value, platform, expected', [
+    (FACEBOOK_URLS[0], FACEBOOK, ('https://www.facebook.com/permalink.php?story_fbid=pfbid02abc', 'pfbid02abc')),
+    (FACEBOOK_URLS[2], FACEBOOK, (FACEBOOK_URLS[2], '1234567890')),
+    (FACEBOOK_URLS[4], FACEBOOK, (FACEBOOK_URLS[4], '987654321')),
+    ('C9abc_-1', INSTAGRAM, ('https://www.instagram.com/p/C9abc_-1', 'C9abc_-1')),
+    ('https://www.instagram.com/someone/reel/C9abc/?igsh=x', INSTAGRAM, ('https://www.instagram.com/p/C9abc', 'C9abc')),
+    ('7390000000000000001', TIKTOK, ('https://www.tiktok.com/@/video/7390000000000000001', '7390000000000000001')),
+    ('https://www.tiktok.com/@someone/video/7390000000000000001?lang=en', TIKTOK,
+     ('https://www.tiktok.com/@/video/7390000000000000001', '7390000000000000001')),
+    ('could not collect', TIKTOK, ('https://www.tiktok.com/@/video/could not collect', None)),
+    ('https://youtu.be/dQw4w9WgXcQ?t=1', YOUTUBE, ('https://www.youtube.com/watch?v=dQw4w9WgXcQ', 'dQw4w9WgXcQ')),
+    ('https://www.youtube.com/shorts/dQw4w9WgXcQ', YOUTUBE, ('https://www.youtube.com/watch?v=dQw4w9WgXcQ', 'dQw4w9WgXcQ')),
+    ('Some video title', YOUTUBE, ('Some video title', None)),
+    (None, YOUTUBE, (None, None)),
+    (float('nan'), FACEBOOK, (None, None)),
+])
+def test_getCanonicalUrl(value, platform, expected):
+    assert getCanonicalUrl(value, platform) == expected
+
+LOGIN_URLS = [
+    'https://www.facebook.com/login/?next=https%3A%2F%2Fwww.facebook.com%2Fpermalink.php%3Fstory_fbid%3D123%26id%3D4',
+    'https://www.facebook.com/login/?next=https://www.facebook.com/permalink.php?story_fbid=123&id=4',
+    'https://www.facebook.com/login/?next=https://www.facebook.com/watch/?v=123',
+    'https://www.facebook.com/login.php?next=https://www.facebook.com/CNN/posts/123',
+]
+
+@pytest.mark.parametrize('url', LOGIN_URLS)
+def test_login_urls_have_no_post_id(url):
+    canonical_url, post_id = getCanonicalUrl(url, FACEBOOK)
+    assert post_id is None
+    assert isLoginUrl(url) and isLoginUrl(canonical_url)
+
+@pytest.mark.parametrize('url', FACEBOOK_URLS + ['https://www.facebook.com/CNN/posts/login-update'])
+def test_post_urls_are_not_login_urls(url):
+    assert not isLoginUrl(url)
+
+def test_login_rows_can_be_filtered_once_urls_are_canonical(tmp_path):
+    filepath = tmp_path / 'Trump rally_facebook_trending@07-16-13_collected@07-16-18.csv'
+    rows = [FACEBOOK_URLS[0], LOGIN_URLS[0], LOGIN_URLS[1], FACEBOOK_URLS[2]]
+    filepath.write_text('url,likes\n' + ''.join(f'"{url}",{i}\n' for i, url in enumerate(rows)))
+
+    df = read_collection_csv(str(filepath))
+    login = df['url'].str.contains('/login/', regex=False) # how app.py drops login rows
+    assert login.tolist() == [False, True, True, False]
+    assert df.loc[login, 'post id'].isna().all()
+
+def test_getCanonicalUrls_matches_getCanonicalUrl():
+    values = FACEBOOK_URLS + LOGIN_URLS + [None] + FACEBOOK_URLS[:2]
+    platforms = [FACEBOOK] * len(values)
+    values += ['C9abc', '7390000000000000001', 'https://youtu.be/dQw4w9WgXcQ']
+    platforms += [INSTAGRAM, TIKTOK, YOUTUBE]
+
+    urls = getCanonicalUrls(Series(values, index=range(5, 5 + len(values))), Series(platforms))
+    assert list(urls.index) == list(range(5, 5 + len(values)))
+    assert list(zip(urls['url'], urls['post id'])) == [getCanonicalUrl(value, platform) for value, platform in zip(values, platforms)]
+    assert getCanonicalUrls(values[:3], FACEBOOK)['url'].tolist() == [getCanonicalUrl(value, FACEBOOK)[0] for value in values[:3]]
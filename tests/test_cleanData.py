@@ -0,0 +1,24 @@
+import app
+import helper
+from helper.commonTools import getCanonicalUrl, read_collection_csv
+
+FACEBOOK_URLS = [
+    'https://www.facebook.com/permalink.php?story_fbid=pfbid02abc&id=100064&__cft__[0]=AZX&__tn__=%2CO%2CP-R',
+    'https://www.facebook.com/login/?next=https%3A%2F%2Fwww.facebook.com%2Fpermalink.php%3Fstory_fbid%3D123%26id%3D4',
+    'https://www.facebook.com/watch/?v=1234567890&ref=sharing',
+    'https://www.facebook.com/CNN/posts/pfbid0xyz?__cft__[0]=AZX',
+]
+
+def test_cleanData1_keeps_the_canonical_urls_it_is_read_with(tmp_path, monkeypatch):
+    filepath = tmp_path / 'Trump rally_facebook_trending@07-16-13_collected@07-16-18.csv'
+    filepath.write_text('id,url,likes\n' + ''.join(f'1,"{url}",5\n' for url in FACEBOOK_URLS))
+    df = read_collection_csv(str(filepath))
+
+    def canonicalizedAgain(*args, **kwargs):
+        raise AssertionError('urls are canonical once they are read')
+    monkeypatch.setattr(helper, 'getCanonicalUrls', canonicalizedAgain)
+    cleaned = app.cleanData1(df)
+
+    expected = [getCanonicalUrl(url, 'facebook') for url in FACEBOOK_URLS if '/login/' not in url]
+    assert list(zip(cleaned['url'], cleaned['post id'])) == expected
+    assert cleaned['post identity'].tolist() == helper.getPostIdentities(cleaned['platform'], cleaned['post id'], cleaned['url']).tolist()
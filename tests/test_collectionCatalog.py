@@ -0,0 +1,107 @@
+import json
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from helper.collectionCatalog import CollectionCatalog
+from helper.collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE, getFilesToCheck
+
+COLLECTIONS = [
+    'Trump rally_tiktok_trending@07-13-18_collected@07-13-20.csv',
+    'Trump rally_youtube_trending@07-13-18_collected@07-14-02.csv',
+    'Trump rally_youtube-intermediate_trending@07-13-18_collected@07-14-02.csv',
+    'Trump rally_facebook_collected@07-12-09.csv', # from before trending times were recorded
+    'Trump shooting_Instagram1_trending@07-14-01_collected@07-14-03.csv',
+    'nested/Trump shooting_tiktok_trending@07-14-01_collected@07-15-10.csv',
+    'nested/deeper/Menendez Senator_youtube_trending@07-16-00_collected@07-16-06.csv',
+    'nested/intermediate/Menendez Senator_facebook_trending@07-16-00_collected@07-16-07.csv',
+]
+NOT_COLLECTIONS = ['youtube.csv', 'notes_tiktok.csv', 'Trump rally_tiktok_trending@07-13-18_collected@07-13-20.txt']
+
+@pytest.fixture
+def directory(tmp_path):
+    for name in COLLECTIONS + NOT_COLLECTIONS:
+        path = tmp_path / 'data' / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('url\n')
+    return str(tmp_path / 'data')
+
+def _catalog(directory: str, catalog_file: str = None) -> CollectionCatalog:
+    catalog = CollectionCatalog(directory, catalog_file)
+    catalog.refresh()
+    return catalog
+
+def _collections(filepaths: list[str]) -> list[str]:
+    # the files which are collections, which are the only ones in the catalog
+    return [path for path in filepaths if os.path.basename(path) not in NOT_COLLECTIONS]
+
+@pytest.mark.parametrize('platform', ['all', FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE, 'YouTube'])
+def test_select_gives_the_files_getFilesToCheck_gives(directory, platform):
+    catalog = _catalog(directory)
+    assert catalog.select(platform) == _collections(getFilesToCheck(directory, platform))
+    if platform != 'all':
+        assert catalog.select(platform, include_intermediate=True) == _collections(getFilesToCheck(directory, platform, include_intermediate=True))
+
+def test_all_platforms_include_intermediate_files(directory):
+    selected = _catalog(directory).select()
+    assert len(selected) == len(COLLECTIONS)
+    assert os.path.join(directory, COLLECTIONS[2]) in selected
+    assert os.path.join(directory, COLLECTIONS[2]) not in _catalog(directory).select(YOUTUBE)
+
+def test_select_by_query_and_time(directory):
+    catalog = _catalog(directory)
+    names = lambda paths: [os.path.relpath(path, directory) for path in paths]
+    assert names(catalog.select(queries=['Trump shooting'])) == [COLLECTIONS[4], COLLECTIONS[5]]
+    assert names(catalog.select(TIKTOK, queries={'Trump rally', 'Trump shooting'})) == [COLLECTIONS[0], COLLECTIONS[5]]
+    assert names(catalog.select(start=datetime(2024, 7, 14, 2), end=datetime(2024, 7, 15, 10))) == [COLLECTIONS[2], COLLECTIONS[1], COLLECTIONS[4]]
+    assert names(catalog.select(start=datetime(2024, 7, 16), by='trending_time')) == [COLLECTIONS[6], COLLECTIONS[7]]
+    assert catalog.select(queries=[]) == []
+
+def test_refresh_parses_new_names_and_drops_removed_files(directory, tmp_path):
+    catalog_file = str(tmp_path / 'cache' / 'catalog.json')
+    catalog = _catalog(directory, catalog_file)
+    assert len(catalog) == len(COLLECTIONS)
+    assert not catalog.refresh()
+
+    os.remove(os.path.join(directory, COLLECTIONS[0]))
+    added = os.path.join(directory, 'Trump rally_tiktok_trending@07-17-18_collected@07-17-20.csv')
+    with open(added, 'w') as file:
+        file.write('url\n')
+    assert catalog.refresh()
+    assert os.path.join(directory, COLLECTIONS[0]) not in catalog.select()
+    assert added in catalog.select(TIKTOK)
+
+    reloaded = CollectionCatalog(directory, catalog_file)
+    assert reloaded.entries() == catalog.entries()
+    assert not reloaded.refresh()
+
+def test_recent_refreshes_are_not_listed_again(directory, monkeypatch):
+    catalog = _catalog(directory)
+    added = os.path.join(directory, 'Trump rally_tiktok_trending@07-17-18_collected@07-17-21.csv')
+    with open(added, 'w') as file:
+        file.write('url\n')
+    assert not catalog.refresh(max_age=60) # refreshed just now, when it was made
+    assert added not in catalog.select()
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 61)
+    assert catalog.refresh(max_age=60)
+    assert added in catalog.select()
+    assert not catalog.refresh(max_age=60)
+
+    os.remove(added)
+    assert catalog.refresh() # always listed without a max_age
+
+def test_catalogs_of_another_directory_or_version_are_not_used(directory, tmp_path):
+    catalog_file = str(tmp_path / 'catalog.json')
+    _catalog(directory, catalog_file)
+    assert len(CollectionCatalog(str(tmp_path), catalog_file)) == 0
+
+    with open(catalog_file) as file:
+        catalog = json.load(file)
+    catalog['version'] = -1
+    with open(catalog_file, 'w') as file:
+        json.dump(catalog, file)
+    assert len(CollectionCatalog(directory, catalog_file)) == 0
@@ -0,0 +1,115 @@
+import csv
+import os
+
+import pytest
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+import helper.commonTools as commonTools
+from helper.collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE
+from helper.commonTools import Post, PostReader, read_post_frame
+from helper.syntheticData import writeCollections
+
+PLATFORMS = [FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE]
+
+# values the readers convert the most differently: signs, decimals, abbreviations, plays,
+# ints too big for int64, unicode digits and whitespace, and things which only look like counts
+EDGE_VALUES = [
+    '-5', '+3', '1.5', '-1.25K', '2.5M', '.5k', '12K plays', '1 play', '1,234', ' 42 ', '7 K',
+    '４２', '١٢', '9223372036854775807', '9223372036854775808', '99999999999999999999',
+    '1e5', '0x10', '3m ago', '.', '-', 'k', 'plays', '12 34', 'Saturday, July 13, 2024 at 06:37 PM',
+    '2024-07-13 18:37:00', '2024-07-13T18:37:00', '2024-02-30 10:00:00', 'text 123', '',
+]
+
+def _baselineFrame(filepath: str) -> DataFrame:
+    return DataFrame([post.to_dict() for post in PostReader(filepath)])
+
+def _writeEdgeFile(directory: str, platform: str, rows: int) -> str:
+    """
+    Writes a synthetic file of a platform, with edge values written over some of its values
+    of every column, and returns its filepath.
+    """
+    filepath = next(path for path in writeCollections(str(directory), 60, seed=1) if f'_{platform}_' in path)
+    with open(filepath, newline='') as file:
+        header, *body = list(csv.reader(file))
+    body = (body * (rows // len(body) + 1))[:rows]
+    placeholders = sorted(Post.PLACEHOLDERS[platform])
+    values = EDGE_VALUES + placeholders
+    for i, row in enumerate(body):
+        for column in range(len(row)):
+            if (i + column) % 3 == 0:
+                row[column] = values[(i * 7 + column) % len(values)]
+    # a column of counts and placeholders only
+    for i, row in enumerate(body):
+        row[0] = placeholders[0] if i % 5 == 0 else str(i)
+
+    os.makedirs(os.path.join(directory, 'edge'), exist_ok=True)
+    edge_filepath = os.path.join(directory, 'edge', os.path.basename(filepath))
+    with open(edge_filepath, 'w', newline='') as file:
+        csv.writer(file).writerows([header] + body)
+    return edge_filepath
+
+def _withoutPyarrow(filepath: str):
+    raise ImportError('pyarrow')
+
+@pytest.fixture(params=['pyarrow', 'pandas'])
+def readPath(request, monkeypatch):
+    """
+    Makes read_post_frame read files with pyarrow's parser, or with pandas' parser it
+    falls back to without pyarrow.
+    """
+    if request.param == 'pandas':
+        monkeypatch.setattr(commonTools, '_readRawCsvWithPyarrow', _withoutPyarrow)
+    return request.param
+
+def test_read_post_frame_matches_post_reader_on_synthetic_files(tmp_path, readPath):
+    for filepath in writeCollections(str(tmp_path), 400, seed=3):
+        assert_frame_equal(read_post_frame(filepath), _baselineFrame(filepath))
+
+@pytest.mark.parametrize('platform', PLATFORMS)
+def test_read_post_frame_matches_post_reader_on_edge_values(tmp_path, readPath, platform):
+    filepath = _writeEdgeFile(tmp_path, platform, 300)
+    assert_frame_equal(read_post_frame(filepath, platform), _baselineFrame(filepath))
+
+def test_read_post_frame_reads_an_empty_file(tmp_path):
+    filepath = tmp_path / 'Trump rally_youtube_trending@07-16-13_collected@07-16-18.csv'
+    filepath.write_text('url,title\n')
+    assert read_post_frame(str(filepath)).empty
+
+class _RecordingPool:
+    """
+    Stands in for ProcessPoolExecutor, reading in this process and recording its size.
+    """
+    sizes = []
+
+    def __init__(self, max_workers: int) -> None:
+        self.sizes.append(max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def map(self, function, items):
+        return map(function, items)
+
+@pytest.fixture
+def recordingPool(monkeypatch):
+    _RecordingPool.sizes = []
+    monkeypatch.setattr(commonTools, 'ProcessPoolExecutor', _RecordingPool)
+    return _RecordingPool
+
+def test_readFilesInParallel_reads_few_files_serially(recordingPool):
+    filepaths = [f'{i}.csv' for i in range(commonTools.PARALLEL_FROM_FILES - 1)]
+    assert commonTools.readFilesInParallel(str.upper, filepaths) == [filepath.upper() for filepath in filepaths]
+    assert recordingPool.sizes == []
+
+def test_readFilesInParallel_bounds_its_default_pool(recordingPool, monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 64)
+    filepaths = [f'{i}.csv' for i in range(100)]
+    assert commonTools.readFilesInParallel(str.upper, filepaths) == [filepath.upper() for filepath in filepaths]
+    assert recordingPool.sizes == [commonTools.DEFAULT_MAX_PROCESSES]
+
+    commonTools.readFilesInParallel(str.upper, filepaths, processes=6)
+    assert recordingPool.sizes[-1] == 6
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+from pandas import NA, Series
+
+import helper.commonTools as commonTools
+from helper.commonTools import getNum, getNums
+
+def _baselineGetNum(num: str) -> int:
+    """
+    getNum as it was before it had a grammar, for the counts whose value must not change.
+    """
+    num = num.replace(',', '').lower()
+    num = num.replace('play', '')
+    if 'k' in num:
+        factor = 1_000
+        num = num.replace('k', '')
+    elif 'm' in num:
+        factor = 1_000_000
+        num = num.replace('m', '')
+    else:
+        factor = 1
+    if len(num.split('.')) > 1:
+        whole, decimal = num.split('.')
+        num = whole + decimal
+        factor //= 10 ** len(decimal)
+    return int(num) * factor
+
+UNCHANGED = ['0', '7', '42', '1,234', '12,345,678', '1K', '1k', '12K', '1.2K', '1.25k', '3M', '3.5M', '1.234m',
+             '0.5K', '100 play', ' 42 ', '+3', '-5', '9223372036854775807']
+
+@pytest.mark.parametrize('num', UNCHANGED)
+def test_getNum_reads_counts_like_it_used_to(num):
+    assert getNum(num) == _baselineGetNum(num)
+
+@pytest.mark.parametrize('num, expected', [
+    # decimals are truncated where the abbreviation does not cover them, instead of giving 0
+    ('1.5', 1),
+    ('2.99', 2),
+    ('1.2345K', 1234),
+    ('1.2345678M', 1234567),
+    ('-1.5K', -1500),
+    ('+2.5m', 2500000),
+    ('.5k', 500),
+    ('5.', 5),
+    # a trailing 'play' or 'plays' is ignored, with or without an abbreviation
+    ('12K plays', 12000),
+    ('1 play', 1),
+    ('2 plays', 2),
+    ('3.4M Plays', 3400000),
+    ('99999999999999999999', 99999999999999999999),
+])
+def test_getNum_reads_signs_decimals_and_plays(num, expected):
+    assert getNum(num) == expected
+
+@pytest.mark.parametrize('num', ['', '.', '-', 'k', 'plays', '1e5', '0x10', '3m ago', '12 34', '1.2.3', '--1', '1km', 'text 123'])
+def test_getNum_rejects_strings_which_are_not_counts(num):
+    with pytest.raises(ValueError):
+        getNum(num)
+
+def test_getNums_matches_getNum():
+    nums = UNCHANGED + ['1.5', '12K plays', '3m ago', '', None, '99999999999999999999', '1K']
+    expected = []
+    for num in nums:
+        try:
+            value = getNum(num)
+            expected.append(value if -2 ** 63 <= value < 2 ** 63 else NA)
+        except (ValueError, AttributeError):
+            expected.append(NA)
+
+    parsed = getNums(Series(nums, index=range(10, 10 + len(nums))))
+    assert parsed.dtype == 'Int64'
+    assert list(parsed.index) == list(range(10, 10 + len(nums)))
+    assert [NA if value is NA else int(value) for value in parsed] == expected
+    assert getNums(Series([1, 2])).tolist() == [1, 2]
+
+def _randomCount(rng: random.Random) -> str:
+    whole = ''.join(rng.choices('0123456789', k=rng.randint(0, 21)))
+    decimal = '.' + ''.join(rng.choices('0123456789', k=rng.randint(0, 14))) if rng.random() < 0.5 else ''
+    sign = rng.choice(['', '', '-', '+'])
+    suffix = rng.choice(['', '', 'k', 'K', 'm', 'M', ' k'])
+    plays = rng.choice(['', '', ' play', ' plays', 'plays', ' Plays'])
+    count = sign + whole + decimal + suffix + plays
+    if rng.random() < 0.3 and len(whole) > 3:
+        count = count.replace(whole, f'{int(whole):,}', 1)
+    return rng.choice(['', ' ', '\t']) + count + rng.choice(['', ' ', '\n'])
+
+def test_vectorized_counts_match_parseCount():
+    rng = random.Random(0)
+    nums = [_randomCount(rng) for _ in range(20_000)] + ['１２', '1 K', '٣', '1,2,3', 'k', '']
+    expected = [commonTools._parseCount(num) for num in nums]
+
+    found, parsed = commonTools._parseDistinctCounts(Series(nums, dtype='str'))
+    assert [int(num) if is_count else None for is_count, num in zip(found, parsed)] == expected
+
+@pytest.mark.parametrize('nums', [[], ['abc', '2 days ago', ''], ['1 K', '٣']])
+def test_vectorized_counts_without_plain_counts(nums):
+    found, parsed = commonTools._parseDistinctCounts(Series(nums, dtype='str'))
+    assert [int(num) if is_count else None for is_count, num in zip(found, parsed)] == [commonTools._parseCount(num) for num in nums]
+
+def _getNumOrNone(num):
+    """
+    getNums for one value: ints are kept, strings parsed, and anything else or outside an int64 is missing.
+    """
+    value = num if type(num) is int else commonTools._parseCount(num) if isinstance(num, str) else None
+    return value if value is not None and -2 ** 63 <= value < 2 ** 63 else None
+
+@pytest.mark.parametrize('dtype', [object, 'str'])
+def test_getNums_matches_parseCount_on_random_counts(dtype):
+    rng = random.Random(1)
+    nums = [_randomCount(rng) for _ in range(10_000)] + ['text 123', '１２', 'k', '']
+    nums += rng.choices(nums, k=5_000) # repeated values
+    if dtype == 'str':
+        nums += [None]
+    else:
+        nums += [None, 12, -3, 2 ** 70, 4.5, True]
+    parsed = getNums(Series(nums, dtype=dtype))
+    assert [None if value is NA else int(value) for value in parsed] == [_getNumOrNone(num) for num in nums]
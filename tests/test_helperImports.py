@@ -0,0 +1,82 @@
+import ast
+import json
+import subprocess
+import sys
+
+import pytest
+
+import helper
+from helper.importBudget import DASHBOARD, DATA, IMPORT_BUDGETS, measureImport
+
+_LOOK_UP = """
+import json, sys, time
+start = time.perf_counter()
+import helper
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': sorted(name for name in sys.modules if '.' not in name)}}))
+"""
+
+def _lookUp(statement: str, repeat: int = 3) -> tuple[float, set[str]]:
+    # runs statement after importing helper, in new interpreters, and gives the fastest time
+    times = []
+    loaded = set()
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', _LOOK_UP.format(statement=statement)], capture_output=True, text=True, check=True)
+        measured = json.loads(result.stdout.strip().splitlines()[-1])
+        times.append(measured['seconds'])
+        loaded.update(measured['loaded'])
+    return min(times), loaded
+
+@pytest.mark.parametrize('module', list(IMPORT_BUDGETS))
+def test_imports_fit_their_budget(module):
+    budget, forbidden = IMPORT_BUDGETS[module]
+    seconds, loaded = measureImport(module)
+    assert not loaded & set(forbidden)
+    assert seconds <= budget
+
+def test_collection_tools_do_not_import_pandas_numpy_or_streamlit():
+    seconds, loaded = _lookUp('helper.getDataCollectionParameters; helper.CollectionCatalog')
+    assert not loaded & set(DATA + DASHBOARD)
+    assert seconds <= IMPORT_BUDGETS['helper.collectionCatalog'][0]
+
+def test_unknown_names_fail_without_importing_any_module():
+    seconds, loaded = _lookUp("""
+try:
+    helper.notAName
+except AttributeError:
+    pass
+else:
+    raise AssertionError('helper.notAName did not fail')
+assert not [name for name in sys.modules if name.startswith('helper.')]
+""")
+    assert not loaded & set(DATA + DASHBOARD)
+    assert seconds <= IMPORT_BUDGETS['helper'][0]
+
+def _definedNames(module_name: str) -> list[str]:
+    # public names assigned, or functions and classes defined, at the top of a module
+    with open(f'helper/{module_name}.py') as file:
+        tree = ast.parse(file.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            names.append(node.name)
+        elif isinstance(node, ast.Assign):
+            names.extend(name.id for target in node.targets for name in ast.walk(target) if isinstance(name, ast.Name))
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            names.append(node.target.id)
+    return [name for name in dict.fromkeys(names) if not name.startswith('_')]
+
+@pytest.mark.parametrize('module_name', helper._MODULES)
+def test_exports_are_the_names_each_module_defines(module_name):
+    assert helper._EXPORTS[module_name] == _definedNames(module_name)
+
+def test_names_are_the_objects_of_their_modules():
+    from helper import collectionFiles, commonTools, postCube
+    assert helper.getDataCollectionParameters is collectionFiles.getDataCollectionParameters
+    assert helper.FACEBOOK is collectionFiles.FACEBOOK # commonTools imports it too, the first module gives it
+    assert helper.PostCube is postCube.PostCube
+    assert helper.commonTools is commonTools
+    assert 'PostCube' in dir(helper) and 'commonTools' not in helper._MODULE_OF
+    with pytest.raises(AttributeError):
+        helper.Series # imported by commonTools, but not one of its names
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+
+HOURS = range(1, 480)
+
+@pytest.fixture(scope='module')
+def posts() -> pd.DataFrame:
+    rng = np.random.default_rng(9)
+    length = 4000
+    likes = rng.integers(0, 5000, length).astype('float64')
+    likes[rng.random(length) < 0.1] = np.nan
+    ages = rng.exponential(80, length)
+    ages[rng.random(length) < 0.1] = np.nan
+    ages[:50] = -rng.random(50) # uploaded after the collection time
+    ages[50:300] = np.round(ages[50:300]) # ages on the thresholds
+    return pd.DataFrame({
+        'time_difference_hours': ages,
+        'likes': likes,
+        'platform': pd.Categorical(rng.choice(['tiktok', 'youtube', 'facebook', 'instagram'], length)),
+    })
+
+def _baselineCurve(df: pd.DataFrame, hours) -> pd.DataFrame:
+    """
+    countLikesOverTime as app.py had it: a filter and a mean for every X, and the median and count of the same filter.
+    """
+    results = []
+    for i in hours:
+        freshness_by_hours_df = app.postedLessThanXHoursAgo(df, i)
+        likes = freshness_by_hours_df['likes']
+        results.append({'hours': i, 'average likes': round(likes.mean(), 2), 'median likes': likes.median(), 'posts': likes.count()})
+    return pd.DataFrame(results)
+
+def test_curve_matches_a_filter_per_hour(posts):
+    curve = app.countLikesOverTime(posts, HOURS, median=True, count=True)
+    pd.testing.assert_frame_equal(curve, _baselineCurve(posts, HOURS), check_dtype=False)
+
+def test_curves_per_platform_match_a_filter_per_hour(posts):
+    curves = app.countLikesOverTime(posts, HOURS, by='platform', median=True, count=True)
+    expected = []
+    for platform, group in posts.groupby('platform', observed=True):
+        expected.append(_baselineCurve(group, HOURS).assign(platform=platform))
+    expected = pd.concat(expected, ignore_index=True)[['platform', 'hours', 'average likes', 'median likes', 'posts']]
+    pd.testing.assert_frame_equal(curves, expected, check_dtype=False, check_categorical=False)
+
+def test_only_asked_statistics_are_given_at_any_resolution(posts):
+    hours = np.arange(0.5, 48, 0.5)
+    curve = app.countLikesOverTime(posts, hours[::-1])
+    assert list(curve.columns) == ['hours', 'average likes']
+    pd.testing.assert_frame_equal(curve, _baselineCurve(posts, hours)[['hours', 'average likes']], check_dtype=False)
+
+def test_hours_without_posts_have_no_statistics(posts):
+    curve = app.countLikesOverTime(posts[posts['time_difference_hours'] > 10], [1, 5, 20], median=True, count=True)
+    assert curve['average likes'][:2].isna().all() and curve['median likes'][:2].isna().all()
+    assert curve['posts'].tolist()[:2] == [0, 0]
+    assert app.countLikesOverTime(posts.iloc[:0], [1, 2], median=True, count=True)['posts'].tolist() == [0, 0]
+
+@pytest.mark.parametrize('length', [1, 2, 7, 100, 1001])
+def test_sliceMedians_matches_numpy(length):
+    rng = np.random.default_rng(length)
+    values = rng.integers(0, 20, length).astype('float64') # with many ties
+    starts = rng.integers(0, length, 200)
+    ends = np.minimum(starts + rng.integers(0, length + 1, 200), length)
+    medians = app.sliceMedians(values, starts, ends)
+    expected = [np.median(values[start:end]) if end > start else np.nan for start, end in zip(starts, ends)]
+    np.testing.assert_array_equal(medians, expected)
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+
+PLATFORMS = ['tiktok', 'youtube', 'facebook', 'instagram']
+QUERIES = ['Trump rally', 'Trump shooting', 'Menendez Senator']
+
+@pytest.fixture(scope='module')
+def posts() -> pd.DataFrame:
+    """
+    Posts of three collections per platform and query, with urls seen in several
+    collections, rows repeated within a collection, and rows without a url.
+    """
+    rng = np.random.default_rng(10)
+    rows = []
+    for platform in PLATFORMS:
+        for query in QUERIES:
+            trending = pd.Timestamp('2024-07-13 18:00') + pd.Timedelta(hours=int(rng.integers(0, 48)))
+            for collected in sorted(rng.choice(np.arange(0, 96, 6), 3, replace=False)):
+                collected = pd.Timestamp('2024-07-13 12:00') + pd.Timedelta(hours=int(collected))
+                for rank in range(int(rng.integers(5, 15))):
+                    url = f'https://example.com/{platform}/{rng.integers(0, 12)}'
+                    row = {'platform': platform, 'searchTerm': query, 'collectedTime': collected, 'url': url,
+                           'rank': rank, 'likes': int(rng.integers(0, 100)), 'firstTrending': trending}
+                    rows.append(row)
+                    if rng.random() < 0.2:
+                        rows.append(dict(row)) # scraped twice
+                    if rng.random() < 0.1:
+                        rows.append({**row, 'url': None})
+    df = pd.DataFrame(rows)
+    df['post identity'] = pd.factorize(df['url'])[0].astype('uint64')
+    return df.sample(frac=1, random_state=1).reset_index(drop=True)
+
+def _baselinePickOneDataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    pickOneDataframe as app.py had it before it was a join.
+    """
+    grouped_df = df.groupby(['platform', 'searchTerm', 'collectedTime'])['url'].apply(list).reset_index()
+    grouped_df = grouped_df.drop_duplicates(subset=['platform', 'searchTerm'], keep='first')
+    result_rows = []
+
+    for _, row in grouped_df.iterrows():
+        platform = row['platform']
+        searchTerm = row['searchTerm']
+        collectedTime = row['collectedTime']
+        urls = row['url']
+
+        for url in urls:
+            filtered_rows = df[
+                (df['url'] == url) &
+                (df['collectedTime'] == collectedTime) &
+                (df['platform'] == platform) &
+                (df['searchTerm'] == searchTerm)
+            ]
+            result_rows.append(filtered_rows)
+
+    result_df = pd.concat(result_rows, ignore_index=True)
+    result_df = result_df.loc[result_df.astype(str).drop_duplicates().index]
+    return result_df
+
+def _chosenRows(df: pd.DataFrame, choose) -> set[tuple]:
+    """
+    The distinct rows with a url of the collection choose picks from each platform and query's collection times.
+    """
+    rows = set()
+    for _, group in df[df['url'].notna()].groupby(['platform', 'searchTerm']):
+        collected = choose(group)
+        rows |= set(group[group['collectedTime'] == collected].itertuples(index=False, name=None))
+    return rows
+
+def _rows(df: pd.DataFrame, columns) -> set[tuple]:
+    return set(df[columns].itertuples(index=False, name=None))
+
+def test_first_collections_match_the_url_loop(posts):
+    picked = app.pickOneDataframe(posts).reset_index(drop=True)
+    expected = _baselinePickOneDataframe(posts).reset_index(drop=True)
+    pd.testing.assert_frame_equal(picked, expected[picked.columns], check_dtype=False)
+
+@pytest.mark.parametrize('policy, choose', [
+    ('first', lambda group: group['collectedTime'].min()),
+    ('latest', lambda group: group['collectedTime'].max()),
+    ('trending', lambda group: min(group['collectedTime'].unique(), key=lambda collected: abs(collected - group['firstTrending'].min()))),
+])
+def test_policies_pick_one_collection_per_platform_and_query(posts, policy, choose):
+    picked = app.pickOneDataframe(posts, policy=policy)
+    assert picked.groupby(['platform', 'searchTerm'])['collectedTime'].nunique().eq(1).all()
+    assert len(picked.groupby(['platform', 'searchTerm'])) == len(PLATFORMS) * len(QUERIES)
+    assert not picked.duplicated().any() and picked['url'].notna().all()
+    assert _rows(picked, posts.columns) == _chosenRows(posts, choose)
+
+def test_policies_differ_and_unknown_ones_are_errors(posts):
+    collected = {policy: set(app.pickOneDataframe(posts, policy=policy)['collectedTime']) for policy in ('first', 'latest')}
+    assert collected['first'] != collected['latest']
+    with pytest.raises(ValueError):
+        app.pickOneDataframe(posts, policy='random')
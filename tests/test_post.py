@@ -0,0 +1,83 @@
+from datetime import datetime
+
+import pytest
+
+import helper.commonTools as commonTools
+from helper.collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE
+from helper.commonTools import Post, User
+
+PLATFORMS = [FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE]
+
+def _tiktokPost(**info) -> Post:
+    return Post({'id': '7391234567890123456', 'diggCount': '1.2K', 'createTime': '2024-07-13T22:37:00',
+                 'author_nickname': 'The Rally News', 'playCount': '', **info}, TIKTOK)
+
+@pytest.fixture
+def countedGetNum(monkeypatch):
+    """
+    Counts the strings getNum converts.
+    """
+    calls = []
+    getNum = commonTools.getNum
+    def counting(num: str) -> int:
+        calls.append(num)
+        return getNum(num)
+    monkeypatch.setattr(commonTools, 'getNum', counting)
+    return calls
+
+@pytest.mark.parametrize('item', [_tiktokPost(), User({'full name': 'The Rally News', 'username': 'therally'}, INSTAGRAM)])
+def test_items_have_slots_and_no_dict(item):
+    assert not hasattr(item, '__dict__')
+    with pytest.raises(AttributeError):
+        item.not_a_slot = 1
+
+@pytest.mark.parametrize('platform', PLATFORMS)
+def test_reverse_mappings_are_built_from_the_platform_mappings(platform):
+    assert Post.REVERSE_MAPPINGS[platform] == {platform_key: key for key, platform_key in Post.PLATFORM_MAPPINGS[platform].items()}
+    assert set(Post._VALUE_SLOTS) == {key for _map in Post.PLATFORM_MAPPINGS.values() for key in _map}
+
+def test_standard_keys_are_converted_once(countedGetNum):
+    post = _tiktokPost()
+    assert post.likes == 1200
+    assert post.likes == post.get(Post.LIKES) == post['likes'] == 1200
+    assert countedGetNum == ['1.2K']
+
+    assert post.upload_time == datetime(2024, 7, 13, 18, 37) # from UTC to America/New_York
+    assert post.get('createTime') == post.upload_time # platform keys are not remembered, but convert the same
+    assert post.views is None and post.views is None # placeholders are remembered too
+    assert countedGetNum == ['1.2K', '2024-07-13T22:37:00', '2024-07-13T22:37:00']
+
+def test_values_gotten_with_a_default_are_not_remembered(countedGetNum):
+    post = _tiktokPost()
+    assert post.get(Post.SHARES, '7') == 7
+    assert post.get(Post.SHARES, '8') == 8
+    assert countedGetNum == ['7', '8']
+    with pytest.raises(KeyError):
+        post.get(Post.SHARES)
+
+def test_instagram_users_without_a_full_name_are_named_by_their_username():
+    user = User({'full name': '', 'username': 'therally', 'followers': '2.5K'}, INSTAGRAM)
+    assert (user.name, user.unique_name, user.followers) == ('therally', 'therally', 2500)
+    assert User({'full name': 'The Rally News', 'username': 'therally'}, INSTAGRAM).name == 'The Rally News'
+
+def test_posts_are_equal_when_they_are_the_same_post_with_the_same_likes():
+    post = _tiktokPost()
+    same = Post({'id': 'https://www.tiktok.com/@therally/video/7391234567890123456?lang=en', 'diggCount': '1,200'}, TIKTOK)
+    assert post == same and hash(post) == hash(same)
+    assert len({post, same}) == 1
+
+    assert post != _tiktokPost(diggCount='1.3K')
+    assert post != _tiktokPost(id='7391234567890123457')
+    assert post != Post({'url': 'https://www.tiktok.com/@/video/7391234567890123456', 'likes': '1.2K'}, FACEBOOK)
+    assert post != 'https://www.tiktok.com/@/video/7391234567890123456'
+
+def test_to_dict_uses_standard_keys_and_keeps_other_keys():
+    post = _tiktokPost(author_signature='news, every day')
+    assert post.to_dict() == {
+        Post.ID: 7391234567890123456,
+        Post.LIKES: 1200,
+        Post.UPLOAD_TIME: datetime(2024, 7, 13, 18, 37),
+        Post.USER_NAME: 'The Rally News',
+        Post.VIEWS: None,
+        'author_signature': 'news, every day',
+    }
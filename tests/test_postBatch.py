@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import pytest
+from numpy import array, datetime64
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+from helper.collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE
+from helper.commonTools import Post, PostBatch, PostBatchReader, PostReader
+from helper.syntheticData import writeCollections
+
+PLATFORMS = [FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE]
+
+@pytest.fixture(scope='module')
+def collections(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('collections')
+    filepaths = writeCollections(str(directory), 400, seed=5)
+    return {platform: next(path for path in filepaths if f'_{platform}_' in path) for platform in PLATFORMS}
+
+@pytest.mark.parametrize('platform', PLATFORMS)
+def test_posts_of_a_batch_match_posts_read_one_by_one(collections, platform):
+    posts = list(PostReader(collections[platform]))
+    batch = PostBatchReader(collections[platform])
+    assert len(batch) == len(posts)
+    for view, post in zip(batch, posts):
+        assert view.to_dict() == post.to_dict()
+        assert (view.url, view.post_id, view.identity) == (post.url, post.post_id, post.identity)
+        assert view == post
+
+@pytest.mark.parametrize('platform', PLATFORMS)
+def test_columns_of_a_batch_match_posts(collections, platform):
+    posts = list(PostReader(collections[platform]))
+    batch = PostBatchReader(collections[platform])
+    assert list(batch.url) == [post.url for post in posts]
+    assert list(batch.post_id) == [post.post_id for post in posts]
+    assert list(batch.identity) == [post.identity for post in posts]
+    for key in batch.keys:
+        expected = [post.get(key) for post in posts]
+        assert [batch[i].get(key) for i in range(len(batch))] == expected
+
+def test_columns_are_typed(collections):
+    batch = PostBatchReader(collections[TIKTOK])
+    assert batch.likes.dtype in ('int64', 'Int64')
+    assert batch.upload_time.dtype.kind == 'M'
+    assert batch.user_name.dtype == object
+    assert isinstance(batch[0].upload_time, datetime)
+    assert isinstance(batch[0].likes, int)
+
+def test_columns_can_be_gotten_by_platform_keys(collections):
+    batch = PostBatchReader(collections[TIKTOK])
+    platform_key = Post.PLATFORM_MAPPINGS[TIKTOK][Post.LIKES]
+    assert batch[platform_key] is batch.likes
+    with pytest.raises(KeyError):
+        batch.column('not a key')
+
+def test_indexing_gives_views_and_batches():
+    batch = PostBatch({
+        Post.URL: array(['https://www.youtube.com/watch?v=a', None, 'https://www.youtube.com/watch?v=c'], dtype=object),
+        Post.LIKES: array([3, 2, 1]),
+        Post.UPLOAD_TIME: array(['2024-07-13T18:37', 'NaT', '2024-07-14T01:00'], dtype='datetime64[ns]'),
+    }, YOUTUBE)
+
+    assert batch[-1].likes == 1
+    assert batch[1].url is None and batch[1].upload_time is None
+    assert batch[0].upload_time == datetime(2024, 7, 13, 18, 37)
+    with pytest.raises(IndexError):
+        batch[3]
+
+    assert list(batch[1:].likes) == [2, 1]
+    assert list(batch[batch.likes > 1].likes) == [3, 2]
+    assert list(batch[array([2, 0])].likes) == [1, 3]
+    assert batch[:0].keys == batch.keys and len(batch[:0]) == 0
+
+    assert_frame_equal(batch.to_frame(), DataFrame({
+        Post.URL: ['https://www.youtube.com/watch?v=a', None, 'https://www.youtube.com/watch?v=c'],
+        Post.LIKES: [3, 2, 1],
+        Post.UPLOAD_TIME: [datetime64('2024-07-13T18:37', 'ns'), datetime64('NaT', 'ns'), datetime64('2024-07-14T01:00', 'ns')],
+    }))
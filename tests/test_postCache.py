@@ -0,0 +1,74 @@
+import json
+import os
+
+import pytest
+from pandas import read_csv
+from pandas.testing import assert_frame_equal
+
+from helper.postCache import PostCache
+
+def _readCsv(filepath: str):
+    return read_csv(filepath)
+
+@pytest.fixture
+def files(tmp_path):
+    filepaths = []
+    for name, rows in (('a', 2), ('b', 3), ('c', 1)):
+        filepath = tmp_path / 'data' / f'{name}.csv'
+        filepath.parent.mkdir(exist_ok=True)
+        filepath.write_text('x,y\n' + ''.join(f'{i},{name}\n' for i in range(rows)))
+        filepaths.append(str(filepath))
+    return filepaths
+
+def _manifest(cache_dir) -> dict:
+    with open(os.path.join(cache_dir, 'manifest.json')) as file:
+        return json.load(file)['entries']
+
+def test_read_all_reads_files_in_order_and_caches_them(tmp_path, files):
+    cache_dir = str(tmp_path / 'cache')
+    df = PostCache(cache_dir, reader=_readCsv).read_all(files, processes=1)
+    assert df['y'].tolist() == ['a', 'a', 'b', 'b', 'b', 'c']
+
+    cache = PostCache(cache_dir, reader=_readCsv)
+    assert all(cache.isFresh(filepath) for filepath in files)
+    assert_frame_equal(cache.read_all(files, processes=1), df)
+
+def test_read_all_drops_entries_of_files_it_was_not_asked_for(tmp_path, files):
+    cache_dir = str(tmp_path / 'cache')
+    PostCache(cache_dir, reader=_readCsv).read_all(files, processes=1)
+    pickles = {name for name in os.listdir(cache_dir) if name.endswith('.pkl')}
+
+    cache = PostCache(cache_dir, reader=_readCsv)
+    cache.read_all(files[:1], processes=1)
+    assert list(_manifest(cache_dir)) == [os.path.abspath(files[0])]
+    remaining = {name for name in os.listdir(cache_dir) if name.endswith('.pkl')}
+    assert len(remaining) == 1 and remaining < pickles
+    assert not cache.isFresh(files[1])
+
+def test_read_keeps_other_entries(tmp_path, files):
+    cache_dir = str(tmp_path / 'cache')
+    cache = PostCache(cache_dir, reader=_readCsv)
+    cache.read_all(files, processes=1)
+    cache.read(files[0])
+    assert len(_manifest(cache_dir)) == len(files)
+
+def test_changed_files_are_read_again_and_no_temporary_file_is_left(tmp_path, files):
+    cache_dir = str(tmp_path / 'cache')
+    PostCache(cache_dir, reader=_readCsv).read_all(files, processes=1)
+    with open(files[1], 'a') as file:
+        file.write('3,b\n')
+
+    cache = PostCache(cache_dir, reader=_readCsv)
+    assert not cache.isFresh(files[1])
+    assert cache.read_all(files, processes=1)['y'].tolist().count('b') == 4
+    assert not [name for name in os.listdir(cache_dir) if name.endswith('.tmp')]
+
+def test_failed_writes_leave_no_temporary_file(tmp_path):
+    def failingWrite(file):
+        file.write('partial')
+        raise OSError('disk full')
+
+    cache = PostCache(str(tmp_path / 'cache'), reader=_readCsv)
+    with pytest.raises(OSError):
+        cache._writeAtomically(str(tmp_path / 'cache' / 'manifest.json'), 'w', failingWrite)
+    assert os.listdir(tmp_path / 'cache') == []
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from helper.collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE
+from helper.commonTools import Post
+from helper.postCube import RANK_BUCKETS, PostCube, rankBuckets
+
+PLATFORMS = [TIKTOK, YOUTUBE, FACEBOOK, INSTAGRAM]
+QUERIES = ['Trump assassination', 'Trump rally', 'Menendez Senator', 'Trump shooting', 'SCOTUS Biden Social Media']
+
+@pytest.fixture(scope='module')
+def posts() -> pd.DataFrame:
+    """
+    A cleaned post frame, with the columns the cube and the dashboard read.
+    """
+    rng = np.random.default_rng(15)
+    length = 3000
+    collected = pd.Timestamp('2024-07-16 18:00') + pd.to_timedelta(rng.integers(0, 5, length) * 6, unit='h')
+    first_trending = collected - pd.to_timedelta(rng.integers(0, 4, length) * 6, unit='h')
+    likes = rng.integers(0, 10_000, length).astype('float64')
+    likes[rng.random(length) < 0.1] = np.nan
+    hours = rng.uniform(0, 100, length).astype('float32')
+    hours[rng.random(length) < 0.2] = np.nan
+    ranks = rng.integers(0, 150, length).astype('float64')
+    ranks[rng.random(length) < 0.02] = np.nan
+    users = np.array([f'account {i}' for i in range(200)] + ['None'], dtype=object)[rng.integers(0, 201, length)]
+    users[rng.random(length) < 0.05] = None
+    identities = rng.integers(0, 900, length).astype('uint64')
+    return pd.DataFrame({
+        'platform': np.array(PLATFORMS)[rng.integers(0, 4, length)],
+        'searchTerm': np.array(QUERIES)[rng.integers(0, len(QUERIES), length)],
+        'collectedTime': collected,
+        'firstTrending': first_trending,
+        Post.RANK: ranks,
+        'cat': np.array(['IND', 'ORG', None], dtype=object)[rng.integers(0, 3, length)],
+        Post.USER_NAME: users,
+        Post.LIKES: likes,
+        Post.URL: [f'https://example.com/{identity}' for identity in identities],
+        Post.IDENTITY: identities,
+        'time_difference_hours': hours,
+    })
+
+def _baselineStats(df: pd.DataFrame) -> dict:
+    """
+    statsPerPlatform and the headline metrics as app.py computed them from the frame.
+    """
+    return {
+        'videos': len(df),
+        'unique videos': len(df.drop_duplicates(subset='post identity', keep='last')),
+        'accounts': len(df.groupby('user name')),
+        'queries': len(df.groupby('searchTerm', observed=True)),
+    }
+
+def _stats(cube: PostCube) -> dict:
+    return {
+        'videos': len(cube),
+        'unique videos': cube.distinct(Post.IDENTITY),
+        'accounts': cube.distinct(Post.USER_NAME),
+        'queries': cube.distinct('searchTerm'),
+    }
+
+def _frames(df: pd.DataFrame):
+    yield 'all', df, lambda cube: cube
+    yield 'top 10', df[df['rank'] <= 10], lambda cube: cube.upToRank(10)
+    trump = df[df['searchTerm'].str.contains('Trump assassination')]
+    yield 'trump', trump, lambda cube: cube.slice({'searchTerm': list(trump['searchTerm'].unique())})
+    for platform in PLATFORMS:
+        yield platform, df[df['platform'] == platform], lambda cube, platform=platform: cube.slice({'platform': platform})
+
+def test_stats_match_the_frame(posts):
+    cube = PostCube.from_frame(posts)
+    for name, df, toCube in _frames(posts):
+        assert _stats(toCube(cube)) == _baselineStats(df), name
+
+def test_platforms_are_in_order_of_appearance(posts):
+    cube = PostCube.from_frame(posts)
+    assert cube.platforms == list(posts['platform'].unique())
+    assert cube.slice({'platform': [INSTAGRAM, TIKTOK]}).platforms == [platform for platform in posts['platform'].unique() if platform in (INSTAGRAM, TIKTOK)]
+
+def test_videos_per_query_match_the_frame(posts):
+    cube = PostCube.from_frame(posts)
+    for name, df, toCube in _frames(posts):
+        expected = df.groupby('searchTerm', observed=True)['url'].apply(len)
+        assert toCube(cube).totals('searchTerm')['posts'].sort_index().to_dict() == expected.to_dict(), name
+
+def test_accounts_match_the_frame(posts):
+    cube = PostCube.from_frame(posts)
+    for name, df, toCube in _frames(posts):
+        accounts = toCube(cube).accountTotals()
+
+        # createAccountsDistribution
+        expected = df[df['user name'] != 'None'].groupby('user name')['url'].apply(len)
+        frequencies = accounts[accounts['user name'] != 'None'].set_index('user name')['posts']
+        assert frequencies.sort_index().to_dict() == expected.to_dict(), name
+
+        # countViewsPerAccount
+        liked = df[df['user name'].notna() & df['likes'].notna() & (df['user name'] != 'None')]
+        expected = liked.groupby('user name')['likes'].sum()
+        likes = accounts[(accounts['liked posts'] > 0) & (accounts['user name'] != 'None')].set_index('user name')['likes']
+        assert likes.sort_index().to_dict() == expected.to_dict(), name
+
+def test_fresh_content_matches_the_frame(posts):
+    cube = PostCube.from_frame(posts)
+    for name, df, toCube in _frames(posts):
+        fresh = df[df['time_difference_hours'].notna()]
+        fresh = fresh[fresh['time_difference_hours'] <= 24]
+        totals = toCube(cube).totals()
+        assert totals['fresh posts'] == len(fresh), name
+        assert totals['posts'] == len(df), name
+        assert totals['aged posts'] == df['time_difference_hours'].notna().sum(), name
+
+def test_account_categories_match_the_frame(posts):
+    cube = PostCube.from_frame(posts)
+    for name, df, toCube in _frames(posts):
+        sliced = toCube(cube)
+        per_cat = sliced.totals('cat')
+        for cat in ('ORG', 'IND'):
+            assert per_cat['likes'].get(cat, 0) == df.loc[df['cat'] == cat, 'likes'].sum(), name
+            assert per_cat['posts'].get(cat, 0) == (df['cat'] == cat).sum(), name
+        # countAccountCategory2 counted a missing user name as one more account, the cube does not
+        expected = df.groupby('cat', observed=True)['user name'].apply(lambda x: len(set(x.dropna())))
+        accounts = sliced.distinct(Post.USER_NAME, by='cat')
+        assert accounts[accounts.index.notna()].sort_index().to_dict() == expected.to_dict(), name
+
+def test_org_percentage_over_time_matches_the_frame(posts):
+    cube = PostCube.from_frame(posts)
+    cells = cube.cells.assign(
+        trendingCollectedDifference=(cube.cells['collectedTime'] - cube.cells['firstTrending']) / pd.Timedelta(hours=1),
+        orgPosts=cube.cells['posts'].where(cube.cells['cat'] == 'ORG', 0),
+    )
+    grouped = cells.groupby('trendingCollectedDifference')[['posts', 'orgPosts']].sum()
+    percentages = grouped['orgPosts'] / grouped['posts'] * 100
+
+    difference = (posts['collectedTime'] - posts['firstTrending']) / pd.Timedelta(hours=1)
+    expected = posts['cat'].eq('ORG').groupby(difference).mean() * 100
+    assert percentages.to_dict() == pytest.approx(expected.to_dict())
+
+def test_rank_buckets():
+    ranks = pd.Series([0, 9, 10, 11, 20, 21, 50, 51, 100, 101, 5000, None])
+    assert rankBuckets(ranks).tolist()[:-1] == ['0-9', '0-9', '10', '11-20', '11-20', '21-50', '21-50', '51-100', '51-100', '101+', '101+']
+    assert pd.isna(rankBuckets(ranks).iloc[-1])
+    assert list(rankBuckets(ranks).cat.categories) == RANK_BUCKETS
+
+def test_unknown_dimensions_and_ranks_are_errors(posts):
+    cube = PostCube.from_frame(posts)
+    with pytest.raises(KeyError):
+        cube.slice({'not a dimension': 1})
+    with pytest.raises(ValueError):
+        cube.upToRank(12)
+    with pytest.raises(KeyError):
+        cube.distinct('likes')
+
+def test_frames_without_identities_tell_videos_apart_by_url(posts):
+    cube = PostCube.from_frame(posts.drop(columns=[Post.IDENTITY, 'cat']))
+    assert 'cat' not in cube.dimensions
+    assert cube.distinct(Post.IDENTITY) == posts['url'].nunique()
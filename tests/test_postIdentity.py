@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+from hashlib import blake2b
+
+import pytest
+from numpy import nan
+from pandas import Series
+
+from helper.collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE
+from helper.commonTools import getPostIdentities, getPostIdentity
+
+POSTS = [
+    (TIKTOK, '7390000000000000001', 'https://www.tiktok.com/@/video/7390000000000000001'),
+    (TIKTOK, 7390000000000000001, None),
+    (INSTAGRAM, 'C9abc', None),
+    (YOUTUBE, 'dQw4w9WgXcQ', 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'),
+    (FACEBOOK, None, 'https://www.facebook.com/login/'),
+    (FACEBOOK, nan, 'https://www.facebook.com/CNN/'),
+    (FACEBOOK, None, None),
+    (YOUTUBE, None, nan),
+    (YOUTUBE, '', None),
+    (INSTAGRAM, 'dQw4w9WgXcQ', None),
+]
+
+def test_getPostIdentity_matches_getPostIdentities():
+    platforms, post_ids, urls = zip(*POSTS)
+    identities = getPostIdentities(Series(platforms), Series(post_ids, index=range(3, 3 + len(POSTS)), dtype=object), Series(urls, dtype=object))
+    assert identities.dtype == 'uint64'
+    assert list(identities.index) == list(range(3, 3 + len(POSTS)))
+    assert identities.tolist() == [getPostIdentity(*post) for post in POSTS]
+
+def test_identities_tell_posts_apart():
+    identities = [getPostIdentity(*post) for post in POSTS]
+    assert identities[0] == identities[1] # 123 and '123' are the same id
+    # posts with neither an id nor a url share one identity, per platform
+    assert getPostIdentity(FACEBOOK, None, None) == getPostIdentity(FACEBOOK, nan, None)
+    assert identities[6] != identities[7]
+    assert identities[7] != identities[8] # an empty id is not a missing one
+    assert identities[3] != identities[9] # the same id on another platform
+    assert len(set(identities)) == len(identities) - 1
+
+def test_identities_are_blake2b_hashes_which_are_the_same_in_every_process():
+    expected = int.from_bytes(blake2b(b'tiktok\x017390000000000000001', digest_size=8).digest(), 'little')
+    assert getPostIdentity(TIKTOK, '7390000000000000001') == expected
+    assert getPostIdentity('TikTok', '7390000000000000001') == expected
+
+    code = "from helper.commonTools import getPostIdentity; print(getPostIdentity('tiktok', '7390000000000000001'))"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, env={**os.environ, 'PYTHONHASHSEED': '123'}).stdout
+    assert int(output) == expected
+
+@pytest.mark.parametrize('length', [0, 1, 1000])
+def test_getPostIdentities_of_repeated_posts(length):
+    post_ids = Series([str(i % 7) for i in range(length)], dtype=object)
+    platforms = Series([TIKTOK] * length)
+    identities = getPostIdentities(platforms, post_ids)
+    assert identities.tolist() == [getPostIdentity(TIKTOK, str(i % 7)) for i in range(length)]
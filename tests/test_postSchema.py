@@ -0,0 +1,86 @@
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+from helper.commonTools import Post
+from helper.postSchema import CATEGORY, POST_FRAME_SCHEMA, applyPostSchema, internStrings, memoryReport
+
+@pytest.fixture
+def posts() -> pd.DataFrame:
+    length = 1000
+    rng = np.random.default_rng(14)
+    return pd.DataFrame({
+        'platform': rng.choice(['tiktok', 'youtube', 'facebook', 'instagram'], length).astype(object),
+        Post.USER_NAME: [f'user {i % 7}' if i % 10 else None for i in range(length)],
+        Post.RANK: np.arange(length, dtype='int64'),
+        Post.LIKES: [float(i) if i % 3 else np.nan for i in range(length)],
+        Post.UPLOAD_TIME: pd.date_range('2024-07-13 12:00', periods=length, freq='min', tz='America/New_York'),
+        'time_difference_hours': rng.random(length),
+        'text': [f'post {i}' for i in range(length)],
+    }, index=range(10, 10 + length))
+
+def test_columns_get_the_declared_dtypes(posts):
+    df = applyPostSchema(posts)
+    assert df['platform'].dtype == CATEGORY
+    assert df[Post.USER_NAME].dtype == object
+    assert str(df[Post.RANK].dtype) == 'Int16' and str(df[Post.LIKES].dtype) == 'Int32'
+    assert df[Post.UPLOAD_TIME].dtype.kind == 'M' and df[Post.UPLOAD_TIME].dt.tz is None
+    assert df['time_difference_hours'].dtype == 'float32'
+    assert df['text'].dtype == posts['text'].dtype # not in the schema
+
+    assert list(df.columns) == list(posts.columns) and list(df.index) == list(posts.index)
+    assert df[Post.LIKES].isna().tolist() == posts[Post.LIKES].isna().tolist()
+    assert df[Post.LIKES].dropna().tolist() == posts[Post.LIKES].dropna().tolist()
+    assert df[Post.UPLOAD_TIME].iloc[0] == datetime(2024, 7, 13, 12, 0) # the same wall time
+
+def test_ints_are_widened_when_they_do_not_fit(posts):
+    posts[Post.RANK] = posts[Post.RANK] * 100 # more than Int16 holds
+    posts[Post.LIKES] = posts[Post.LIKES] * 2 ** 32
+    df = applyPostSchema(posts)
+    assert str(df[Post.RANK].dtype) == 'Int32' and str(df[Post.LIKES].dtype) == 'Int64'
+    assert df[Post.RANK].tolist() == posts[Post.RANK].tolist()
+
+def test_columns_which_cannot_be_converted_are_kept():
+    df = pd.DataFrame({
+        Post.LIKES: [1.5, 2.0, None], # not ints
+        Post.UPLOAD_TIME: ['2024-07-13 12:00', '2024-07-13 13:00', None], # times as text
+    })
+    converted = applyPostSchema(df)
+    pd.testing.assert_frame_equal(converted, df)
+
+def test_text_counts_are_parsed_as_numbers():
+    df = applyPostSchema(pd.DataFrame({Post.LIKES: ['1', '20', None, 'not a count']}))
+    assert str(df[Post.LIKES].dtype) == 'Int32'
+    assert df[Post.LIKES].isna().tolist() == [False, False, True, True]
+
+def test_duplicated_columns_are_kept():
+    df = pd.DataFrame([[1, 2]], columns=[Post.LIKES, Post.LIKES])
+    assert applyPostSchema(df).equals(df)
+
+def test_strings_are_interned():
+    column = pd.Series([''.join(['a', 'b']), ''.join(['a', 'b']), None, np.nan, 'c'], index=list('vwxyz'))
+    assert column['v'] is not column['w']
+    interned = internStrings(column)
+    assert interned['v'] is interned['w'] is sys.intern('ab')
+    assert interned.tolist() == ['ab', 'ab', None, None, 'c']
+    assert list(interned.index) == list('vwxyz')
+
+def test_enforceSchema_applies_the_post_frame_schema(posts):
+    pd.testing.assert_frame_equal(app.enforceSchema(posts), applyPostSchema(posts, POST_FRAME_SCHEMA))
+
+def test_memoryReport_counts_shared_strings_once(posts):
+    before = posts.assign(**{Post.USER_NAME: pd.Series([''.join(name) if isinstance(name, str) else None for name in posts[Post.USER_NAME]], index=posts.index, dtype=object)})
+    after = applyPostSchema(before).drop(columns=['text']).assign(added=np.zeros(len(posts), dtype='uint8'))
+    report = memoryReport(before, after)
+
+    assert list(report.index) == [*posts.columns, 'added', 'total']
+    assert list(report.columns) == ['before (MB)', 'after (MB)', 'saved (%)']
+    assert report.loc['text', 'after (MB)'] == 0 and report.loc['added', 'before (MB)'] == 0
+    assert report.loc['total', 'before (MB)'] == pytest.approx(report['before (MB)'].drop('total').sum(), abs=0.01)
+    assert report.loc[Post.USER_NAME, 'after (MB)'] < report.loc[Post.USER_NAME, 'before (MB)']
+    assert report.loc[Post.RANK, 'saved (%)'] > 50
+    assert report.loc['total', 'saved (%)'] > 0
@@ -0,0 +1,108 @@
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helper.profiler import Profiler, rowsOf
+
+@pytest.mark.parametrize('value, rows', [
+    (pd.DataFrame({'likes': range(5)}), 5),
+    (pd.Series(range(3)), 3),
+    (np.zeros((4, 2)), 4),
+    (np.float64(1.5), None), # no shape
+    ((pd.DataFrame({'likes': range(6)}), pd.DataFrame({'report': [1]})), 6), # like getPosts: the posts and a report
+    ([pd.Series(range(2)), np.zeros(3)], 5),
+    ([pd.Series(range(2)), 'not rows'], 2), # a list holding anything without rows counts its items
+    ([], 0),
+    ((), None),
+    ('text', None),
+    (None, None),
+])
+def test_rowsOf(value, rows):
+    assert rowsOf(value) == rows
+
+def test_spans_opened_inside_others_are_their_children():
+    profiler = Profiler()
+
+    @profiler.profiled()
+    def clean(df):
+        with profiler.span('dedupe', rows_in=len(df)) as dedupe:
+            df = df.drop_duplicates()
+            dedupe.rows_out = len(df)
+        return df[df['likes'] > 0]
+
+    with profiler.span('pipeline'):
+        clean(pd.DataFrame({'likes': [0, 1, 1, 2]}))
+
+    spans = profiler.spans()
+    assert [span['name'] for span in spans] == ['dedupe', 'clean', 'pipeline'] # children end first
+    assert [(span['parent'], span['depth']) for span in spans] == [('clean', 2), ('pipeline', 1), (None, 0)]
+    assert [(span['rows in'], span['rows out']) for span in spans] == [(4, 3), (4, 2), (None, None)]
+    assert spans[2]['seconds'] >= spans[1]['seconds'] >= spans[0]['seconds'] >= 0
+
+def test_profiled_functions_without_rows_are_still_timed():
+    profiler = Profiler()
+    render = profiler.profiled('render', rows=False)(lambda df: df)
+    assert render.__name__ == '<lambda>'
+    render(pd.DataFrame({'likes': [1]}))
+    assert [(span['name'], span['rows in'], span['rows out']) for span in profiler.spans()] == [('render', None, None)]
+
+def test_failed_spans_are_recorded_and_the_error_is_raised():
+    profiler = Profiler()
+    with pytest.raises(KeyError):
+        with profiler.span('outer'):
+            with profiler.span('inner'):
+                raise KeyError('likes')
+    assert [(span['name'], span['error']) for span in profiler.spans()] == [('inner', 'KeyError'), ('outer', 'KeyError')]
+    with profiler.span('after'):
+        pass
+    assert profiler.spans()[-1]['depth'] == 0 # the stack is empty again
+
+def test_spans_of_other_threads_are_not_children():
+    profiler = Profiler()
+    with profiler.span('main'):
+        def work():
+            with profiler.span('worker'):
+                pass
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    worker = next(span for span in profiler.spans() if span['name'] == 'worker')
+    assert (worker['parent'], worker['depth']) == (None, 0)
+
+def test_the_latest_spans_are_kept_and_summed_up_by_stage():
+    profiler = Profiler(max_spans=3)
+    for rows in range(1, 5):
+        with profiler.span('read', rows_in=rows):
+            pass
+    with profiler.span('clean'):
+        pass
+    assert [span['rows in'] for span in profiler.spans()] == [3, 4, None]
+
+    summary = profiler.summary()
+    assert [(stage['name'], stage['runs'], stage['rows in']) for stage in summary] == [('read', 2, 4), ('clean', 1, None)]
+    assert summary[0]['seconds'] >= summary[0]['longest seconds']
+
+    exported = json.loads(profiler.to_json())
+    assert exported['summary'] == summary and exported['spans'] == profiler.spans()
+    profiler.clear()
+    assert profiler.spans() == []
+
+def test_peaks_of_children_count_in_their_parent():
+    profiler = Profiler()
+    profiler.trackMemory(True)
+    try:
+        with profiler.span('outer'):
+            with profiler.span('inner'):
+                allocated = bytearray(8 * 2 ** 20)
+                del allocated
+    finally:
+        profiler.trackMemory(False)
+    inner, outer = profiler.spans()
+    assert inner['peak bytes'] >= 8 * 2 ** 20
+    assert outer['peak bytes'] >= inner['peak bytes']
+    with profiler.span('untracked'):
+        pass
+    assert profiler.spans()[-1]['peak bytes'] is None
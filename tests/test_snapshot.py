@@ -0,0 +1,47 @@
+import os
+import pickle
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import helper.snapshot as snapshot
+from helper.snapshot import SNAPSHOT_VERSION, Snapshot
+
+@pytest.fixture
+def datasets() -> dict:
+    posts = pd.DataFrame({'platform': pd.Categorical(['tiktok', 'youtube']), 'likes': pd.array([3, None], dtype='Int32')})
+    return {'posts': posts, 'summary': posts.groupby('platform', observed=True).size(), 'ranks': [1, 2, 3]}
+
+def test_snapshots_are_read_as_they_were_written(tmp_path, datasets):
+    filepath = str(tmp_path / 'snapshots' / 'snapshot.pkl')
+    created = datetime(2024, 7, 16, 12)
+    Snapshot(datasets, 'a1b2c3', created).write(filepath)
+
+    read = Snapshot.read(filepath)
+    assert (read.data_version, read.created, len(read)) == ('a1b2c3', created, 3)
+    pd.testing.assert_frame_equal(read.datasets['posts'], datasets['posts'])
+    pd.testing.assert_series_equal(read.datasets['summary'], datasets['summary'])
+    assert read.datasets['ranks'] == [1, 2, 3]
+    assert os.listdir(tmp_path / 'snapshots') == ['snapshot.pkl'] # no temporary file left
+
+def test_writing_again_replaces_the_snapshot(tmp_path, datasets):
+    filepath = str(tmp_path / 'snapshot.pkl')
+    Snapshot(datasets, 'old').write(filepath)
+    Snapshot({'ranks': []}, 'new').write(filepath)
+    read = Snapshot.read(filepath)
+    assert (read.data_version, list(read.datasets)) == ('new', ['ranks'])
+
+def test_snapshots_of_another_format_version_are_rejected(tmp_path, datasets, monkeypatch):
+    filepath = str(tmp_path / 'snapshot.pkl')
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_VERSION', SNAPSHOT_VERSION - 1)
+    Snapshot(datasets, 'a1b2c3').write(filepath)
+    monkeypatch.undo()
+    with pytest.raises(ValueError, match=f'version {SNAPSHOT_VERSION}'):
+        Snapshot.read(filepath)
+
+def test_other_pickles_are_rejected(tmp_path):
+    filepath = tmp_path / 'snapshot.pkl'
+    filepath.write_bytes(pickle.dumps([1, 2, 3]))
+    with pytest.raises(ValueError):
+        Snapshot.read(str(filepath))
@@ -0,0 +1,90 @@
+import csv
+import os
+
+import pytest
+
+from helper.collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE, getDataCollectionParameters
+from helper.commonTools import Post, _parseCount, read_collection_csv
+from helper.syntheticData import COLLECTIONS_PER_QUERY, PLACEHOLDER_RATE, PLATFORMS, SYNTHETIC_QUERIES, writeCollections
+
+ROWS = 6000
+
+@pytest.fixture(scope='module')
+def collections(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('synthetic')
+    return str(directory), writeCollections(str(directory), ROWS, seed=22)
+
+def _rows(filepath: str) -> list[dict]:
+    with open(filepath, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+def _contents(filepaths: list[str]) -> dict[str, bytes]:
+    contents = {}
+    for filepath in filepaths:
+        with open(filepath, 'rb') as file:
+            contents[os.path.basename(filepath)] = file.read()
+    return contents
+
+def test_the_same_seed_writes_the_same_files(collections, tmp_path):
+    _, filepaths = collections
+    assert _contents(writeCollections(str(tmp_path / 'again'), ROWS, seed=22)) == _contents(filepaths)
+    assert _contents(writeCollections(str(tmp_path / 'other'), ROWS, seed=23)) != _contents(filepaths)
+
+def test_files_are_named_like_collections(collections):
+    directory, filepaths = collections
+    assert sorted(os.listdir(directory)) == sorted(map(os.path.basename, filepaths))
+    assert len(filepaths) == len(PLATFORMS) * len(SYNTHETIC_QUERIES) * COLLECTIONS_PER_QUERY
+
+    parameters = [getDataCollectionParameters(filepath) for filepath in filepaths]
+    assert {(data['platform'], data['query']) for data in parameters} == {(platform, query) for platform in PLATFORMS for query in SYNTHETIC_QUERIES}
+    assert all(data['trending_time'] < data['collection_time'] for data in parameters)
+    for platform in PLATFORMS:
+        for query in SYNTHETIC_QUERIES:
+            times = [data['collection_time'] for data in parameters if (data['platform'], data['query']) == (platform, query)]
+            assert len(set(times)) == COLLECTIONS_PER_QUERY
+
+def test_files_have_the_columns_of_their_platform(collections):
+    _, filepaths = collections
+    for filepath in filepaths:
+        platform = getDataCollectionParameters(filepath)['platform']
+        with open(filepath, newline='', encoding='utf-8') as file:
+            assert next(csv.reader(file)) == list(Post.PLATFORM_MAPPINGS[platform].values())
+
+def test_every_row_asked_for_is_written(collections):
+    _, filepaths = collections
+    assert sum(len(_rows(filepath)) for filepath in filepaths) == ROWS
+
+def test_some_values_are_placeholders_but_never_urls_ids_or_ranks(collections):
+    _, filepaths = collections
+    values = placeholders = 0
+    for filepath in filepaths:
+        platform = getDataCollectionParameters(filepath)['platform']
+        columns = Post.PLATFORM_MAPPINGS[platform]
+        kept = {columns[key] for key in (Post.URL, Post.ID, Post.RANK) if key in columns}
+        for row in _rows(filepath):
+            for column, value in row.items():
+                if column in kept:
+                    assert value not in Post.PLACEHOLDERS[platform]
+                else:
+                    values += 1
+                    placeholders += value in Post.PLACEHOLDERS[platform]
+    assert PLACEHOLDER_RATE / 2 < placeholders / values < PLACEHOLDER_RATE * 2
+
+@pytest.mark.parametrize('platform', [FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE])
+def test_files_read_like_real_collections(collections, platform):
+    _, filepaths = collections
+    filepaths = [filepath for filepath in filepaths if getDataCollectionParameters(filepath)['platform'] == platform]
+    column = Post.PLATFORM_MAPPINGS[platform][Post.LIKES]
+    for filepath in filepaths[:3]:
+        df = read_collection_csv(filepath)
+        assert df['url'].notna().all() and df['post id'].notna().all()
+        likes = [row[column] for row in _rows(filepath)]
+        assert all(_parseCount(value) is not None for value in likes if value not in Post.PLACEHOLDERS[platform])
+
+def test_later_collections_find_posts_again(collections):
+    _, filepaths = collections
+    for platform in PLATFORMS:
+        for query in SYNTHETIC_QUERIES:
+            files = [filepath for filepath in filepaths if os.path.basename(filepath).startswith(f'{query}_{platform}_')]
+            urls = [set(read_collection_csv(filepath)['url']) for filepath in files]
+            assert urls[1] & urls[0] and urls[2] & (urls[0] | urls[1])
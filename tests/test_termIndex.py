@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from helper.termIndex import TermIndex, cloudFrequencies, compileFilter
+
+def _baselineTerms(df: pd.DataFrame, column: str, by: list[str]) -> tuple[pd.DataFrame, pd.Series]:
+    """
+    How TermIndex.from_frame counted words before, from a frame with a row per word of the posts.
+    """
+    by = [key for key in by if key in df.columns]
+    words = df[column].astype(str).fillna('').str.split()
+    slices = df[by].reset_index(drop=True)
+    occurrences = slices.loc[slices.index.repeat(words.str.len().to_numpy())].reset_index(drop=True)
+    occurrences['position'] = np.arange(len(occurrences))
+    codes, vocabulary = pd.factorize(pd.Series([word for row in words for word in row], dtype=object))
+    occurrences['word'] = codes
+    terms = occurrences.groupby(by + ['word'], observed=True, dropna=False, sort=False)['position'].agg(['size', 'min'])
+    terms = terms.rename(columns={'size': 'count', 'min': 'first'}).reset_index()
+    return terms, pd.Series(vocabulary, dtype=object)
+
+@pytest.fixture(scope='module')
+def posts() -> pd.DataFrame:
+    rng = np.random.default_rng(16)
+    length = 2000
+    vocabulary = np.array([f'word{i}' for i in range(500)] + ['Trump', 'trump', 'https://t.co/x', "it's"], dtype=object)
+    texts = pd.Series([' '.join(vocabulary[rng.zipf(1.5, rng.integers(0, 30)) % len(vocabulary)]) for _ in range(length)], dtype=object)
+    texts[rng.random(length) < 0.05] = None
+    return pd.DataFrame({
+        'text': texts,
+        'platform': pd.Categorical(rng.choice(['tiktok', 'youtube', 'facebook'], length)),
+        'searchTerm': rng.choice(np.array(['Trump rally', 'Trump shooting', None], dtype=object), length),
+    }, index=rng.permutation(length))
+
+@pytest.mark.parametrize('by', [['platform', 'searchTerm'], ['searchTerm'], [], ['platform', 'not a column']])
+def test_terms_match_counting_every_word(posts, by):
+    index = TermIndex.from_frame(posts, 'text', by=by)
+    terms, vocabulary = _baselineTerms(posts, 'text', by)
+    assert_frame_equal(index._terms, terms)
+    assert_series_equal(index.vocabulary, vocabulary)
+
+def test_posts_without_words(posts):
+    for df in (posts.iloc[:0], posts.assign(text=None), posts.assign(text='  ')):
+        index = TermIndex.from_frame(df, 'text')
+        assert len(index.vocabulary) == 0 and len(index._terms) == 0
+        assert len(index.select()) == 0
+
+def test_selections_rank_words_like_counter(posts):
+    index = TermIndex.from_frame(posts, 'text')
+    selected = posts[posts['searchTerm'].isin(['Trump rally']) & (posts['platform'] != 'youtube')]
+    words = [word for text in selected['text'].dropna() for word in text.split()]
+    expected = pd.Series(words).value_counts(sort=False)
+    expected = sorted(expected.items(), key=lambda item: (-item[1], words.index(item[0])))
+
+    terms = index.select({'searchTerm': ['Trump rally'], 'platform': ['tiktok', 'facebook']})
+    assert terms.most_common() == expected
+    assert terms.rank(expected[0][0]) == 1 and terms.frequency(expected[0][0]) == expected[0][1]
+    assert terms.frequency('not a word') == 0 and terms.rank('not a word') is None
+    assert index.select({'platform': ['facebook', 'tiktok'], 'searchTerm': ['Trump rally']}) is terms
+
+def test_filters_leave_out_words_containing_a_term(posts):
+    index = TermIndex.from_frame(posts, 'text')
+    terms = index.select(filter=['TRUMP', 'https'])
+    assert 'Trump' not in terms and 'trump' not in terms and 'https://t.co/x' not in terms
+    assert len(terms) == len(index.select()) - 3
+    assert compileFilter([]) is None
+    assert compileFilter(['a.b']).search('xa.by') and not compileFilter(['a.b']).search('axb')
+
+def test_indexes_of_different_posts_have_different_versions(posts):
+    assert TermIndex.from_frame(posts, 'text').version == TermIndex.from_frame(posts.copy(), 'text').version
+    assert TermIndex.from_frame(posts, 'text').version != TermIndex.from_frame(posts.iloc[1:], 'text').version
+
+def test_cloudFrequencies_merge_cases_and_plurals():
+    index = TermIndex.from_frame(pd.DataFrame({'text': ["Trump trump Trump's rally rallys 2024 the votes vote"]}), 'text', by=[])
+    assert cloudFrequencies(index.select(), stopwords=['THE']) == {'Trump': 3, 'rally': 2, 'vote': 2}
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import pytest
+from pandas import NaT, Series
+
+from helper.collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE
+from helper.commonTools import Post, _parseTime, getTimes
+
+# a time of each platform in its own format, and the same time in America/New_York
+TIMES = {
+    FACEBOOK: ('Saturday, July 13, 2024 at 06:37 PM', datetime(2024, 7, 13, 18, 37)),
+    INSTAGRAM: ('2024-07-13 18:37:00', datetime(2024, 7, 13, 18, 37)),
+    TIKTOK: ('2024-07-13T22:37:00', datetime(2024, 7, 13, 18, 37)), # stored in UTC
+    YOUTUBE: ('2024-07-13 18:37:00', datetime(2024, 7, 13, 18, 37)),
+}
+
+@pytest.mark.parametrize('platform', list(TIMES))
+def test_times_are_parsed_in_new_york_time(platform):
+    time, expected = TIMES[platform]
+    assert _parseTime(time, platform) == expected
+    assert Post({Post.PLATFORM_MAPPINGS[platform][Post.UPLOAD_TIME]: time}, platform).upload_time == expected
+
+@pytest.mark.parametrize('time, expected', [
+    ('2024-01-13T22:37:00', datetime(2024, 1, 13, 17, 37)), # EST is 5 hours behind UTC
+    ('2024-07-13T02:00:00', datetime(2024, 7, 12, 22, 0)), # the day before in New York
+    ('2024-03-10T06:30:00', datetime(2024, 3, 10, 1, 30)), # before daylight saving time starts
+    ('2024-03-10T07:30:00', datetime(2024, 3, 10, 3, 30)), # after it starts
+    ('2024-11-03T05:30:00', datetime(2024, 11, 3, 1, 30)), # the first 1:30 when it ends
+    ('2024-11-03T06:30:00', datetime(2024, 11, 3, 1, 30)), # and the second
+])
+def test_tiktok_times_are_converted_from_utc_once(time, expected):
+    assert _parseTime(time, TIKTOK) == expected
+    assert getTimes([time], TIKTOK)[0] == expected
+
+@pytest.mark.parametrize('platform', list(TIMES))
+def test_getTimes_matches_parseTime(platform):
+    time, _ = TIMES[platform]
+    other_platform_time = TIMES[FACEBOOK if platform != FACEBOOK else TIKTOK][0]
+    times = Series([time, 'not a time', None, other_platform_time, time], index=range(3, 8))
+    parsed = getTimes(times, platform)
+    assert parsed.dtype.kind == 'M'
+    assert parsed.dt.tz is None
+    assert list(parsed.index) == list(range(3, 8))
+    assert parsed[3] == parsed[7] == _parseTime(time, platform)
+    assert parsed[4] is NaT and parsed[5] is NaT and parsed[6] is NaT
+
+def test_tiktok_is_the_only_platform_stored_in_another_time_zone():
+    assert Post.SOURCE_TIME_ZONES == {TIKTOK: 'UTC'}
+    assert Post.TIME_ZONE == 'America/New_York'
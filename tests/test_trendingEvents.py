@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from helper.collectionFiles import NO_TRENDING_TIME
+from helper.trendingEvents import EVENT, FIRST_TRENDING, HOURS_SINCE_TRENDING, TrendingEvents, queryKey, readTrendingQueries
+
+# rows of static/political_queries.csv: the entities of a trending topic, polled every hour
+TRENDING_QUERIES = '''time,query
+06-17-17,"Joe Biden, Karine Jean-Pierre, White House Press Secretary"
+06-17-18,"Joe Biden, Karine Jean-Pierre, White House Press Secretary"
+06-17-18,"Republican Party, Primary election, Virginia, Donald Trump , John McGuire, United States Congress"
+07-14-10,"Donald Trump, Butler, Pennsylvania, Secret Service"
+'''
+
+@pytest.fixture
+def queriesFile(tmp_path) -> str:
+    filepath = tmp_path / 'political_queries.csv'
+    filepath.write_bytes(TRENDING_QUERIES.replace('\n', '\r\n').encode())
+    return str(filepath)
+
+def _posts(*rows) -> pd.DataFrame:
+    """
+    Posts as read by read_collection_csv, from (url, searchTerm, trendingTime, collectedTime) rows.
+    """
+    df = pd.DataFrame(rows, columns=['url', 'searchTerm', 'trendingTime', 'collectedTime'])
+    df['trendingTime'] = df['trendingTime'].fillna(NO_TRENDING_TIME)
+    return df
+
+def test_topics_are_split_into_their_entities(queriesFile):
+    queries = readTrendingQueries(queriesFile)
+    assert queries['query'].tolist()[:4] == ['Joe Biden', 'Karine Jean-Pierre', 'White House Press Secretary', 'Joe Biden']
+    assert 'Donald Trump' in queries['query'].tolist() and 'Secret Service' in queries['query'].tolist()
+    assert len(queries) == 3 + 3 + 6 + 4
+    assert queries['time'].iloc[0] == datetime(2024, 6, 17, 17)
+
+def test_the_real_trending_queries_file_is_read_by_entity():
+    queries = readTrendingQueries('./static/political_queries.csv')
+    assert queries['query'].notna().all() and not queries['query'].str.contains(',', regex=False).any()
+    assert (queries['query'] == queries['query'].str.strip()).all()
+    assert 'Donald Trump' in set(queries['query'])
+
+def test_entities_seen_an_hour_apart_are_one_event(queriesFile):
+    events = TrendingEvents.from_sources(queriesFile).events
+    biden = events[events['key'] == queryKey('Joe Biden')]
+    assert len(biden) == 1
+    assert (biden['start'].iloc[0], biden['end'].iloc[0], biden['observations'].iloc[0]) == (datetime(2024, 6, 17, 17), datetime(2024, 6, 17, 18), 2)
+    assert len(events[events['key'] == 'donald trump']) == 2 # a month apart
+    assert not events['key'].str.contains(',', regex=False).any()
+
+def test_filename_trending_times_come_first(queriesFile):
+    posts = _posts(
+        # the trending file has a later Donald Trump event, before the collection
+        ('https://www.tiktok.com/@/video/1', 'Donald Trump', datetime(2024, 7, 13, 18), datetime(2024, 7, 14, 12)),
+        ('https://www.tiktok.com/@/video/2', 'Donald Trump', datetime(2024, 7, 14, 9), datetime(2024, 7, 14, 12)),
+    )
+    events = TrendingEvents.from_sources(queriesFile, posts)
+    trending = events.annotate(posts)
+    assert trending[FIRST_TRENDING].tolist() == [datetime(2024, 7, 13, 18), datetime(2024, 7, 14, 9)]
+    assert trending[HOURS_SINCE_TRENDING].tolist() == [18, 3]
+
+    # each post is in the event its own trending time belongs to
+    starts = events.events['start'].to_dict()
+    assert [starts[event] for event in trending[EVENT]] == [datetime(2024, 7, 13, 18), datetime(2024, 7, 14, 9)]
+
+def test_posts_without_a_trending_time_fall_back_to_the_trending_timeline(queriesFile):
+    posts = _posts(
+        ('https://www.youtube.com/watch?v=a', 'joe  biden', None, datetime(2024, 6, 17, 20)),
+        ('https://www.youtube.com/watch?v=b', 'White House Press Secretary', None, datetime(2024, 6, 17, 19)),
+        ('https://www.youtube.com/watch?v=c', 'Joe Biden, Karine Jean-Pierre', None, datetime(2024, 6, 17, 19)), # not an entity
+        ('https://www.youtube.com/watch?v=d', 'Joe Biden', None, datetime(2024, 6, 17, 16)), # collected before it trended
+    )
+    trending = TrendingEvents.from_sources(queriesFile, posts).annotate(posts)
+    assert trending[FIRST_TRENDING].tolist() == [datetime(2024, 6, 17, 17)] * 2 + [NO_TRENDING_TIME] * 2
+    assert trending[EVENT].isna().tolist() == [False, False, True, True]
+    assert trending[HOURS_SINCE_TRENDING].tolist()[:2] == [3, 2]
+
+def test_first_trending_is_the_earliest_of_every_row_of_a_url(queriesFile):
+    url = 'https://www.instagram.com/p/C9abc'
+    posts = _posts(
+        (url, 'Secret Service', datetime(2024, 7, 14, 11), datetime(2024, 7, 14, 13)),
+        (url, 'Joe Biden', None, datetime(2024, 6, 17, 21)),
+        ('https://www.instagram.com/p/C9xyz', 'Secret Service', datetime(2024, 7, 14, 11), datetime(2024, 7, 14, 13)),
+    )
+    trending = TrendingEvents.from_sources(queriesFile, posts).annotate(posts)
+    assert trending[FIRST_TRENDING].tolist() == [datetime(2024, 6, 17, 17)] * 2 + [datetime(2024, 7, 14, 11)]
+    assert list(trending.index) == list(posts.index)
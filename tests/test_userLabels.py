@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+from pandas import Series
+
+from helper.userLabels import INDIVIDUAL, ORGANIZATION, UserLabels, normalizeUserName
+
+LABELS_FILE = './labelledUsers.csv'
+
+def _baselineGetUserCategory(df: pd.DataFrame, file_path: str) -> pd.DataFrame:
+    """
+    getUserCategory as app.py had it before labels were indexed, reading file_path instead of ./labelledUsers.csv.
+    """
+    csv_data = pd.read_csv(file_path)
+    user_data = []
+    for index, row in csv_data.iterrows():
+        if "IND" in row['cat']:
+            cat = "IND"
+        else:
+            cat = "ORG"
+        user_data.append({'user name': row['user_name'], 'cat': cat})
+
+    user_df = pd.DataFrame(user_data)
+    user_df = user_df.drop_duplicates(subset='user name', keep='last')
+    return df.merge(user_df, on='user name', how='left')
+
+def _labelsFile(tmp_path, rows: list[tuple[str, str]]) -> str:
+    filepath = tmp_path / 'labels.csv'
+    pd.DataFrame(rows, columns=['user_name', 'cat']).to_csv(filepath, index=False)
+    return str(filepath)
+
+def test_label_matches_the_merge_it_replaced():
+    labelled = pd.read_csv(LABELS_FILE, dtype=str, keep_default_na=False)['user_name']
+    # names which normalizing does not change or merge with another name are labelled like before
+    normalized = labelled.map(normalizeUserName)
+    kept = (normalized == labelled) & ~normalized.duplicated(keep=False) & (labelled != '')
+    names = list(labelled[kept]) + ['not a labelled account', 'the western journal', 'The Western Journal']
+    df = pd.DataFrame({'user name': names * 2, 'likes': range(2 * len(names))})
+
+    expected = _baselineGetUserCategory(df, LABELS_FILE)['cat']
+    labels = UserLabels(LABELS_FILE).label(df['user name'])
+    assert labels.tolist() == [cat if isinstance(cat, str) else None for cat in expected]
+
+def test_categories_are_collapsed_and_the_last_label_wins(tmp_path):
+    labels = UserLabels(_labelsFile(tmp_path, [
+        ('a', 'IND'), ('b', 'ORG'), ('c', 'IND '), ('d', 'news ORG'), ('e', 'INDIVIDUAL'), ('a', 'ORG'), ('b', 'IND'),
+    ]))
+    assert len(labels) == 5
+    assert [labels.get(name) for name in 'abcde'] == [ORGANIZATION, INDIVIDUAL, INDIVIDUAL, ORGANIZATION, INDIVIDUAL]
+    assert labels['a'] == ORGANIZATION
+    with pytest.raises(KeyError):
+        labels['f']
+    assert labels.get('f', 'unknown') == 'unknown'
+
+def test_names_are_normalized_but_keep_their_case(tmp_path):
+    labels = UserLabels(_labelsFile(tmp_path, [('BURDEN', 'IND'), ('Burden', 'ORG'), ('The  Western\tJournal ', 'ORG'), ('', 'IND')]))
+    assert labels.get(' BURDEN') == INDIVIDUAL
+    assert labels.get('Burden') == ORGANIZATION
+    assert 'The Western Journal' in labels
+    assert 'Ｔｈｅ Western Journal' in labels # full width letters are normalized by NFKC
+    assert labels.code('The Western Journal') == labels.code(' The Western  Journal')
+    assert labels.get('') is None and labels.get(None) is None # missing names are never labelled
+
+def test_label_keeps_the_index_and_gives_none_for_unlabelled_names(tmp_path):
+    labels = UserLabels(_labelsFile(tmp_path, [('a', 'IND'), ('b', 'ORG')]))
+    names = Series(['b', None, 'a ', 'z', 'b', float('nan')], index=range(7, 13))
+    categories = labels.label(names)
+    assert categories.dtype == object
+    assert list(categories.index) == list(range(7, 13))
+    assert categories.tolist() == [ORGANIZATION, None, INDIVIDUAL, None, ORGANIZATION, None]
+    assert labels.label(Series([], dtype=object)).tolist() == []
+
+def test_isStale_notices_changed_files(tmp_path):
+    filepath = _labelsFile(tmp_path, [('a', 'IND')])
+    labels = UserLabels(filepath)
+    assert not labels.isStale()
+    with open(filepath, 'a') as file:
+        file.write('b,ORG\n')
+    assert labels.isStale()
@@ -0,0 +1,107 @@
+import csv
+import os
+from collections import Counter
+
+import pytest
+
+from helper.collectionFiles import FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE, getDataCollectionParameters, getFilesToCheck
+from helper.commonTools import Post, User, UserRecord, extractUsers, getAllUserRecords, getAllUsers, getUsersFromPostFile
+from helper.syntheticData import writeCollections
+from helper.userLabels import normalizeUserName
+
+PLATFORMS = [FACEBOOK, INSTAGRAM, TIKTOK, YOUTUBE]
+
+@pytest.fixture(scope='module')
+def collections(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('collections')
+    return str(directory), writeCollections(str(directory), 2000, seed=25)
+
+def _csvUsers(filepath: str) -> list[tuple[str, str, str]]:
+    """
+    The users of each row of a collection file, read with csv: normalized name and unique
+    name, '' when missing or a placeholder, and the platform.
+    """
+    platform = getDataCollectionParameters(filepath)['platform']
+    columns = Post.PLATFORM_MAPPINGS[platform]
+    placeholders = Post.PLACEHOLDERS[platform]
+    clean = lambda value: '' if value is None or value in placeholders else normalizeUserName(value)
+    users = []
+    with open(filepath, newline='') as file:
+        for row in csv.DictReader(file):
+            name = clean(row.get(columns[Post.USER_NAME]))
+            unique_name = clean(row.get(columns.get(Post.USER_UNIQUE_NAME)))
+            if platform is INSTAGRAM and not name:
+                name = unique_name
+            if name or unique_name:
+                users.append((name, unique_name, platform))
+    return users
+
+def test_instagram_users_match_getUsersFromPostFile(collections):
+    _, filepaths = collections
+    for filepath in [path for path in filepaths if f'_{INSTAGRAM}_' in path]:
+        # getUsersFromPostFile only fills in names on Instagram
+        expected = {(normalizeUserName(user.name), normalizeUserName(user.unique_name) or None) for user in getUsersFromPostFile(filepath)}
+        expected.discard(('', None))
+        assert set(extractUsers([filepath], processes=1)) == {UserRecord(*user) for user in expected}
+
+def test_users_are_found_once_in_order(collections):
+    _, filepaths = collections
+    rows = [user for filepath in filepaths for user in _csvUsers(filepath)]
+    expected = list(dict.fromkeys((name, unique_name or None) for name, unique_name, _ in rows))
+    assert extractUsers(filepaths, processes=1) == [UserRecord(*user) for user in expected]
+
+def test_users_are_counted(collections):
+    _, filepaths = collections
+    rows = [user for filepath in filepaths for user in _csvUsers(filepath)]
+    posts = Counter((name, unique_name or None) for name, unique_name, _ in rows)
+    platforms = {user: len({platform for name, unique_name, platform in rows if (name, unique_name or None) == user}) for user in posts}
+    users = extractUsers(filepaths, processes=1, counts=True)
+    assert [(user.name, user.unique_name) for user in users] == list(posts)
+    assert {(user.name, user.unique_name): user.posts for user in users} == posts
+    assert {(user.name, user.unique_name): user.platforms for user in users} == platforms
+
+@pytest.mark.parametrize('platform', PLATFORMS + ['all'])
+def test_getAllUsers_gets_the_users_of_the_platform_files(collections, platform):
+    directory, _ = collections
+    users = getAllUsers(directory, platform, processes=1)
+    assert isinstance(users, set) and all(isinstance(user, User) for user in users)
+    assert users == set().union(*(getUsersFromPostFile(filepath) for filepath in getFilesToCheck(directory, platform)))
+    assert users
+
+@pytest.mark.parametrize('platform', PLATFORMS + ['all'])
+def test_getAllUserRecords_extracts_users_of_the_platform_files(collections, platform):
+    directory, _ = collections
+    users = getAllUserRecords(directory, platform, processes=1)
+    assert isinstance(users, list) and all(isinstance(user, UserRecord) for user in users)
+    assert users == extractUsers(getFilesToCheck(directory, platform), processes=1)
+    if platform in (FACEBOOK, YOUTUBE):
+        assert all(user.unique_name is None for user in users)
+
+def _write(directory, name: str, rows: list[dict]) -> str:
+    filepath = os.path.join(directory, name)
+    with open(filepath, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return filepath
+
+def test_names_are_normalized_and_placeholders_are_missing(tmp_path):
+    instagram = _write(tmp_path, 'Trump rally_instagram_trending@07-13-18_collected@07-13-20.csv', [
+        {'full name': 'The  Rally News ', 'username': 'therally'},
+        {'full name': 'The Rally News', 'username': 'therally'},
+        {'full name': '', 'username': 'ｎｏｎａｍｅ'}, # full width, normalized by NFKC
+        {'full name': '<<not collected>>', 'username': '<<could not collect>>'},
+        {'full name': 'NA', 'username': 'na'},
+    ])
+    tiktok = _write(tmp_path, 'Trump rally_tiktok_trending@07-13-18_collected@07-13-20.csv', [
+        {'author_nickname': 'The Rally News', 'author_uniqueId': 'therally'},
+        {'author_nickname': '', 'author_uniqueId': ''},
+        {'author_nickname': 'Ｂoth', 'author_uniqueId': ''},
+    ])
+    assert extractUsers([instagram, tiktok], processes=1, counts=True) == [
+        UserRecord('The Rally News', 'therally', 3, 2),
+        UserRecord('noname', 'noname', 1, 1),
+        UserRecord('NA', 'na', 1, 1),
+        UserRecord('Both', None, 1, 1),
+    ]
+    assert extractUsers([], processes=1) == []
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+wordcloud = pytest.importorskip('wordcloud')
+
+import app
+import helper
+
+@pytest.fixture(scope='module')
+def posts() -> pd.DataFrame:
+    return pd.DataFrame({
+        'platform': ['tiktok', 'youtube', 'facebook'] * 20,
+        'searchTerm': ['Trump rally'] * 60,
+        'text': ['Trump rally in Butler https://bit.ly/x', 'Secret Service at the Trump rally', 'Butler Pennsylvania news'] * 20,
+    })
+
+def _render(terms, posts, collocations, width=200):
+    return app.renderWordCloud.__wrapped__(terms, posts, ['https'], terms.key, width, 100, collocations)
+
+def test_word_clouds_draw_phrases_from_the_text(posts):
+    terms = helper.TermIndex.from_frame(posts, 'text', by=['platform', 'searchTerm']).select(filter=['https'])
+    text = ' '.join(word for word in ' '.join(posts['text']).split() if 'https' not in word.lower())
+    expected = wordcloud.WordCloud(width=200, height=100, background_color='white', colormap='winter').generate(text)
+    assert 'Trump rally' in expected.words_
+    np.testing.assert_array_equal(_render(terms, posts, collocations=True), expected.to_array())
+
+def test_word_clouds_without_phrases_are_drawn_from_the_term_index(posts):
+    terms = helper.TermIndex.from_frame(posts, 'text', by=['platform', 'searchTerm']).select(filter=['https'])
+    frequencies = helper.cloudFrequencies(terms, stopwords=wordcloud.STOPWORDS)
+    expected = wordcloud.WordCloud(width=200, height=100, background_color='white', colormap='winter', collocations=False)
+    np.testing.assert_array_equal(_render(terms, posts, collocations=False), expected.generate_from_frequencies(frequencies).to_array())